@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+PREDICT_PAYLOAD = {
+    "seller_id": 1,
+    "is_verified_seller": False,
+    "item_id": 1,
+    "name": "Товар",
+    "description": "Описание товара",
+    "category": 1,
+    "images_qty": 0
+}
+
+
+async def saturate_predict(client: httpx.AsyncClient, stop: asyncio.Event, counter: list) -> None:
+    while not stop.is_set():
+        response = await client.request("GET", "/predict", json=PREDICT_PAYLOAD)
+        response.raise_for_status()
+        counter[0] += 1
+
+
+async def probe_async_predict(client: httpx.AsyncClient, item_id: int, stop: asyncio.Event, interval: float) -> list:
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.post("/async_predict", params={"item_id": item_id})
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def run(args) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency + 8)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        metrics = (await client.get("/metrics")).json()
+        mode = metrics.get("prediction_scoring", {}).get("predict", {}).get("execution_mode", "unknown")
+        
+        stop = asyncio.Event()
+        counter = [0]
+        load = [asyncio.create_task(saturate_predict(client, stop, counter)) for _ in range(args.concurrency)]
+        probe = asyncio.create_task(probe_async_predict(client, args.item_id, stop, args.probe_interval))
+        
+        await asyncio.sleep(args.duration)
+        stop.set()
+        latencies = await probe
+        await asyncio.gather(*load)
+    
+    latencies_ms = np.array(latencies) * 1000
+    print(f"Режим выполнения: {mode}")
+    print(f"/predict: {counter[0] / args.duration:.0f} запросов/с при {args.concurrency} параллельных клиентах")
+    print(
+        f"/async_predict: n={len(latencies_ms)}, p50={np.percentile(latencies_ms, 50):.1f} мс, "
+        f"p99={np.percentile(latencies_ms, 99):.1f} мс, max={latencies_ms.max():.1f} мс"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Задержка /async_predict при насыщенном /predict. "
+                    "Запускайте сервер с разными PREDICTION_EXECUTION_MODE (inline/thread/process) и сравнивайте."
+    )
+    parser.add_argument("--base-url", default="http://localhost:8003")
+    parser.add_argument("--item-id", type=int, required=True, help="существующий item_id для /async_predict")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+import numpy as np
+from clients import kafka
+
+
+async def run_mode(mode: str, messages: int, concurrency: int) -> None:
+    kafka.KAFKA_PRODUCER_MODE = mode
+    await kafka.get_producer()
+    latencies = []
+    queue = asyncio.Queue()
+    for item_id in range(1, messages + 1):
+        queue.put_nowait(item_id)
+    
+    async def client():
+        while not queue.empty():
+            item_id = queue.get_nowait()
+            started = time.perf_counter()
+            await kafka.send_moderation_request(item_id)
+            latencies.append(time.perf_counter() - started)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    await kafka.producer.flush()
+    elapsed = time.perf_counter() - started
+    await kafka.close_producer()
+    
+    latencies_ms = np.array(latencies) * 1000
+    print(
+        f"{mode:>8}: {messages / elapsed:8.0f} сообщений/с, задержка вызова "
+        f"p50={np.percentile(latencies_ms, 50):.2f} мс, p99={np.percentile(latencies_ms, 99):.2f} мс"
+    )
+
+
+async def main_async(args) -> None:
+    for mode in ("sync", "buffered"):
+        await run_mode(mode, args.messages, args.concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение send_and_wait и буферизованного producer (нужен Kafka брокер)")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+import numpy as np
+from model import train_model
+from services.scorers import compile_scorer
+from services.lookup_table import ScoreLookupTable
+
+
+def best_time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Построение и скорость таблицы предсказаний")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--model", choices=["logreg", "forest"], default="logreg")
+    args = parser.parse_args()
+    
+    if args.model == "forest":
+        from sklearn.ensemble import RandomForestClassifier
+        rng = np.random.default_rng(42)
+        X = rng.random((1000, 4))
+        y = ((X[:, 0] < 0.3) & (X[:, 1] < 0.2)).astype(int)
+        model = RandomForestClassifier(n_estimators=50, random_state=0).fit(X, y)
+    else:
+        model = train_model()
+    
+    scorer = compile_scorer(model)
+    table = ScoreLookupTable.build(scorer)
+    print(f"Скорер: {type(scorer).__name__}")
+    print(f"Построение таблицы: {table.build_seconds:.3f} с")
+    print(f"Размер таблицы: {table.probabilities.size} ячеек, {table.nbytes / 1024 / 1024:.2f} МБ")
+    
+    rng = np.random.default_rng(0)
+    is_verified = rng.integers(0, 2, args.rows)
+    images_qty = rng.integers(0, 15, args.rows)
+    description_length = rng.integers(0, 1500, args.rows)
+    category = rng.integers(0, 150, args.rows)
+    features = np.column_stack([
+        is_verified.astype(np.float64),
+        np.minimum(images_qty / 10.0, 1.0),
+        np.minimum(description_length / 1000.0, 1.0),
+        np.minimum(category / 100.0, 1.0)
+    ])
+    
+    batch_scorer = best_time(lambda: scorer.score(features), args.repeat)
+    batch_table = best_time(lambda: table.lookup(is_verified, images_qty, description_length, category), args.repeat)
+    print(f"Батч {args.rows} строк: скорер {batch_scorer * 1000:.2f} мс, таблица {batch_table * 1000:.2f} мс "
+          f"(x{batch_scorer / batch_table:.1f})")
+    
+    single = tuple(int(column[0]) for column in (is_verified, images_qty, description_length, category))
+    single_features = features[:1]
+    
+    def repeat_calls(func):
+        return lambda: [func() for _ in range(args.calls)]
+    
+    single_scorer = best_time(repeat_calls(lambda: scorer.score(single_features)), args.repeat) / args.calls
+    single_table = best_time(repeat_calls(lambda: table.lookup_one(*single)), args.repeat) / args.calls
+    print(f"Одна строка: скорер {single_scorer * 1e6:.1f} мкс, таблица {single_table * 1e6:.1f} мкс "
+          f"(x{single_scorer / single_table:.1f})")
+
+
+if __name__ == "__main__":
+    main()
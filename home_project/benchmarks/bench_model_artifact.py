@@ -0,0 +1,90 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+src_path = project_root / "src"
+
+CHILD_SCRIPT = """
+import sys, time
+sys.path.insert(0, {src_path!r})
+started = time.perf_counter()
+if {kind!r} == "pickle":
+    from model import load_model
+    model = load_model({path!r})
+else:
+    from services.model_artifact import load_artifact
+    model = load_artifact({path!r})
+float(model.coef_.sum())
+load_seconds = time.perf_counter() - started
+print("ready", flush=True)
+sys.stdin.readline()
+memory = {{}}
+for file_name in ("/proc/self/status", "/proc/self/smaps_rollup"):
+    try:
+        with open(file_name) as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "Pss", "Shared_Clean"):
+                    memory[key] = int(value.split()[0])
+    except OSError:
+        pass
+print(load_seconds, memory.get("VmRSS", 0), memory.get("Pss", 0), memory.get("Shared_Clean", 0), flush=True)
+"""
+
+
+def run_processes(kind: str, path: Path, processes: int) -> list:
+    script = CHILD_SCRIPT.format(src_path=str(src_path), kind=kind, path=str(path))
+    children = [
+        subprocess.Popen(
+            [sys.executable, "-c", script],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        for _ in range(processes)
+    ]
+    for child in children:
+        if child.stdout.readline().strip() != "ready":
+            raise RuntimeError(f"Процесс загрузки {kind} завершился с ошибкой")
+    results = []
+    for child in children:
+        child.stdin.write("\n")
+        child.stdin.flush()
+        load_seconds, rss, pss, shared = child.stdout.readline().split()
+        results.append((float(load_seconds), int(rss), int(pss), int(shared)))
+        child.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Время загрузки и память на процесс: model.pkl (pickle) против артефакта NumPy с mmap"
+    )
+    parser.add_argument("--processes", type=int, default=4, help="Число одновременно работающих процессов")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        pickle_path = workdir / "model.pkl"
+        artifact_path = workdir / "model_artifact"
+        subprocess.run(
+            [sys.executable, str(project_root / "train.py"), "--output", str(pickle_path), "--artifact", str(artifact_path)],
+            check=True, capture_output=True
+        )
+        
+        for kind, path in (("pickle", pickle_path), ("artifact", artifact_path)):
+            results = [result for _ in range(args.repeat) for result in run_processes(kind, path, args.processes)]
+            print(
+                f"{kind:>8}: загрузка {statistics.median(r[0] for r in results) * 1000:7.1f} мс, "
+                f"RSS {statistics.median(r[1] for r in results) / 1024:6.1f} МБ, "
+                f"PSS {statistics.median(r[2] for r in results) / 1024:6.1f} МБ, "
+                f"разделяемые страницы {statistics.median(r[3] for r in results) / 1024:6.1f} МБ "
+                f"({args.processes} процессов)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from model import train_model
+from models.predictions import PredictionRequest
+from services.predictions import PredictionService
+
+
+def make_requests(count: int) -> list:
+    return [
+        PredictionRequest(
+            seller_id=1,
+            is_verified_seller=i % 2 == 0,
+            item_id=i + 1,
+            name="Товар",
+            description="Описание" * (i % 120),
+            category=i % 150,
+            images_qty=i % 12
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение N одиночных предсказаний и одного пакетного")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    service = PredictionService(batching=False)
+    service.set_model(train_model())
+    requests = make_requests(args.items)
+    
+    single_best = float("inf")
+    batch_best = float("inf")
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        for request in requests:
+            service.predict(request)
+        single_best = min(single_best, time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        service.predict_batch(requests)
+        batch_best = min(batch_best, time.perf_counter() - started)
+    
+    single_per_item = single_best / args.items * 1e6
+    batch_per_item = batch_best / args.items * 1e6
+    print(f"Объявлений: {args.items}")
+    print(f"Одиночные вызовы: {single_per_item:.1f} мкс/объявление")
+    print(f"Пакетный вызов:   {batch_per_item:.1f} мкс/объявление")
+    print(f"Ускорение: x{single_per_item / batch_per_item:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+import numpy as np
+from model import train_model
+from services.scorers import compile_scorer
+
+
+def best_per_call(func, calls: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(calls):
+            func()
+        best = min(best, time.perf_counter() - started)
+    return best / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Стоимость одного вызова: sklearn против скомпилированного скорера")
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    model = train_model()
+    scorer = compile_scorer(model)
+    features = np.array([[1.0, 0.5, 0.3, 0.01]])
+    
+    def sklearn_call():
+        model.predict(features)[0]
+        model.predict_proba(features)[0][1]
+    
+    def compiled_call():
+        scorer.score(features)
+    
+    sklearn_us = best_per_call(sklearn_call, args.calls, args.repeat)
+    compiled_us = best_per_call(compiled_call, args.calls, args.repeat)
+    print(f"Скорер: {type(scorer).__name__}")
+    print(f"sklearn predict + predict_proba: {sklearn_us:.1f} мкс/вызов")
+    print(f"Скомпилированный скорер:         {compiled_us:.1f} мкс/вызов")
+    print(f"Ускорение: x{sklearn_us / compiled_us:.1f}")
+
+
+if __name__ == "__main__":
+    main()
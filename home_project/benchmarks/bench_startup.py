@@ -0,0 +1,122 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+src_path = project_root / "src"
+
+TARGETS = {
+    "api": "main",
+    "worker": "workers.moderation_worker"
+}
+
+WORKER_READY_MARKER = "Воркер запущен"
+
+IMPORT_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+import {module}
+print(time.perf_counter() - started, 'sklearn' in sys.modules, 'mlflow' in sys.modules)
+"""
+
+
+def make_env(fast_start: bool) -> dict:
+    env = dict(os.environ)
+    env["MODEL_FAST_START"] = "true" if fast_start else "false"
+    env["PYTHONPATH"] = str(src_path)
+    return env
+
+
+def measure_import(module: str, env: dict) -> tuple:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT.format(module=module)],
+        cwd=src_path, env=env, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[0]), output[1] == "True", output[2] == "True"
+
+
+def wait_api_ready(env: dict, cwd: Path, port: int, timeout: float) -> float:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError("API завершился до готовности")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"API не стал готов за {timeout} с")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def wait_worker_ready(env: dict, cwd: Path, timeout: float) -> float:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(src_path / "workers" / "moderation_worker.py")],
+        cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    try:
+        for line in process.stderr:
+            if WORKER_READY_MARKER in line:
+                return time.perf_counter() - started
+            if time.perf_counter() - started > timeout:
+                break
+        raise TimeoutError(f"Воркер не стал готов за {timeout} с")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Время импорта и готовности API и воркера в обычном режиме и в режиме быстрого старта"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--ready", action="store_true", help="Замерить время до готовности (нужны PostgreSQL и Kafka)")
+    parser.add_argument("--port", type=int, default=8013)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        model_path = workdir / "model.pkl"
+        subprocess.run(
+            [sys.executable, str(project_root / "train.py"), "--output", str(model_path)],
+            check=True, capture_output=True
+        )
+        
+        for fast_start in (False, True):
+            mode = "быстрый старт" if fast_start else "обычный"
+            env = make_env(fast_start)
+            for target, module in TARGETS.items():
+                results = [measure_import(module, env) for _ in range(args.repeat)]
+                import_seconds = statistics.median(result[0] for result in results)
+                line = (
+                    f"{mode:>14} {target:>6}: импорт {import_seconds * 1000:7.0f} мс, "
+                    f"sklearn={'да' if results[0][1] else 'нет'}, mlflow={'да' if results[0][2] else 'нет'}"
+                )
+                if args.ready:
+                    if target == "api":
+                        ready = [wait_api_ready(env, workdir, args.port, args.timeout) for _ in range(args.repeat)]
+                    else:
+                        ready = [wait_worker_ready(env, workdir, args.timeout) for _ in range(args.repeat)]
+                    line += f", готовность {statistics.median(ready) * 1000:7.0f} мс"
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from database import close_db_pool
+from services.bulk_ingest import ingest_file, BulkIngestError, BULK_INGEST_BATCH_SIZE
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+async def main_async(args) -> bool:
+    try:
+        for kind, path in (("users", args.users), ("items", args.items)):
+            if path is None:
+                continue
+            stats = await ingest_file(kind, Path(path), args.format, args.batch_size)
+            print(
+                f"{kind}: {stats.rows} строк за {stats.seconds:.1f} с ({stats.rows_per_second:.0f} строк/с), "
+                f"изменено={stats.upserted}, без изменений={stats.unchanged}, "
+                f"пропущено={stats.skipped}, с ошибками={stats.invalid}"
+            )
+            for error in stats.errors:
+                print(f"  {error}")
+        return True
+    except (BulkIngestError, OSError) as e:
+        print(f"Ошибка загрузки: {e}", file=sys.stderr)
+        return False
+    finally:
+        await close_db_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Пакетная загрузка продавцов и объявлений из CSV/NDJSON через COPY (продавцы загружаются первыми)"
+    )
+    parser.add_argument("--users", help="Файл с продавцами: seller_id, is_verified_seller")
+    parser.add_argument("--items", help="Файл с объявлениями: item_id, seller_id, name, description, category, images_qty")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Формат файлов (по умолчанию по расширению)")
+    parser.add_argument("--batch-size", type=int, default=BULK_INGEST_BATCH_SIZE)
+    args = parser.parse_args()
+    if not args.users and not args.items:
+        parser.error("нужно указать --users и/или --items")
+    sys.exit(0 if asyncio.run(main_async(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()
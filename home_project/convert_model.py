@@ -0,0 +1,46 @@
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from model import load_model
+from services.model_artifact import save_artifact
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Конвертация модели из pickle или MLflow в артефакт NumPy + manifest.json для загрузки через mmap"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-pickle", help="Путь к файлу модели pickle, например model.pkl")
+    source.add_argument("--from-mlflow", help="URI модели MLflow, например models:/moderation-model/Production")
+    parser.add_argument("--output", default="model_artifact", help="Каталог артефакта")
+    parser.add_argument("--version", help="Версия модели в манифесте (по умолчанию префикс контрольной суммы)")
+    args = parser.parse_args()
+    
+    if args.from_pickle:
+        model = load_model(args.from_pickle)
+    else:
+        import mlflow.sklearn
+        
+        model = mlflow.sklearn.load_model(args.from_mlflow)
+    
+    try:
+        manifest = save_artifact(model, args.output, version=args.version, source=args.from_pickle or args.from_mlflow)
+    except ValueError as e:
+        print(f"Ошибка конвертации: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Артефакт {manifest['version']} сохранен в {args.output} (контрольная сумма {manifest['checksum']})")
+
+
+if __name__ == "__main__":
+    main()
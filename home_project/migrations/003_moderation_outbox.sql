@@ -0,0 +1,12 @@
+CREATE TABLE IF NOT EXISTS moderation_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    task_id INTEGER NOT NULL,
+    topic VARCHAR(255) NOT NULL,
+    payload JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    published_at TIMESTAMP,
+    CONSTRAINT fk_outbox_task FOREIGN KEY (task_id) REFERENCES moderation_results(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_moderation_outbox_unpublished ON moderation_outbox(id) WHERE published_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_moderation_outbox_task_id ON moderation_outbox(task_id);
@@ -0,0 +1,75 @@
+CREATE OR REPLACE FUNCTION notify_items_changed() RETURNS trigger AS $$
+DECLARE
+    changed_ids INTEGER[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(item_id) INTO changed_ids
+        FROM (SELECT DISTINCT item_id FROM new_rows LIMIT 501) AS changed;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT array_agg(item_id) INTO changed_ids
+        FROM (SELECT item_id FROM new_rows UNION SELECT item_id FROM old_rows LIMIT 501) AS changed;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(item_id) INTO changed_ids
+        FROM (SELECT DISTINCT item_id FROM old_rows LIMIT 501) AS changed;
+    END IF;
+    
+    IF TG_OP = 'TRUNCATE' OR cardinality(changed_ids) > 500 THEN
+        PERFORM pg_notify('items_changed', '*');
+    ELSIF changed_ids IS NOT NULL THEN
+        PERFORM pg_notify('items_changed', array_to_string(changed_ids, ','));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION notify_users_changed() RETURNS trigger AS $$
+DECLARE
+    changed_ids INTEGER[];
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        SELECT array_agg(seller_id) INTO changed_ids
+        FROM (SELECT seller_id FROM new_rows UNION SELECT seller_id FROM old_rows LIMIT 501) AS changed;
+    END IF;
+    
+    IF TG_OP = 'TRUNCATE' OR cardinality(changed_ids) > 500 THEN
+        PERFORM pg_notify('users_changed', '*');
+    ELSIF changed_ids IS NOT NULL THEN
+        PERFORM pg_notify('users_changed', array_to_string(changed_ids, ','));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS items_notify_insert ON items;
+CREATE TRIGGER items_notify_insert
+    AFTER INSERT ON items
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_items_changed();
+
+DROP TRIGGER IF EXISTS items_notify_update ON items;
+CREATE TRIGGER items_notify_update
+    AFTER UPDATE ON items
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_items_changed();
+
+DROP TRIGGER IF EXISTS items_notify_delete ON items;
+CREATE TRIGGER items_notify_delete
+    AFTER DELETE ON items
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_items_changed();
+
+DROP TRIGGER IF EXISTS items_notify_truncate ON items;
+CREATE TRIGGER items_notify_truncate
+    AFTER TRUNCATE ON items
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_items_changed();
+
+DROP TRIGGER IF EXISTS users_notify_update ON users;
+CREATE TRIGGER users_notify_update
+    AFTER UPDATE ON users
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_users_changed();
+
+DROP TRIGGER IF EXISTS users_notify_truncate ON users;
+CREATE TRIGGER users_notify_truncate
+    AFTER TRUNCATE ON users
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_users_changed();
@@ -0,0 +1,3 @@
+CREATE INDEX IF NOT EXISTS idx_moderation_results_item_id_created_at ON moderation_results(item_id, created_at DESC);
+
+DROP INDEX IF EXISTS idx_moderation_results_item_id;
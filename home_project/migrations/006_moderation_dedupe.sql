@@ -0,0 +1,5 @@
+ALTER TABLE moderation_results ADD COLUMN IF NOT EXISTS dedupe_key VARCHAR(100);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_moderation_results_pending_dedupe_key
+    ON moderation_results(dedupe_key)
+    WHERE status = 'pending' AND dedupe_key IS NOT NULL;
@@ -0,0 +1,86 @@
+CREATE OR REPLACE FUNCTION create_moderation_results_partition(month_start DATE) RETURNS TEXT AS $$
+DECLARE
+    partition_start DATE := date_trunc('month', month_start)::date;
+    partition_name TEXT := 'moderation_results_p' || to_char(partition_start, 'YYYYMM');
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF moderation_results FOR VALUES FROM (%L) TO (%L)',
+        partition_name,
+        partition_start,
+        (partition_start + INTERVAL '1 month')::date
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION ensure_moderation_results_partitions(months_ahead INTEGER) RETURNS SETOF TEXT AS $$
+DECLARE
+    month_offset INTEGER;
+BEGIN
+    FOR month_offset IN 0..months_ahead LOOP
+        RETURN NEXT create_moderation_results_partition(
+            (date_trunc('month', CURRENT_DATE) + make_interval(months => month_offset))::date
+        );
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    month_start DATE;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relname = 'moderation_results' AND n.nspname = current_schema() AND c.relkind = 'r'
+    ) THEN
+        ALTER TABLE moderation_outbox DROP CONSTRAINT IF EXISTS fk_outbox_task;
+        ALTER TABLE moderation_results RENAME TO moderation_results_unpartitioned;
+        ALTER INDEX moderation_results_pkey RENAME TO moderation_results_unpartitioned_pkey;
+        ALTER SEQUENCE moderation_results_id_seq OWNED BY NONE;
+        
+        CREATE TABLE moderation_results (
+            id INTEGER NOT NULL DEFAULT nextval('moderation_results_id_seq'),
+            item_id INTEGER NOT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            is_violation BOOLEAN,
+            probability FLOAT,
+            error_message TEXT,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            processed_at TIMESTAMP,
+            dedupe_key VARCHAR(100),
+            CONSTRAINT moderation_results_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT fk_item FOREIGN KEY (item_id) REFERENCES items(item_id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (created_at);
+        
+        ALTER SEQUENCE moderation_results_id_seq OWNED BY moderation_results.id;
+        
+        FOR month_start IN
+            SELECT DISTINCT date_trunc('month', created_at)::date
+            FROM moderation_results_unpartitioned
+            WHERE created_at IS NOT NULL
+        LOOP
+            PERFORM create_moderation_results_partition(month_start);
+        END LOOP;
+        PERFORM ensure_moderation_results_partitions(3);
+        
+        INSERT INTO moderation_results (
+            id, item_id, status, is_violation, probability, error_message, created_at, processed_at, dedupe_key
+        )
+        SELECT
+            id, item_id, status, is_violation, probability, error_message,
+            COALESCE(created_at, CURRENT_TIMESTAMP), processed_at, dedupe_key
+        FROM moderation_results_unpartitioned;
+        
+        DROP TABLE moderation_results_unpartitioned;
+    END IF;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_moderation_results_item_id_created_at ON moderation_results(item_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_moderation_results_pending_dedupe_key
+    ON moderation_results(dedupe_key)
+    WHERE status = 'pending' AND dedupe_key IS NOT NULL;
+
+DROP INDEX IF EXISTS idx_moderation_results_status;
+DROP INDEX IF EXISTS idx_moderation_results_created_at;
@@ -0,0 +1,6 @@
+ALTER TABLE moderation_results ADD COLUMN IF NOT EXISTS sweep_attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE moderation_results ADD COLUMN IF NOT EXISTS swept_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_moderation_results_pending_created_at
+    ON moderation_results(created_at)
+    WHERE status = 'pending';
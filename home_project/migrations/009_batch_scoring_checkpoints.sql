@@ -0,0 +1,6 @@
+CREATE TABLE IF NOT EXISTS batch_scoring_checkpoints (
+    job_name VARCHAR(100) PRIMARY KEY,
+    last_item_id INTEGER NOT NULL,
+    scored_items BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
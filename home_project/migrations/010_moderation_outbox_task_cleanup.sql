@@ -0,0 +1,15 @@
+CREATE OR REPLACE FUNCTION delete_moderation_outbox_for_task() RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM moderation_outbox WHERE task_id = OLD.id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_moderation_results_outbox_cleanup ON moderation_results;
+CREATE TRIGGER trg_moderation_results_outbox_cleanup
+    AFTER DELETE ON moderation_results
+    FOR EACH ROW
+    EXECUTE FUNCTION delete_moderation_outbox_for_task();
+
+DELETE FROM moderation_outbox o
+WHERE NOT EXISTS (SELECT 1 FROM moderation_results m WHERE m.id = o.task_id);
@@ -39,19 +39,42 @@ async def run_with_asyncpg():
     migrations_dir = Path(__file__).parent / "migrations"
     migration_files = [
         migrations_dir / "001_initial_schema.sql",
-        migrations_dir / "002_moderation_results.sql"
+        migrations_dir / "002_moderation_results.sql",
+        migrations_dir / "003_moderation_outbox.sql",
+        migrations_dir / "004_change_notifications.sql",
+        migrations_dir / "005_moderation_results_item_created_index.sql",
+        migrations_dir / "006_moderation_dedupe.sql",
+        migrations_dir / "007_moderation_results_partitioning.sql",
+        migrations_dir / "008_moderation_results_pending_index.sql",
+        migrations_dir / "009_batch_scoring_checkpoints.sql",
+        migrations_dir / "010_moderation_outbox_task_cleanup.sql"
     ]
     
     conn = await asyncpg.connect(DATABASE_URL)
     try:
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(255) PRIMARY KEY,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        applied = {row["version"] for row in await conn.fetch("SELECT version FROM schema_migrations")}
+        
         for migration_file in migration_files:
             if not migration_file.exists():
                 print(f"Файл миграции не найден: {migration_file}")
                 continue
+            if migration_file.name in applied:
+                print(f"Миграция {migration_file.name} уже применена, пропускаем")
+                continue
             
             print(f"Применение миграции: {migration_file.name}")
             migration_sql = migration_file.read_text()
-            await conn.execute(migration_sql)
+            async with conn.transaction():
+                await conn.execute(migration_sql)
+                await conn.execute("INSERT INTO schema_migrations (version) VALUES ($1)", migration_file.name)
             print(f"Миграция {migration_file.name} успешно применена!")
         
         print("Все миграции успешно применены!")
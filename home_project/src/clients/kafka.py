@@ -1,28 +1,45 @@
+import asyncio
 import json
 import logging
 import os
 from datetime import datetime
 from aiokafka import AIOKafkaProducer
-from typing import Optional
+from typing import Awaitable, Callable, Optional, Set
 
 logger = logging.getLogger(__name__)
 
 KAFKA_BOOTSTRAP_SERVERS = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
 MODERATION_TOPIC = "moderation"
 DLQ_TOPIC = "moderation_dlq"
+MODERATION_MESSAGE_SCHEMA_VERSION = 2
+
+KAFKA_PRODUCER_MODE = os.getenv("KAFKA_PRODUCER_MODE", "sync").lower()
+KAFKA_LINGER_MS = int(os.getenv("KAFKA_LINGER_MS", "20"))
+KAFKA_MAX_BATCH_SIZE = int(os.getenv("KAFKA_MAX_BATCH_SIZE", "65536"))
+KAFKA_COMPRESSION_TYPE = os.getenv("KAFKA_COMPRESSION_TYPE", "gzip").lower()
 
 producer: Optional[AIOKafkaProducer] = None
+producer_stats = {"sent": 0, "delivered": 0, "failed": 0}
+_delivery_failure_tasks: Set[asyncio.Task] = set()
 
 
 async def get_producer() -> AIOKafkaProducer:
     global producer
     if producer is None:
+        options = {}
+        if KAFKA_PRODUCER_MODE == "buffered":
+            options = {
+                "linger_ms": KAFKA_LINGER_MS,
+                "max_batch_size": KAFKA_MAX_BATCH_SIZE,
+                "compression_type": None if KAFKA_COMPRESSION_TYPE == "none" else KAFKA_COMPRESSION_TYPE
+            }
         producer = AIOKafkaProducer(
             bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
-            value_serializer=lambda v: json.dumps(v).encode('utf-8')
+            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+            **options
         )
         await producer.start()
-        logger.info(f"Kafka producer подключен к {KAFKA_BOOTSTRAP_SERVERS}")
+        logger.info(f"Kafka producer подключен к {KAFKA_BOOTSTRAP_SERVERS} (режим {KAFKA_PRODUCER_MODE})")
     return producer
 
 
@@ -32,18 +49,78 @@ async def close_producer():
         await producer.stop()
         producer = None
         logger.info("Kafka producer отключен")
+    if _delivery_failure_tasks:
+        await asyncio.gather(*list(_delivery_failure_tasks), return_exceptions=True)
 
 
-async def send_moderation_request(item_id: int) -> None:
-    producer_instance = await get_producer()
+DeliveryFailureCallback = Callable[[int, str], Awaitable[None]]
+
+
+async def _notify_delivery_failure(on_failure: DeliveryFailureCallback, task_id: int, error: str) -> None:
+    try:
+        await on_failure(task_id, error)
+    except Exception as e:
+        logger.error(f"Ошибка обработки недоставленного сообщения для задачи {task_id}: {str(e)}", exc_info=True)
+
+
+def _on_delivery(
+    item_id: int,
+    task_id: Optional[int],
+    on_failure: Optional[DeliveryFailureCallback],
+    future: asyncio.Future
+) -> None:
+    if future.cancelled():
+        error = "отправка отменена"
+    elif future.exception() is not None:
+        error = str(future.exception())
+    else:
+        producer_stats["delivered"] += 1
+        return
+    
+    producer_stats["failed"] += 1
+    logger.error(f"Не удалось доставить сообщение для item_id={item_id}, task_id={task_id}: {error}")
+    if task_id is not None and on_failure is not None:
+        task = asyncio.ensure_future(_notify_delivery_failure(on_failure, task_id, error))
+        _delivery_failure_tasks.add(task)
+        task.add_done_callback(_delivery_failure_tasks.discard)
+
+
+def build_moderation_message(item_id: int, task_id: Optional[int] = None) -> dict:
     message = {
+        "schema_version": MODERATION_MESSAGE_SCHEMA_VERSION,
         "item_id": item_id,
         "timestamp": datetime.utcnow().isoformat()
     }
+    if task_id is not None:
+        message["task_id"] = task_id
+    return message
+
+
+async def send_moderation_request(
+    item_id: int,
+    task_id: Optional[int] = None,
+    on_delivery_failure: Optional[DeliveryFailureCallback] = None
+) -> None:
+    producer_instance = await get_producer()
+    message = build_moderation_message(item_id, task_id)
+    
+    if KAFKA_PRODUCER_MODE == "buffered":
+        delivery = await producer_instance.send(MODERATION_TOPIC, message)
+        producer_stats["sent"] += 1
+        delivery.add_done_callback(lambda future: _on_delivery(item_id, task_id, on_delivery_failure, future))
+        logger.info(f"Сообщение для item_id={item_id} поставлено в буфер отправки в топик {MODERATION_TOPIC}")
+        return
+    
     await producer_instance.send_and_wait(MODERATION_TOPIC, message)
+    producer_stats["sent"] += 1
+    producer_stats["delivered"] += 1
     logger.info(f"Отправлено сообщение в топик {MODERATION_TOPIC} для item_id={item_id}")
 
 
+def get_producer_stats() -> dict:
+    return {"mode": KAFKA_PRODUCER_MODE, **producer_stats}
+
+
 async def send_to_dlq(original_message: dict, error: str, retry_count: int = 0) -> None:
     producer_instance = await get_producer()
     dlq_message = {
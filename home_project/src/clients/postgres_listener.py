@@ -0,0 +1,123 @@
+import asyncio
+import asyncpg
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+from database import get_database_url
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY_SECONDS = 1.0
+CONNECT_RETRY_SECONDS = 10.0
+INVALIDATE_ALL = "*"
+
+
+class PostgresListener:
+    def __init__(self, reconnect_delay: float = RECONNECT_DELAY_SECONDS, connect_retry: float = CONNECT_RETRY_SECONDS):
+        self.reconnect_delay = reconnect_delay
+        self.connect_retry = connect_retry
+        self._retry_at = 0.0
+        self._callbacks: Dict[str, List[Callable[[str], None]]] = {}
+        self._connection: Optional[asyncpg.Connection] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closed = False
+    
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+    
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+            self._connection = None
+        return self._lock
+    
+    async def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        if self.connected and self._loop is asyncio.get_running_loop() and callback in self._callbacks.get(channel, []):
+            return
+        async with self._get_lock():
+            self._closed = False
+            is_new_channel = channel not in self._callbacks
+            if callback not in self._callbacks.setdefault(channel, []):
+                self._callbacks[channel].append(callback)
+            if not self.connected:
+                if time.monotonic() < self._retry_at:
+                    raise ConnectionError("соединение LISTEN недоступно")
+                try:
+                    await self._connect()
+                except Exception:
+                    self._retry_at = time.monotonic() + self.connect_retry
+                    raise
+            elif is_new_channel:
+                await self._connection.add_listener(channel, self._dispatch)
+    
+    async def unsubscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        callbacks = self._callbacks.get(channel)
+        if not callbacks or callback not in callbacks:
+            return
+        callbacks.remove(callback)
+        if not callbacks:
+            del self._callbacks[channel]
+            if self.connected:
+                await self._connection.remove_listener(channel, self._dispatch)
+    
+    async def _connect(self) -> None:
+        connection = await asyncpg.connect(get_database_url())
+        for channel in self._callbacks:
+            await connection.add_listener(channel, self._dispatch)
+        connection.add_termination_listener(self._on_termination)
+        self._connection = connection
+        logger.info(f"LISTEN подключен к каналам: {', '.join(self._callbacks)}")
+    
+    def _dispatch(self, connection, pid: int, channel: str, payload: str) -> None:
+        for callback in list(self._callbacks.get(channel, [])):
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.error(f"Ошибка обработки уведомления из канала {channel}: {str(e)}", exc_info=True)
+    
+    def _on_termination(self, connection) -> None:
+        if self._closed or connection is not self._connection:
+            return
+        self._connection = None
+        logger.warning("Соединение LISTEN потеряно, переподключение...")
+        self._reconnect_task = asyncio.ensure_future(self._reconnect())
+    
+    async def _reconnect(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self.reconnect_delay)
+            try:
+                async with self._get_lock():
+                    if not self.connected:
+                        await self._connect()
+            except Exception as e:
+                logger.warning(f"Не удалось переподключить LISTEN: {str(e)}")
+                continue
+            for channel in list(self._callbacks):
+                self._dispatch(self._connection, 0, channel, INVALIDATE_ALL)
+            return
+    
+    async def close(self) -> None:
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._connection is not None:
+            connection = self._connection
+            self._connection = None
+            try:
+                await connection.close()
+            except Exception as e:
+                logger.warning(f"Ошибка при закрытии соединения LISTEN: {str(e)}")
+            logger.info("Соединение LISTEN закрыто")
+
+
+postgres_listener = PostgresListener()
+
+
+async def close_listener() -> None:
+    await postgres_listener.close()
@@ -1,11 +1,33 @@
+import asyncio
 import asyncpg
 import logging
 import os
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
 
 logger = logging.getLogger(__name__)
 
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+DB_MAX_INACTIVE_CONNECTION_LIFETIME = float(os.getenv("DB_MAX_INACTIVE_CONNECTION_LIFETIME", "300"))
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "60"))
+DB_ACQUIRE_TIMEOUT = float(os.getenv("DB_ACQUIRE_TIMEOUT", "10"))
+
 pool = None
 current_db_url = None
+_pool_lock: Optional[asyncio.Lock] = None
+_current_unit: ContextVar[Optional["UnitOfWork"]] = ContextVar("current_unit_of_work", default=None)
+
+pool_stats = {
+    "acquires": 0,
+    "reused": 0,
+    "acquire_wait_seconds_total": 0.0,
+    "acquire_wait_seconds_max": 0.0,
+    "acquire_timeouts": 0
+}
 
 
 def get_database_url():
@@ -16,27 +38,143 @@ def get_database_url():
 
 
 async def get_db_pool():
-    global pool, current_db_url
-    db_url = get_database_url()
+    global pool, current_db_url, _pool_lock
+    if pool is not None:
+        return pool
     
-    if pool is None or current_db_url != db_url:
-        if pool:
-            await pool.close()
-        
-        pool = await asyncpg.create_pool(
-            db_url,
-            min_size=1,
-            max_size=10,
-            command_timeout=60
-        )
-        current_db_url = db_url
-        logger.info("Подключение к базе данных установлено")
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+    async with _pool_lock:
+        if pool is None:
+            db_url = get_database_url()
+            pool = await asyncpg.create_pool(
+                db_url,
+                min_size=DB_POOL_MIN_SIZE,
+                max_size=DB_POOL_MAX_SIZE,
+                statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+                max_inactive_connection_lifetime=DB_MAX_INACTIVE_CONNECTION_LIFETIME,
+                command_timeout=DB_COMMAND_TIMEOUT
+            )
+            current_db_url = db_url
+            logger.info(
+                f"Подключение к базе данных установлено "
+                f"(пул {DB_POOL_MIN_SIZE}..{DB_POOL_MAX_SIZE} соединений)"
+            )
     return pool
 
 
 async def close_db_pool():
-    global pool
+    global pool, _pool_lock
     if pool:
         await pool.close()
         pool = None
         logger.info("Подключение к базе данных закрыто")
+    _pool_lock = None
+
+
+async def _acquire_from_pool(db_pool) -> asyncpg.Connection:
+    started = time.perf_counter()
+    try:
+        connection = await db_pool.acquire(timeout=DB_ACQUIRE_TIMEOUT)
+    except asyncio.TimeoutError:
+        pool_stats["acquire_timeouts"] += 1
+        raise
+    waited = time.perf_counter() - started
+    pool_stats["acquires"] += 1
+    pool_stats["acquire_wait_seconds_total"] += waited
+    pool_stats["acquire_wait_seconds_max"] = max(pool_stats["acquire_wait_seconds_max"], waited)
+    return connection
+
+
+class UnitOfWork:
+    def __init__(self, transaction: bool = False):
+        self.transaction = transaction
+        self.connection: Optional[asyncpg.Connection] = None
+        self.closed = False
+        self._pool = None
+        self._transaction = None
+    
+    async def get_connection(self) -> asyncpg.Connection:
+        if self.connection is None:
+            self._pool = await get_db_pool()
+            self.connection = await _acquire_from_pool(self._pool)
+            if self.transaction:
+                self._transaction = self.connection.transaction()
+                await self._transaction.start()
+        else:
+            pool_stats["reused"] += 1
+        return self.connection
+    
+    async def close(self, failed: bool) -> None:
+        self.closed = True
+        if self.connection is None:
+            return
+        try:
+            if self._transaction is not None:
+                if failed:
+                    await self._transaction.rollback()
+                else:
+                    await self._transaction.commit()
+        finally:
+            await self._pool.release(self.connection)
+            self.connection = None
+
+
+def _active_unit() -> Optional[UnitOfWork]:
+    unit = _current_unit.get()
+    if unit is None or unit.closed:
+        return None
+    return unit
+
+
+@asynccontextmanager
+async def acquire_connection() -> AsyncIterator[asyncpg.Connection]:
+    unit = _active_unit()
+    if unit is not None:
+        yield await unit.get_connection()
+        return
+    
+    db_pool = await get_db_pool()
+    connection = await _acquire_from_pool(db_pool)
+    try:
+        yield connection
+    finally:
+        await db_pool.release(connection)
+
+
+@asynccontextmanager
+async def unit_of_work(transaction: bool = False) -> AsyncIterator[UnitOfWork]:
+    unit = _active_unit()
+    if unit is not None:
+        yield unit
+        return
+    
+    unit = UnitOfWork(transaction=transaction)
+    token = _current_unit.set(unit)
+    failed = False
+    try:
+        yield unit
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        _current_unit.reset(token)
+        await unit.close(failed)
+
+
+def get_pool_stats() -> dict:
+    stats = dict(pool_stats)
+    acquires = stats["acquires"]
+    stats["acquire_wait_seconds_avg"] = stats["acquire_wait_seconds_total"] / acquires if acquires else 0.0
+    if pool is not None:
+        size = pool.get_size()
+        idle = pool.get_idle_size()
+        stats.update({
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "min_size": pool.get_min_size(),
+            "max_size": pool.get_max_size(),
+            "utilization": round((size - idle) / pool.get_max_size(), 4)
+        })
+    return stats
@@ -8,11 +8,17 @@ src_path = project_root / "src"
 sys.path.insert(0, str(src_path))
 
 from routers.predictions import router as prediction_router, prediction_service
-from routers.simple_predict import router as simple_predict_router
+from routers.simple_predict import router as simple_predict_router, prediction_service as simple_prediction_service
 from routers.async_predict import router as async_predict_router
-from model import get_model, train_model, register_model_in_mlflow
+from routers.moderation_stream import router as moderation_stream_router
+from routers.bulk_ingest import router as bulk_ingest_router
+from routers.metrics import router as metrics_router
+from model import get_model, train_model, register_model_in_mlflow, MODEL_FAST_START
+from services.model_registry import model_registry, get_model_source, MODEL_WATCH_ENABLED
 from database import get_db_pool, close_db_pool
+from repositories.partitions import ModerationPartitionsRepository
 from clients.kafka import get_producer, close_producer
+from clients.postgres_listener import close_listener
 import logging
 import os
 import uvicorn
@@ -31,13 +37,18 @@ async def lifespan(app: FastAPI):
         await get_db_pool()
         logger.info("Подключение к базе данных установлено")
         
+        partitions = await ModerationPartitionsRepository().ensure_partitions()
+        logger.info(f"Партиции moderation_results созданы до {partitions[-1]}")
+        
         await get_producer()
         logger.info("Kafka producer подключен")
         
         register_model = os.getenv("REGISTER_MODEL", "false").lower() == "true"
         use_mlflow = os.getenv("USE_MLFLOW", "false").lower() == "true"
         
-        if register_model:
+        if register_model and MODEL_FAST_START:
+            logger.warning("REGISTER_MODEL игнорируется в режиме быстрого старта: используйте python train.py --register")
+        elif register_model:
             logger.info("Регистрация модели в MLflow...")
             model = train_model()
             register_model_in_mlflow(model, model_name="moderation-model")
@@ -49,16 +60,25 @@ async def lifespan(app: FastAPI):
         else:
             logger.info("Используется локальный файл для загрузки модели")
         
+        model_source = get_model_source(use_mlflow)
         model = get_model(use_mlflow=use_mlflow)
-        prediction_service.set_model(model)
-        logger.info("Модель успешно загружена и установлена в сервисе")
+        source_version = model_source.current_version()
+        model_registry.set_model(model, source_version=source_version)
+        logger.info(f"Модель {model_registry.label} успешно загружена и установлена в сервисах")
+        
+        if MODEL_WATCH_ENABLED:
+            model_registry.start_watching(model_source)
     except Exception as e:
         logger.error(f"Ошибка при загрузке модели: {str(e)}", exc_info=True)
         raise
     
     yield
     
+    await model_registry.stop_watching()
+    await prediction_service.close()
+    await simple_prediction_service.close()
     await close_producer()
+    await close_listener()
     await close_db_pool()
     logger.info("Завершение работы приложения")
 
@@ -67,6 +87,9 @@ app = FastAPI(lifespan=lifespan)
 app.include_router(prediction_router)
 app.include_router(simple_predict_router)
 app.include_router(async_predict_router)
+app.include_router(moderation_stream_router)
+app.include_router(bulk_ingest_router)
+app.include_router(metrics_router)
 
 
 
@@ -1,13 +1,18 @@
 import numpy as np
-from sklearn.linear_model import LogisticRegression
 import pickle
 import os
 import logging
+from services.model_artifact import load_artifact
 
 logger = logging.getLogger(__name__)
 
+MODEL_FAST_START = os.getenv("MODEL_FAST_START", "false").lower() == "true"
+MODEL_ARTIFACT_PATH = os.getenv("MODEL_ARTIFACT_PATH", "")
+
 
 def train_model():
+    from sklearn.linear_model import LogisticRegression
+    
     logger.info("Обучение модели на синтетических данных...")
     np.random.seed(42)
     X = np.random.rand(1000, 4)
@@ -22,8 +27,10 @@ def train_model():
 
 def save_model(model, path="model.pkl"):
     logger.info(f"Сохранение модели в {path}")
-    with open(path, "wb") as f:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
         pickle.dump(model, f)
+    os.replace(temp_path, path)
     logger.info(f"Модель сохранена в {path}")
 
 
@@ -35,10 +42,15 @@ def load_model(path="model.pkl"):
     return model
 
 
-def get_or_train_model(model_path="model.pkl"):
+def get_or_train_model(model_path="model.pkl", allow_training=True):
     if os.path.exists(model_path):
         logger.info(f"Файл модели {model_path} найден, загружаем модель")
         return load_model(model_path)
+    elif not allow_training:
+        logger.error(f"Файл модели {model_path} не найден, обучение при запуске отключено")
+        raise FileNotFoundError(
+            f"Файл модели {model_path} не найден. Обучите модель заранее: python train.py --output {model_path}"
+        )
     else:
         logger.info(f"Файл модели {model_path} не найден, обучаем новую модель")
         model = train_model()
@@ -80,12 +92,22 @@ def load_model_from_mlflow(model_name="moderation-model", stage="Production"):
         raise
 
 
-def get_model(use_mlflow=False, model_name="moderation-model", model_path="model.pkl"):
+def get_local_model(model_path="model.pkl", allow_training=True, artifact_path=None):
+    if artifact_path:
+        return load_artifact(artifact_path)
+    return get_or_train_model(model_path, allow_training)
+
+
+def get_model(use_mlflow=False, model_name="moderation-model", model_path="model.pkl", allow_training=None, artifact_path=None):
+    if allow_training is None:
+        allow_training = not MODEL_FAST_START
+    if artifact_path is None:
+        artifact_path = MODEL_ARTIFACT_PATH
     if use_mlflow:
         try:
             return load_model_from_mlflow(model_name)
         except Exception as e:
             logger.warning(f"Не удалось загрузить модель из MLflow: {str(e)}, используем локальную модель")
-            return get_or_train_model(model_path)
+            return get_local_model(model_path, allow_training, artifact_path)
     else:
-        return get_or_train_model(model_path)
+        return get_local_model(model_path, allow_training, artifact_path)
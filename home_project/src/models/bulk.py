@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class BulkIngestResponse(BaseModel):
+    kind: str = Field(..., description="Тип загруженных данных (users или items)")
+    rows: int = Field(..., description="Количество прочитанных строк")
+    invalid: int = Field(..., description="Количество строк с ошибками формата")
+    upserted: int = Field(..., description="Количество вставленных или измененных строк")
+    unchanged: int = Field(..., description="Количество строк без изменений")
+    skipped: int = Field(..., description="Количество объявлений с неизвестным продавцом")
+    seconds: float = Field(..., description="Время загрузки в секундах")
+    rows_per_second: float = Field(..., description="Скорость загрузки, строк в секунду")
+    errors: List[str] = Field(..., description="Первые ошибки формата")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 
 class AsyncPredictResponse(BaseModel):
@@ -14,3 +14,20 @@ class ModerationResultResponse(BaseModel):
     is_violation: Optional[bool] = Field(None, description="Результат модерации")
     probability: Optional[float] = Field(None, description="Вероятность нарушения")
     error_message: Optional[str] = Field(None, description="Сообщение об ошибке")
+
+
+class ModerationResultsBatchRequest(BaseModel):
+    task_ids: List[int] = Field(..., description="ID задач модерации")
+
+
+class ModerationResultsBatchItem(BaseModel):
+    task_id: int = Field(..., description="ID задачи модерации")
+    found: bool = Field(..., description="Найдена ли задача")
+    status: Optional[str] = Field(None, description="Статус задачи")
+    is_violation: Optional[bool] = Field(None, description="Результат модерации")
+    probability: Optional[float] = Field(None, description="Вероятность нарушения")
+    error_message: Optional[str] = Field(None, description="Сообщение об ошибке")
+
+
+class ModerationResultsBatchResponse(BaseModel):
+    results: List[ModerationResultsBatchItem] = Field(..., description="Результаты в порядке входного списка")
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import List, Optional
 
 
 class PredictionRequest(BaseModel):
@@ -14,3 +15,17 @@ class PredictionRequest(BaseModel):
 class PredictionResponse(BaseModel):
     is_violation: bool = Field(..., description="Предсказание модели: есть ли нарушение")
     probability: float = Field(..., description="Вероятность нарушения (от 0 до 1)", ge=0.0, le=1.0)
+    model_version: Optional[str] = Field(None, description="Версия модели, выполнившей предсказание")
+
+
+class BatchPredictionItem(BaseModel):
+    index: int = Field(..., description="Позиция объявления во входном списке")
+    item_id: Optional[int] = Field(None, description="Идентификатор товара")
+    is_violation: Optional[bool] = Field(None, description="Предсказание модели: есть ли нарушение")
+    probability: Optional[float] = Field(None, description="Вероятность нарушения (от 0 до 1)", ge=0.0, le=1.0)
+    error: Optional[str] = Field(None, description="Ошибка валидации или предсказания для элемента")
+
+
+class BatchPredictionResponse(BaseModel):
+    results: List[BatchPredictionItem] = Field(..., description="Результаты в порядке входного списка")
+    model_version: Optional[str] = Field(None, description="Версия модели, выполнившей предсказания")
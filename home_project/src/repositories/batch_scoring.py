@@ -0,0 +1,63 @@
+from typing import AsyncIterator, List, Optional, Tuple
+from database import acquire_connection
+
+RESULT_COLUMNS = ["item_id", "status", "is_violation", "probability", "processed_at"]
+
+
+class BatchScoringRepository:
+    async def get_checkpoint(self, job_name: str) -> Optional[dict]:
+        async with acquire_connection() as conn:
+            row = await conn.fetchrow(
+                "SELECT job_name, last_item_id, scored_items, updated_at FROM batch_scoring_checkpoints WHERE job_name = $1",
+                job_name
+            )
+            return dict(row) if row else None
+    
+    async def reset_checkpoint(self, job_name: str) -> None:
+        async with acquire_connection() as conn:
+            await conn.execute("DELETE FROM batch_scoring_checkpoints WHERE job_name = $1", job_name)
+    
+    async def count_items(self, after_item_id: int) -> int:
+        async with acquire_connection() as conn:
+            return await conn.fetchval("SELECT COUNT(*) FROM items WHERE item_id > $1", after_item_id)
+    
+    async def iter_item_chunks(self, after_item_id: int, chunk_size: int) -> AsyncIterator[List]:
+        async with acquire_connection() as conn:
+            async with conn.transaction(readonly=True):
+                cursor = await conn.cursor(
+                    """
+                    SELECT
+                        i.item_id,
+                        u.is_verified_seller,
+                        i.images_qty,
+                        length(i.description) AS description_length,
+                        i.category
+                    FROM items i
+                    JOIN users u ON u.seller_id = i.seller_id
+                    WHERE i.item_id > $1
+                    ORDER BY i.item_id
+                    """,
+                    after_item_id
+                )
+                while True:
+                    rows = await cursor.fetch(chunk_size)
+                    if not rows:
+                        return
+                    yield rows
+    
+    async def write_results(self, job_name: str, results: List[Tuple], last_item_id: int) -> None:
+        async with acquire_connection() as conn:
+            async with conn.transaction():
+                await conn.copy_records_to_table("moderation_results", records=results, columns=RESULT_COLUMNS)
+                await conn.execute(
+                    """
+                    INSERT INTO batch_scoring_checkpoints (job_name, last_item_id, scored_items)
+                    VALUES ($1, $2, $3)
+                    ON CONFLICT (job_name)
+                    DO UPDATE SET
+                        last_item_id = EXCLUDED.last_item_id,
+                        scored_items = batch_scoring_checkpoints.scored_items + EXCLUDED.scored_items,
+                        updated_at = CURRENT_TIMESTAMP
+                    """,
+                    job_name, last_item_id, len(results)
+                )
@@ -1,6 +1,59 @@
 import asyncpg
-from typing import Optional
-from database import get_db_pool
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+from database import acquire_connection
+from clients.postgres_listener import postgres_listener, INVALIDATE_ALL
+from services.cache import LRUCache, MISSING
+
+logger = logging.getLogger(__name__)
+
+ITEM_CACHE_ENABLED = os.getenv("ITEM_CACHE_ENABLED", "false").lower() == "true"
+ITEM_CACHE_MAX_SIZE = int(os.getenv("ITEM_CACHE_MAX_SIZE", "10000"))
+ITEM_CACHE_TTL_SECONDS = float(os.getenv("ITEM_CACHE_TTL_SECONDS", "60"))
+ITEM_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("ITEM_CACHE_NEGATIVE_TTL_SECONDS", "5"))
+ITEMS_CHANNEL = "items_changed"
+USERS_CHANNEL = "users_changed"
+
+item_cache = LRUCache(max_size=ITEM_CACHE_MAX_SIZE, ttl_seconds=ITEM_CACHE_TTL_SECONDS)
+
+
+def invalidate_items(item_ids: List[int]) -> None:
+    for item_id in item_ids:
+        item_cache.invalidate(item_id)
+
+
+def invalidate_sellers(seller_ids: List[int]) -> None:
+    seller_ids = set(seller_ids)
+    item_cache.invalidate_where(lambda item_id, item: item is not None and item["seller_id"] in seller_ids)
+
+
+def _on_items_changed(payload: str) -> None:
+    if payload == INVALIDATE_ALL:
+        item_cache.clear()
+        return
+    invalidate_items([int(item_id) for item_id in payload.split(",") if item_id])
+
+
+def _on_users_changed(payload: str) -> None:
+    if payload == INVALIDATE_ALL:
+        item_cache.clear()
+        return
+    invalidate_sellers([int(seller_id) for seller_id in payload.split(",") if seller_id])
+
+
+async def _ensure_listening() -> None:
+    try:
+        await postgres_listener.subscribe(ITEMS_CHANNEL, _on_items_changed)
+        await postgres_listener.subscribe(USERS_CHANNEL, _on_users_changed)
+    except ConnectionError:
+        pass
+    except Exception as e:
+        logger.warning(f"Не удалось подписаться на изменения объявлений, кэш инвалидируется только по TTL: {str(e)}")
+
+
+def get_item_cache_stats() -> dict:
+    return {"enabled": ITEM_CACHE_ENABLED, **item_cache.snapshot()}
 
 
 class ItemRepository:
@@ -13,8 +66,7 @@ class ItemRepository:
         category: int,
         images_qty: int
     ) -> dict:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
+        async with acquire_connection() as conn:
             row = await conn.fetchrow(
                 """
                 INSERT INTO items (item_id, seller_id, name, description, category, images_qty)
@@ -31,11 +83,72 @@ class ItemRepository:
                 """,
                 item_id, seller_id, name, description, category, images_qty
             )
-            return dict(row) if row else None
+        invalidate_items([item_id])
+        return dict(row) if row else None
+    
+    async def upsert_items_bulk(self, records: List[Tuple[int, int, str, str, int, int]]) -> dict:
+        records = list({record[0]: record for record in records}.values())
+        if not records:
+            return {"upserted": 0, "skipped": 0}
+        async with acquire_connection() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    CREATE TEMP TABLE items_staging (
+                        item_id INTEGER NOT NULL,
+                        seller_id INTEGER NOT NULL,
+                        name VARCHAR(500) NOT NULL,
+                        description TEXT NOT NULL,
+                        category INTEGER NOT NULL,
+                        images_qty INTEGER NOT NULL
+                    ) ON COMMIT DROP
+                    """
+                )
+                await conn.copy_records_to_table(
+                    "items_staging",
+                    records=records,
+                    columns=["item_id", "seller_id", "name", "description", "category", "images_qty"]
+                )
+                row = await conn.fetchrow(
+                    """
+                    WITH upserted AS (
+                        INSERT INTO items (item_id, seller_id, name, description, category, images_qty)
+                        SELECT s.item_id, s.seller_id, s.name, s.description, s.category, s.images_qty
+                        FROM items_staging s
+                        JOIN users u ON u.seller_id = s.seller_id
+                        ON CONFLICT (item_id)
+                        DO UPDATE SET
+                            seller_id = EXCLUDED.seller_id,
+                            name = EXCLUDED.name,
+                            description = EXCLUDED.description,
+                            category = EXCLUDED.category,
+                            images_qty = EXCLUDED.images_qty,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE (items.seller_id, items.name, items.description, items.category, items.images_qty)
+                            IS DISTINCT FROM
+                            (EXCLUDED.seller_id, EXCLUDED.name, EXCLUDED.description, EXCLUDED.category, EXCLUDED.images_qty)
+                        RETURNING 1
+                    )
+                    SELECT
+                        (SELECT COUNT(*) FROM upserted) AS upserted,
+                        (
+                            SELECT COUNT(*) FROM items_staging s
+                            WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.seller_id = s.seller_id)
+                        ) AS skipped
+                    """
+                )
+        invalidate_items([record[0] for record in records])
+        return {"upserted": row["upserted"], "skipped": row["skipped"]}
     
     async def get_item_by_item_id(self, item_id: int) -> Optional[dict]:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
+        if ITEM_CACHE_ENABLED:
+            cached = item_cache.get(item_id)
+            if cached is not MISSING:
+                return dict(cached) if cached is not None else None
+            await _ensure_listening()
+            generation = item_cache.generation
+        
+        async with acquire_connection() as conn:
             row = await conn.fetchrow(
                 """
                 SELECT 
@@ -48,4 +161,31 @@ class ItemRepository:
                 """,
                 item_id
             )
-            return dict(row) if row else None
+        
+        item = dict(row) if row else None
+        if ITEM_CACHE_ENABLED:
+            item_cache.set(
+                item_id,
+                dict(item) if item else None,
+                ttl_seconds=None if item else ITEM_CACHE_NEGATIVE_TTL_SECONDS,
+                generation=generation
+            )
+        return item
+    
+    async def get_items_by_item_ids(self, item_ids: List[int]) -> Dict[int, dict]:
+        if not item_ids:
+            return {}
+        async with acquire_connection() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT 
+                    i.id, i.item_id, i.seller_id, i.name, i.description, 
+                    i.category, i.images_qty, i.created_at, i.updated_at,
+                    u.is_verified_seller
+                FROM items i
+                JOIN users u ON i.seller_id = u.seller_id
+                WHERE i.item_id = ANY($1::int[])
+                """,
+                list(item_ids)
+            )
+            return {row["item_id"]: dict(row) for row in rows}
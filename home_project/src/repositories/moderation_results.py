@@ -1,13 +1,57 @@
 import asyncpg
-from typing import Optional
+import json
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from database import get_db_pool
+from database import acquire_connection
+
+MODERATION_RESULTS_CHANNEL = "moderation_results"
+NOTIFY_ERROR_MESSAGE_MAX_LENGTH = 1000
+
+NOTIFY_UPDATED_SQL = f"""
+SELECT pg_notify(
+    '{MODERATION_RESULTS_CHANNEL}',
+    json_build_object(
+        'id', id,
+        'item_id', item_id,
+        'status', status,
+        'is_violation', is_violation,
+        'probability', probability,
+        'error_message', left(error_message, {NOTIFY_ERROR_MESSAGE_MAX_LENGTH}),
+        'processed_at', processed_at
+    )::text
+)
+FROM updated
+"""
+
+PROCESSING_SELECT_SQL = """
+SELECT
+    m.id AS task_id, m.item_id AS task_item_id, m.status AS task_status,
+    i.id, i.item_id, i.seller_id, i.name, i.description,
+    i.category, i.images_qty, i.created_at, i.updated_at,
+    u.is_verified_seller
+FROM moderation_results m
+LEFT JOIN items i ON i.item_id = m.item_id
+LEFT JOIN users u ON u.seller_id = i.seller_id
+"""
+
+ITEM_COLUMNS = (
+    "id", "item_id", "seller_id", "name", "description",
+    "category", "images_qty", "created_at", "updated_at", "is_verified_seller"
+)
+
+
+def _split_processing_row(row) -> Tuple[dict, Optional[dict]]:
+    task = {"id": row["task_id"], "item_id": row["task_item_id"], "status": row["task_status"]}
+    if row["item_id"] is None or row["is_verified_seller"] is None:
+        return task, None
+    return task, {column: row[column] for column in ITEM_COLUMNS}
 
 
 class ModerationResultsRepository:
-    async def create_task(self, item_id: int) -> dict:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
+    async def create_task(self, item_id: int, dedupe_key: Optional[str] = None) -> dict:
+        if dedupe_key is not None:
+            return await self._create_deduplicated_task(item_id, dedupe_key)
+        async with acquire_connection() as conn:
             row = await conn.fetchrow(
                 """
                 INSERT INTO moderation_results (item_id, status)
@@ -18,9 +62,73 @@ class ModerationResultsRepository:
             )
             return dict(row) if row else None
     
+    async def create_task_with_outbox(
+        self,
+        item_id: int,
+        topic: str,
+        payload: dict,
+        dedupe_key: Optional[str] = None
+    ) -> dict:
+        if dedupe_key is not None:
+            return await self._create_deduplicated_task(item_id, dedupe_key, topic, payload)
+        async with acquire_connection() as conn:
+            row = await conn.fetchrow(
+                """
+                WITH task AS (
+                    INSERT INTO moderation_results (item_id, status)
+                    VALUES ($1, 'pending')
+                    RETURNING id, item_id, status, is_violation, probability, error_message, created_at, processed_at
+                ), outbox AS (
+                    INSERT INTO moderation_outbox (task_id, topic, payload)
+                    SELECT id, $2, $3::jsonb || jsonb_build_object('task_id', id) FROM task
+                )
+                SELECT * FROM task
+                """,
+                item_id, topic, json.dumps(payload)
+            )
+            return dict(row) if row else None
+    
+    async def _create_deduplicated_task(
+        self,
+        item_id: int,
+        dedupe_key: str,
+        topic: Optional[str] = None,
+        payload: Optional[dict] = None
+    ) -> dict:
+        async with acquire_connection() as conn:
+            async with conn.transaction():
+                await conn.execute("SELECT pg_advisory_xact_lock(hashtextextended($1, 0))", dedupe_key)
+                existing = await conn.fetchrow(
+                    """
+                    SELECT id, item_id, status, is_violation, probability, error_message, created_at, processed_at
+                    FROM moderation_results
+                    WHERE dedupe_key = $1 AND status = 'pending'
+                    LIMIT 1
+                    """,
+                    dedupe_key
+                )
+                if existing:
+                    return {**dict(existing), "created": False}
+                
+                row = await conn.fetchrow(
+                    """
+                    WITH task AS (
+                        INSERT INTO moderation_results (item_id, status, dedupe_key)
+                        VALUES ($1, 'pending', $2)
+                        RETURNING id, item_id, status, is_violation, probability, error_message, created_at, processed_at
+                    ), outbox AS (
+                        INSERT INTO moderation_outbox (task_id, topic, payload)
+                        SELECT id, $3, $4::jsonb || jsonb_build_object('task_id', id) FROM task
+                        WHERE $3::varchar IS NOT NULL
+                    )
+                    SELECT * FROM task
+                    """,
+                    item_id, dedupe_key, topic, json.dumps(payload) if payload is not None else None
+                )
+                return {**dict(row), "created": True}
+    
     async def get_task_by_id(self, task_id: int) -> Optional[dict]:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
+        async with acquire_connection() as conn:
             row = await conn.fetchrow(
                 """
                 SELECT id, item_id, status, is_violation, probability, error_message, created_at, processed_at
@@ -31,9 +139,70 @@ class ModerationResultsRepository:
             )
             return dict(row) if row else None
     
+    async def get_tasks_by_ids(self, task_ids: List[int]) -> Dict[int, dict]:
+        if not task_ids:
+            return {}
+        async with acquire_connection() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT id, item_id, status, is_violation, probability, error_message, created_at, processed_at
+                FROM moderation_results
+                WHERE id = ANY($1::int[])
+                """,
+                list(set(task_ids))
+            )
+            return {row["id"]: dict(row) for row in rows}
+    
+    async def get_latest_task_by_item_id(self, item_id: int) -> Optional[dict]:
+        async with acquire_connection() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT id, item_id, status, is_violation, probability, error_message, created_at, processed_at
+                FROM moderation_results
+                WHERE item_id = $1
+                ORDER BY created_at DESC
+                LIMIT 1
+                """,
+                item_id
+            )
+            return dict(row) if row else None
+    
+    async def get_task_for_processing(
+        self,
+        task_id: Optional[int] = None,
+        item_id: Optional[int] = None
+    ) -> Tuple[Optional[dict], Optional[dict]]:
+        async with acquire_connection() as conn:
+            row = await conn.fetchrow(
+                PROCESSING_SELECT_SQL + """
+                WHERE m.id = COALESCE(
+                    $1::int,
+                    (
+                        SELECT id FROM moderation_results
+                        WHERE item_id = $2::int
+                        ORDER BY created_at DESC
+                        LIMIT 1
+                    )
+                )
+                """,
+                task_id, item_id
+            )
+            if not row:
+                return None, None
+            return _split_processing_row(row)
+    
+    async def get_tasks_for_processing(self, task_ids: List[int]) -> Dict[int, Tuple[dict, Optional[dict]]]:
+        if not task_ids:
+            return {}
+        async with acquire_connection() as conn:
+            rows = await conn.fetch(
+                PROCESSING_SELECT_SQL + "WHERE m.id = ANY($1::int[])",
+                list(task_ids)
+            )
+            return {row["task_id"]: _split_processing_row(row) for row in rows}
+    
     async def get_tasks_by_item_id(self, item_id: int) -> list:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
+        async with acquire_connection() as conn:
             rows = await conn.fetch(
                 """
                 SELECT id, item_id, status, is_violation, probability, error_message, created_at, processed_at
@@ -46,30 +215,101 @@ class ModerationResultsRepository:
             return [dict(row) for row in rows]
     
     async def update_task_completed(self, task_id: int, is_violation: bool, probability: float) -> None:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
+        async with acquire_connection() as conn:
             await conn.execute(
                 """
-                UPDATE moderation_results
-                SET status = 'completed',
-                    is_violation = $2,
-                    probability = $3,
-                    processed_at = CURRENT_TIMESTAMP
-                WHERE id = $1
-                """,
+                WITH updated AS (
+                    UPDATE moderation_results
+                    SET status = 'completed',
+                        is_violation = $2,
+                        probability = $3,
+                        processed_at = CURRENT_TIMESTAMP
+                    WHERE id = $1
+                    RETURNING id, item_id, status, is_violation, probability, error_message, processed_at
+                )
+                """ + NOTIFY_UPDATED_SQL,
                 task_id, is_violation, probability
             )
     
     async def update_task_failed(self, task_id: int, error_message: str) -> None:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
+        async with acquire_connection() as conn:
             await conn.execute(
                 """
-                UPDATE moderation_results
-                SET status = 'failed',
-                    error_message = $2,
-                    processed_at = CURRENT_TIMESTAMP
-                WHERE id = $1
-                """,
+                WITH updated AS (
+                    UPDATE moderation_results
+                    SET status = 'failed',
+                        error_message = $2,
+                        processed_at = CURRENT_TIMESTAMP
+                    WHERE id = $1
+                    RETURNING id, item_id, status, is_violation, probability, error_message, processed_at
+                )
+                """ + NOTIFY_UPDATED_SQL,
                 task_id, error_message
             )
+    
+    async def claim_stuck_tasks(self, stuck_after_seconds: float, limit: int) -> List[dict]:
+        async with acquire_connection() as conn:
+            rows = await conn.fetch(
+                """
+                WITH stuck AS (
+                    SELECT id, created_at
+                    FROM moderation_results
+                    WHERE status = 'pending'
+                        AND created_at < CURRENT_TIMESTAMP - make_interval(secs => $1)
+                        AND (swept_at IS NULL OR swept_at < CURRENT_TIMESTAMP - make_interval(secs => $1))
+                    ORDER BY created_at
+                    LIMIT $2
+                    FOR UPDATE SKIP LOCKED
+                )
+                UPDATE moderation_results AS m
+                SET sweep_attempts = m.sweep_attempts + 1,
+                    swept_at = CURRENT_TIMESTAMP
+                FROM stuck
+                WHERE m.id = stuck.id AND m.created_at = stuck.created_at
+                RETURNING m.id, m.item_id, m.created_at, m.sweep_attempts
+                """,
+                stuck_after_seconds, limit
+            )
+            return [dict(row) for row in rows]
+    
+    async def get_latest_tasks_by_item_ids(self, item_ids: List[int]) -> Dict[int, dict]:
+        if not item_ids:
+            return {}
+        async with acquire_connection() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT DISTINCT ON (item_id)
+                    id, item_id, status, is_violation, probability, error_message, created_at, processed_at
+                FROM moderation_results
+                WHERE item_id = ANY($1::int[])
+                ORDER BY item_id, created_at DESC
+                """,
+                list(item_ids)
+            )
+            return {row["item_id"]: dict(row) for row in rows}
+    
+    async def update_tasks_bulk(self, results: List[dict]) -> None:
+        if not results:
+            return
+        async with acquire_connection() as conn:
+            await conn.execute(
+                """
+                WITH updated AS (
+                    UPDATE moderation_results AS m
+                    SET status = u.status,
+                        is_violation = u.is_violation,
+                        probability = u.probability,
+                        error_message = u.error_message,
+                        processed_at = CURRENT_TIMESTAMP
+                    FROM UNNEST($1::int[], $2::varchar[], $3::boolean[], $4::float8[], $5::text[])
+                        AS u(id, status, is_violation, probability, error_message)
+                    WHERE m.id = u.id
+                    RETURNING m.id, m.item_id, m.status, m.is_violation, m.probability, m.error_message, m.processed_at
+                )
+                """ + NOTIFY_UPDATED_SQL,
+                [result["task_id"] for result in results],
+                [result["status"] for result in results],
+                [result.get("is_violation") for result in results],
+                [result.get("probability") for result in results],
+                [result.get("error_message") for result in results]
+            )
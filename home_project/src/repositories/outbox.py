@@ -0,0 +1,47 @@
+import json
+from typing import Awaitable, Callable, List
+from database import acquire_connection
+
+
+class OutboxRepository:
+    async def publish_pending(self, limit: int, publish: Callable[[List[dict]], Awaitable[None]]) -> int:
+        async with acquire_connection() as conn:
+            async with conn.transaction():
+                rows = await conn.fetch(
+                    """
+                    SELECT id, task_id, topic, payload
+                    FROM moderation_outbox
+                    WHERE published_at IS NULL
+                    ORDER BY id
+                    LIMIT $1
+                    FOR UPDATE SKIP LOCKED
+                    """,
+                    limit
+                )
+                if not rows:
+                    return 0
+                
+                records = [
+                    {
+                        "id": row["id"],
+                        "task_id": row["task_id"],
+                        "topic": row["topic"],
+                        "payload": json.loads(row["payload"])
+                    }
+                    for row in rows
+                ]
+                await publish(records)
+                
+                await conn.execute(
+                    """
+                    UPDATE moderation_outbox
+                    SET published_at = CURRENT_TIMESTAMP
+                    WHERE id = ANY($1::bigint[])
+                    """,
+                    [record["id"] for record in records]
+                )
+                return len(records)
+    
+    async def count_unpublished(self) -> int:
+        async with acquire_connection() as conn:
+            return await conn.fetchval("SELECT COUNT(*) FROM moderation_outbox WHERE published_at IS NULL")
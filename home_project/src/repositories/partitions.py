@@ -0,0 +1,81 @@
+import gzip
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import List
+from database import acquire_connection
+
+MODERATION_RESULTS_PARTITIONS_AHEAD = int(os.getenv("MODERATION_RESULTS_PARTITIONS_AHEAD", "3"))
+
+PARTITION_NAME_PATTERN = re.compile(r"^moderation_results_p(\d{4})(\d{2})$")
+
+
+def _quote_partition(name: str) -> str:
+    if not PARTITION_NAME_PATTERN.match(name):
+        raise ValueError(f"Некорректное имя партиции: {name}")
+    return f'"{name}"'
+
+
+def partition_month(name: str) -> date:
+    match = PARTITION_NAME_PATTERN.match(name)
+    if not match:
+        raise ValueError(f"Некорректное имя партиции: {name}")
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+class ModerationPartitionsRepository:
+    async def ensure_partitions(self, months_ahead: int = MODERATION_RESULTS_PARTITIONS_AHEAD) -> List[str]:
+        async with acquire_connection() as conn:
+            rows = await conn.fetch("SELECT ensure_moderation_results_partitions($1) AS name", months_ahead)
+            return [row["name"] for row in rows]
+    
+    async def list_partitions(self) -> List[dict]:
+        async with acquire_connection() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT
+                    c.relname AS name,
+                    i.inhrelid IS NOT NULL AS attached,
+                    COALESCE(i.inhdetachpending, FALSE) AS detach_pending
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+                WHERE n.nspname = current_schema()
+                    AND c.relkind = 'r'
+                    AND c.relname LIKE 'moderation\\_results\\_p%'
+                ORDER BY c.relname
+                """
+            )
+            return [
+                {
+                    "name": row["name"],
+                    "month": partition_month(row["name"]),
+                    "attached": row["attached"] and not row["detach_pending"],
+                    "detach_pending": row["detach_pending"]
+                }
+                for row in rows
+                if PARTITION_NAME_PATTERN.match(row["name"])
+            ]
+    
+    async def detach_partition(self, name: str, finalize: bool = False) -> None:
+        mode = "FINALIZE" if finalize else "CONCURRENTLY"
+        async with acquire_connection() as conn:
+            await conn.execute(f"ALTER TABLE moderation_results DETACH PARTITION {_quote_partition(name)} {mode}")
+    
+    async def archive_partition(self, name: str, path: Path) -> int:
+        _quote_partition(name)
+        async with acquire_connection() as conn:
+            with gzip.open(path, "wb") as archive:
+                async def write(chunk: bytes) -> None:
+                    archive.write(chunk)
+                
+                result = await conn.copy_from_table(name, output=write, format="csv", header=True)
+            return int(result.split()[-1])
+    
+    async def drop_partition(self, name: str) -> None:
+        table = _quote_partition(name)
+        async with acquire_connection() as conn:
+            async with conn.transaction():
+                await conn.execute(f"DELETE FROM moderation_outbox o USING {table} m WHERE o.task_id = m.id")
+                await conn.execute(f"DROP TABLE {table}")
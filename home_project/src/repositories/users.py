@@ -1,12 +1,12 @@
 import asyncpg
-from typing import Optional
-from database import get_db_pool
+from typing import List, Optional, Tuple
+from database import acquire_connection
+from repositories.items import invalidate_sellers
 
 
 class UserRepository:
     async def create_user(self, seller_id: int, is_verified_seller: bool) -> dict:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
+        async with acquire_connection() as conn:
             row = await conn.fetchrow(
                 """
                 INSERT INTO users (seller_id, is_verified_seller)
@@ -17,13 +17,48 @@ class UserRepository:
                 """,
                 seller_id, is_verified_seller
             )
-            return dict(row) if row else None
+        invalidate_sellers([seller_id])
+        return dict(row) if row else None
     
     async def get_user_by_seller_id(self, seller_id: int) -> Optional[dict]:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
+        async with acquire_connection() as conn:
             row = await conn.fetchrow(
                 "SELECT id, seller_id, is_verified_seller, created_at, updated_at FROM users WHERE seller_id = $1",
                 seller_id
             )
             return dict(row) if row else None
+    
+    async def upsert_users_bulk(self, records: List[Tuple[int, bool]]) -> dict:
+        records = list({record[0]: record for record in records}.values())
+        if not records:
+            return {"upserted": 0, "skipped": 0}
+        async with acquire_connection() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    CREATE TEMP TABLE users_staging (
+                        seller_id INTEGER NOT NULL,
+                        is_verified_seller BOOLEAN NOT NULL
+                    ) ON COMMIT DROP
+                    """
+                )
+                await conn.copy_records_to_table(
+                    "users_staging",
+                    records=records,
+                    columns=["seller_id", "is_verified_seller"]
+                )
+                upserted = await conn.fetchval(
+                    """
+                    WITH upserted AS (
+                        INSERT INTO users (seller_id, is_verified_seller)
+                        SELECT seller_id, is_verified_seller FROM users_staging
+                        ON CONFLICT (seller_id)
+                        DO UPDATE SET is_verified_seller = EXCLUDED.is_verified_seller, updated_at = CURRENT_TIMESTAMP
+                        WHERE users.is_verified_seller IS DISTINCT FROM EXCLUDED.is_verified_seller
+                        RETURNING 1
+                    )
+                    SELECT COUNT(*) FROM upserted
+                    """
+                )
+        invalidate_sellers([record[0] for record in records])
+        return {"upserted": upserted, "skipped": 0}
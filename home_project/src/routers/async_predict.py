@@ -1,16 +1,50 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Optional
 from repositories.items import ItemRepository
 from repositories.moderation_results import ModerationResultsRepository
-from models.moderation import AsyncPredictResponse, ModerationResultResponse
-from clients.kafka import send_moderation_request
+from models.moderation import (
+    AsyncPredictResponse,
+    ModerationResultResponse,
+    ModerationResultsBatchRequest,
+    ModerationResultsBatchItem,
+    ModerationResultsBatchResponse
+)
+from services.task_waiters import task_waiters
+from database import unit_of_work
+from clients.kafka import send_moderation_request, build_moderation_message, MODERATION_TOPIC
+import json
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+OUTBOX_ENABLED = os.getenv("OUTBOX_ENABLED", "false").lower() == "true"
+MODERATION_RESULT_MAX_WAIT_SECONDS = float(os.getenv("MODERATION_RESULT_MAX_WAIT_SECONDS", "30"))
+MODERATION_DEDUPE_ENABLED = os.getenv("MODERATION_DEDUPE_ENABLED", "false").lower() == "true"
+MODERATION_RESULTS_BATCH_MAX_IDS = int(os.getenv("MODERATION_RESULTS_BATCH_MAX_IDS", "1000"))
+MODERATION_RESULTS_STREAM_THRESHOLD = int(os.getenv("MODERATION_RESULTS_STREAM_THRESHOLD", "200"))
+MODERATION_RESULTS_STREAM_CHUNK_SIZE = 100
+MAX_TASK_ID = 2 ** 31 - 1
+
 router = APIRouter()
 
 item_repository = ItemRepository()
 moderation_repository = ModerationResultsRepository()
+dedupe_stats = {"created": 0, "deduplicated": 0}
+
+
+def build_dedupe_key(item_data: dict) -> str:
+    updated_at = item_data["updated_at"].isoformat() if item_data.get("updated_at") else ""
+    return f"{item_data['item_id']}:{int(bool(item_data['is_verified_seller']))}:{updated_at}"
+
+
+def get_dedupe_stats() -> dict:
+    return {"enabled": MODERATION_DEDUPE_ENABLED, **dedupe_stats}
+
+
+async def mark_task_send_failed(task_id: int, error: str) -> None:
+    await moderation_repository.update_task_failed(task_id, f"Ошибка отправки в Kafka: {error}")
 
 
 @router.post('/async_predict', response_model=AsyncPredictResponse, status_code=status.HTTP_202_ACCEPTED)
@@ -21,15 +55,25 @@ async def async_predict(item_id: int) -> AsyncPredictResponse:
             detail="item_id должен быть положительным числом"
         )
     
-    item_data = await item_repository.get_item_by_item_id(item_id)
-    
-    if not item_data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Объявление с item_id={item_id} не найдено"
-        )
-    
-    task = await moderation_repository.create_task(item_id)
+    async with unit_of_work():
+        item_data = await item_repository.get_item_by_item_id(item_id)
+        
+        if not item_data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Объявление с item_id={item_id} не найдено"
+            )
+        
+        dedupe_key = build_dedupe_key(item_data) if MODERATION_DEDUPE_ENABLED else None
+        if OUTBOX_ENABLED:
+            task = await moderation_repository.create_task_with_outbox(
+                item_id,
+                MODERATION_TOPIC,
+                build_moderation_message(item_id),
+                dedupe_key=dedupe_key
+            )
+        else:
+            task = await moderation_repository.create_task(item_id, dedupe_key=dedupe_key)
     
     if not task:
         raise HTTPException(
@@ -37,15 +81,26 @@ async def async_predict(item_id: int) -> AsyncPredictResponse:
             detail="Ошибка при создании задачи модерации"
         )
     
-    try:
-        await send_moderation_request(item_id)
-    except Exception as e:
-        logger.error(f"Ошибка при отправке сообщения в Kafka: {str(e)}", exc_info=True)
-        await moderation_repository.update_task_failed(task["id"], f"Ошибка отправки в Kafka: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Ошибка при отправке запроса на модерацию: {str(e)}"
+    if not task.get("created", True):
+        dedupe_stats["deduplicated"] += 1
+        logger.info(f"Для item_id={item_id} уже есть задача в обработке: task_id={task['id']}")
+        return AsyncPredictResponse(
+            task_id=task["id"],
+            status="pending",
+            message="Moderation request already pending"
         )
+    dedupe_stats["created"] += 1
+    
+    if not OUTBOX_ENABLED:
+        try:
+            await send_moderation_request(item_id, task_id=task["id"], on_delivery_failure=mark_task_send_failed)
+        except Exception as e:
+            logger.error(f"Ошибка при отправке сообщения в Kafka: {str(e)}", exc_info=True)
+            await mark_task_send_failed(task["id"], str(e))
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Ошибка при отправке запроса на модерацию: {str(e)}"
+            )
     
     return AsyncPredictResponse(
         task_id=task["id"],
@@ -55,7 +110,10 @@ async def async_predict(item_id: int) -> AsyncPredictResponse:
 
 
 @router.get('/moderation_result/{task_id}', response_model=ModerationResultResponse)
-async def get_moderation_result(task_id: int) -> ModerationResultResponse:
+async def get_moderation_result(
+    task_id: int,
+    wait: float = Query(0, ge=0, description="Сколько секунд ждать завершения задачи")
+) -> ModerationResultResponse:
     if task_id <= 0:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -64,6 +122,13 @@ async def get_moderation_result(task_id: int) -> ModerationResultResponse:
     
     task = await moderation_repository.get_task_by_id(task_id)
     
+    if task and task["status"] == "pending" and wait > 0:
+        task = await task_waiters.wait_for_result(
+            task_id,
+            min(wait, MODERATION_RESULT_MAX_WAIT_SECONDS),
+            moderation_repository.get_task_by_id
+        )
+    
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -77,3 +142,56 @@ async def get_moderation_result(task_id: int) -> ModerationResultResponse:
         probability=task["probability"],
         error_message=task["error_message"]
     )
+
+
+def batch_item_fields(task_id: int, task: Optional[dict]) -> dict:
+    if task is None:
+        return {
+            "task_id": task_id,
+            "found": False,
+            "status": None,
+            "is_violation": None,
+            "probability": None,
+            "error_message": None
+        }
+    return {
+        "task_id": task_id,
+        "found": True,
+        "status": task["status"],
+        "is_violation": task["is_violation"],
+        "probability": task["probability"],
+        "error_message": task["error_message"]
+    }
+
+
+def build_batch_items(task_ids: List[int], tasks: dict) -> List[ModerationResultsBatchItem]:
+    return [ModerationResultsBatchItem(**batch_item_fields(task_id, tasks.get(task_id))) for task_id in task_ids]
+
+
+def stream_batch_items(task_ids: List[int], tasks: dict) -> Iterator[str]:
+    yield '{"results":['
+    for start in range(0, len(task_ids), MODERATION_RESULTS_STREAM_CHUNK_SIZE):
+        chunk = ",".join(
+            json.dumps(batch_item_fields(task_id, tasks.get(task_id)), ensure_ascii=False)
+            for task_id in task_ids[start:start + MODERATION_RESULTS_STREAM_CHUNK_SIZE]
+        )
+        yield chunk if start == 0 else "," + chunk
+    yield "]}"
+
+
+@router.post('/moderation_results:batchGet', response_model=ModerationResultsBatchResponse)
+async def batch_get_moderation_results(request: ModerationResultsBatchRequest):
+    task_ids = request.task_ids
+    if len(task_ids) > MODERATION_RESULTS_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Количество task_ids {len(task_ids)} превышает максимально допустимое {MODERATION_RESULTS_BATCH_MAX_IDS}"
+        )
+    
+    tasks = await moderation_repository.get_tasks_by_ids([task_id for task_id in task_ids if 0 < task_id <= MAX_TASK_ID])
+    
+    logger.info(f"Пакетный запрос результатов модерации: запрошено={len(task_ids)}, найдено={len(tasks)}")
+    
+    if len(task_ids) >= MODERATION_RESULTS_STREAM_THRESHOLD:
+        return StreamingResponse(stream_batch_items(task_ids, tasks), media_type="application/json")
+    return ModerationResultsBatchResponse(results=build_batch_items(task_ids, tasks))
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, HTTPException, Request, status
+from pathlib import Path
+from typing import Literal
+from models.bulk import BulkIngestResponse
+from services.bulk_ingest import ingest_file, detect_format, BulkIngestError
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+BULK_INGEST_SPOOL_DIR = os.getenv("BULK_INGEST_SPOOL_DIR") or None
+
+router = APIRouter()
+
+
+@router.post('/bulk/{kind}', response_model=BulkIngestResponse)
+async def bulk_ingest(kind: Literal["users", "items"], request: Request) -> BulkIngestResponse:
+    try:
+        input_format = detect_format(Path(""), request.headers.get("content-type"))
+    except BulkIngestError:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Ожидается Content-Type text/csv или application/x-ndjson"
+        )
+    
+    descriptor, spool_path = tempfile.mkstemp(prefix=f"bulk_{kind}_", suffix=f".{input_format}", dir=BULK_INGEST_SPOOL_DIR)
+    try:
+        with os.fdopen(descriptor, "wb") as spool:
+            async for chunk in request.stream():
+                spool.write(chunk)
+        stats = await ingest_file(kind, Path(spool_path), input_format)
+    except BulkIngestError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Ошибка пакетной загрузки {kind}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ошибка пакетной загрузки: {str(e)}"
+        )
+    finally:
+        os.unlink(spool_path)
+    
+    return BulkIngestResponse(**stats.snapshot())
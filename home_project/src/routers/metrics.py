@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+from database import get_pool_stats
+from clients.kafka import get_producer_stats
+from repositories.items import get_item_cache_stats
+from routers.predictions import prediction_service
+from services.predictions import get_prediction_cache_stats
+from services.model_registry import model_registry
+from routers.async_predict import get_dedupe_stats
+from services.task_waiters import task_waiters
+from services.result_broadcaster import result_broadcaster
+from routers.simple_predict import prediction_service as simple_prediction_service
+
+router = APIRouter()
+
+
+@router.get('/metrics')
+async def metrics() -> dict:
+    return {
+        "model": model_registry.get_stats(),
+        "prediction_scoring": {
+            "predict": prediction_service.get_scoring_stats(),
+            "simple_predict": simple_prediction_service.get_scoring_stats()
+        },
+        "prediction_batching": {
+            "predict": prediction_service.get_batching_stats(),
+            "simple_predict": simple_prediction_service.get_batching_stats()
+        },
+        "kafka_producer": get_producer_stats(),
+        "item_cache": get_item_cache_stats(),
+        "prediction_cache": get_prediction_cache_stats(),
+        "moderation_result_waiters": task_waiters.get_stats(),
+        "moderation_result_stream": result_broadcaster.get_stats(),
+        "moderation_dedupe": get_dedupe_stats(),
+        "db_pool": get_pool_stats()
+    }
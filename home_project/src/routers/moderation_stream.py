@@ -0,0 +1,76 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional
+from services.result_broadcaster import (
+    result_broadcaster,
+    ResultSubscription,
+    TooManySubscribersError,
+    RESET,
+    DROPPED
+)
+import asyncio
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+RESULT_STREAM_HEARTBEAT_SECONDS = float(os.getenv("RESULT_STREAM_HEARTBEAT_SECONDS", "15"))
+
+router = APIRouter()
+
+
+def format_event(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(subscription: ResultSubscription, heartbeat_seconds: float) -> AsyncIterator[str]:
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            
+            if event is DROPPED:
+                yield format_event("dropped", {"reason": "Клиент не успевает читать поток результатов"})
+                return
+            if event is RESET:
+                yield format_event("reset", {"reason": "Поток переподключен, часть событий могла быть пропущена"})
+                continue
+            yield format_event("result", event, event_id=event["id"])
+    finally:
+        result_broadcaster.unsubscribe(subscription)
+
+
+@router.get('/moderation_results/stream')
+async def stream_moderation_results(
+    item_id: Optional[int] = Query(None, gt=0, description="Только результаты для объявления"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Только результаты с указанным статусом")
+) -> StreamingResponse:
+    try:
+        subscription = await result_broadcaster.subscribe(item_id=item_id, status=status_filter)
+    except TooManySubscribersError as e:
+        logger.warning(f"Отказ в подписке на поток результатов: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Слишком много подписчиков, повторите запрос позже."
+        )
+    except Exception as e:
+        logger.error(f"Не удалось подписаться на поток результатов: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Поток результатов временно недоступен."
+        )
+    
+    return StreamingResponse(
+        event_stream(subscription, RESULT_STREAM_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,19 +1,32 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Body, HTTPException, status
+from pydantic import ValidationError
+from typing import Any, List
 from services.predictions import PredictionService
-from models.predictions import PredictionRequest, PredictionResponse
+from services.model_registry import model_registry
+from services.batching import PredictionQueueFullError
+from models.predictions import PredictionRequest, PredictionResponse, BatchPredictionItem, BatchPredictionResponse
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+PREDICT_BATCH_MAX_ITEMS = int(os.getenv("PREDICT_BATCH_MAX_ITEMS", "1000"))
+
 router = APIRouter()
 
-prediction_service = PredictionService()
+prediction_service = PredictionService(name="predict", registry=model_registry)
 
 
 @router.get('/predict', response_model=PredictionResponse, status_code=status.HTTP_200_OK)
 async def predict(request: PredictionRequest) -> PredictionResponse:
     try:
-        return prediction_service.predict(request)
+        return await prediction_service.predict_async(request)
+    except PredictionQueueFullError as e:
+        logger.warning(f"Очередь предсказаний переполнена: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Сервис перегружен, повторите запрос позже."
+        )
     except RuntimeError as e:
         logger.error(f"Модель не загружена: {str(e)}")
         raise HTTPException(
@@ -26,3 +39,65 @@ async def predict(request: PredictionRequest) -> PredictionResponse:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Ошибка при предсказании: {str(e)}"
         )
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'item'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+@router.post('/predict_batch', response_model=BatchPredictionResponse, status_code=status.HTTP_200_OK)
+async def predict_batch(payload: List[Any] = Body(...)) -> BatchPredictionResponse:
+    if len(payload) > PREDICT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Размер батча {len(payload)} превышает максимально допустимый {PREDICT_BATCH_MAX_ITEMS}"
+        )
+    
+    results: List[BatchPredictionItem] = []
+    valid_indexes: List[int] = []
+    valid_requests: List[PredictionRequest] = []
+    
+    for index, raw_item in enumerate(payload):
+        try:
+            request = PredictionRequest.model_validate(raw_item)
+        except ValidationError as e:
+            item_id = raw_item.get("item_id") if isinstance(raw_item, dict) else None
+            results.append(BatchPredictionItem(
+                index=index,
+                item_id=item_id if isinstance(item_id, int) else None,
+                error=_format_validation_error(e)
+            ))
+            continue
+        results.append(BatchPredictionItem(index=index, item_id=request.item_id))
+        valid_indexes.append(index)
+        valid_requests.append(request)
+    
+    try:
+        predictions = await prediction_service.predict_batch_async(valid_requests, endpoint="predict_batch")
+    except RuntimeError as e:
+        logger.error(f"Модель не загружена: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Модель не загружена. Сервис временно недоступен."
+        )
+    except Exception as e:
+        logger.error(f"Ошибка при пакетном предсказании: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ошибка при пакетном предсказании: {str(e)}"
+        )
+    
+    for index, prediction in zip(valid_indexes, predictions):
+        results[index].is_violation = prediction.is_violation
+        results[index].probability = prediction.probability
+    
+    logger.info(
+        f"Обработан пакетный запрос: всего={len(payload)}, "
+        f"успешно={len(valid_requests)}, с ошибками={len(payload) - len(valid_requests)}"
+    )
+    
+    model_version = predictions[0].model_version if predictions else prediction_service.model_label
+    return BatchPredictionResponse(results=results, model_version=model_version)
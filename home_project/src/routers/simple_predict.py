@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException, status
 from services.predictions import PredictionService
+from services.model_registry import model_registry
+from services.batching import PredictionQueueFullError
 from models.predictions import PredictionRequest, PredictionResponse
 from repositories.items import ItemRepository
 import logging
@@ -8,7 +10,7 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-prediction_service = PredictionService()
+prediction_service = PredictionService(name="simple_predict", registry=model_registry)
 item_repository = ItemRepository()
 
 
@@ -39,7 +41,13 @@ async def simple_predict(item_id: int) -> PredictionResponse:
     )
     
     try:
-        return prediction_service.predict(request)
+        return await prediction_service.predict_async(request)
+    except PredictionQueueFullError as e:
+        logger.warning(f"Очередь предсказаний переполнена: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Сервис перегружен, повторите запрос позже."
+        )
     except RuntimeError as e:
         logger.error(f"Модель не загружена: {str(e)}")
         raise HTTPException(
@@ -0,0 +1,145 @@
+import asyncio
+import inspect
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class PredictionQueueFullError(Exception):
+    pass
+
+
+class BatchStats:
+    def __init__(self):
+        self.batches_total = 0
+        self.requests_total = 0
+        self.rejected_total = 0
+        self.max_batch_size = 0
+        self.histogram: Dict[str, int] = {}
+    
+    def record_batch(self, size: int) -> None:
+        self.batches_total += 1
+        self.requests_total += size
+        self.max_batch_size = max(self.max_batch_size, size)
+        bucket = next((f"<={b}" for b in BATCH_SIZE_BUCKETS if size <= b), f">{BATCH_SIZE_BUCKETS[-1]}")
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+    
+    def snapshot(self) -> dict:
+        avg = self.requests_total / self.batches_total if self.batches_total else 0.0
+        return {
+            "batches_total": self.batches_total,
+            "requests_total": self.requests_total,
+            "rejected_total": self.rejected_total,
+            "avg_batch_size": round(avg, 3),
+            "max_batch_size": self.max_batch_size,
+            "batch_size_histogram": dict(self.histogram),
+        }
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Any],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        max_queue_size: int = 1024
+    ):
+        self.handler = handler
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_queue_size = max_queue_size
+        self.stats = BatchStats()
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_batch_size = 0
+        self._in_flight: List[Tuple[Any, asyncio.Future]] = []
+    
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._batch_ready = asyncio.Event()
+        self._task = loop.create_task(self._run())
+        logger.info(
+            f"Микробатчинг запущен: max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait * 1000:.1f}, max_queue_size={self.max_queue_size}"
+        )
+    
+    async def submit(self, item: Any) -> Any:
+        self._ensure_started()
+        future = self._loop.create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            self.stats.rejected_total += 1
+            raise PredictionQueueFullError("Очередь предсказаний переполнена")
+        if self._queue.qsize() >= self.max_batch_size - 1:
+            self._batch_ready.set()
+        return await future
+    
+    async def _collect_batch(self) -> List[Tuple[Any, asyncio.Future]]:
+        batch = self._in_flight = [await self._queue.get()]
+        under_load = self._last_batch_size > 1 or not self._queue.empty()
+        if under_load and self.max_wait > 0 and self._queue.qsize() < self.max_batch_size - 1:
+            self._batch_ready.clear()
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                pass
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+    
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        self.stats.record_batch(len(items))
+        self._last_batch_size = len(items)
+        try:
+            results = self.handler(items)
+            if inspect.isawaitable(results):
+                results = await results
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            await self._dispatch(batch)
+            self._in_flight = []
+    
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, RuntimeError):
+            pass
+        pending = list(self._in_flight)
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Микробатчинг остановлен"))
+        self._in_flight = []
+        self._task = None
+        logger.info("Микробатчинг остановлен")
+    
+    def get_stats(self) -> dict:
+        stats = self.stats.snapshot()
+        stats["queue_depth"] = self._queue.qsize() if self._queue is not None else 0
+        stats["max_queue_size"] = self.max_queue_size
+        return stats
@@ -0,0 +1,199 @@
+import asyncio
+import csv
+import json
+import logging
+import os
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+from repositories.users import UserRepository
+from repositories.items import ItemRepository
+
+logger = logging.getLogger(__name__)
+
+BULK_INGEST_BATCH_SIZE = int(os.getenv("BULK_INGEST_BATCH_SIZE", "50000"))
+BULK_INGEST_MAX_LOGGED_ERRORS = 10
+
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+FORMAT_EXTENSIONS = {".csv": FORMAT_CSV, ".ndjson": FORMAT_NDJSON, ".jsonl": FORMAT_NDJSON}
+
+TRUE_VALUES = {"true", "1", "t", "yes", "y"}
+FALSE_VALUES = {"false", "0", "f", "no", "n"}
+
+user_repository = UserRepository()
+item_repository = ItemRepository()
+
+
+class BulkIngestError(ValueError):
+    pass
+
+
+class IngestStats:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.rows = 0
+        self.invalid = 0
+        self.upserted = 0
+        self.skipped = 0
+        self.seconds = 0.0
+        self.errors: List[str] = []
+    
+    @property
+    def unchanged(self) -> int:
+        return self.rows - self.invalid - self.upserted - self.skipped
+    
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+    
+    def snapshot(self) -> dict:
+        return {
+            "kind": self.kind,
+            "rows": self.rows,
+            "invalid": self.invalid,
+            "upserted": self.upserted,
+            "unchanged": self.unchanged,
+            "skipped": self.skipped,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": list(self.errors)
+        }
+
+
+def detect_format(path: Path, content_type: Optional[str] = None) -> str:
+    if content_type:
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type == "text/csv":
+            return FORMAT_CSV
+        if media_type in ("application/x-ndjson", "application/jsonl", "application/ndjson"):
+            return FORMAT_NDJSON
+    input_format = FORMAT_EXTENSIONS.get(path.suffix.lower())
+    if input_format is None:
+        raise BulkIngestError(f"Неизвестный формат файла {path.name}: ожидается CSV или NDJSON")
+    return input_format
+
+
+def iter_rows(path: Path, input_format: str) -> Iterator[Union[dict, str]]:
+    with open(path, newline="", encoding="utf-8") as source:
+        if input_format == FORMAT_CSV:
+            yield from csv.DictReader(source)
+            return
+        for line in source:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    normalized = str(value).strip().lower()
+    if normalized in TRUE_VALUES:
+        return True
+    if normalized in FALSE_VALUES:
+        return False
+    raise ValueError(f"некорректное логическое значение {value!r}")
+
+
+def parse_positive_int(row: dict, column: str) -> int:
+    value = int(row[column])
+    if value <= 0:
+        raise ValueError(f"{column} должен быть положительным числом")
+    return value
+
+
+def parse_non_negative_int(row: dict, column: str) -> int:
+    value = int(row[column])
+    if value < 0:
+        raise ValueError(f"{column} не может быть отрицательным")
+    return value
+
+
+def parse_user(row: dict) -> Tuple[int, bool]:
+    return parse_positive_int(row, "seller_id"), parse_bool(row["is_verified_seller"])
+
+
+def parse_item(row: dict) -> Tuple[int, int, str, str, int, int]:
+    name = str(row["name"])
+    if not name or len(name) > 500:
+        raise ValueError("name должен содержать от 1 до 500 символов")
+    return (
+        parse_positive_int(row, "item_id"),
+        parse_positive_int(row, "seller_id"),
+        name,
+        str(row.get("description") or ""),
+        parse_non_negative_int(row, "category"),
+        parse_non_negative_int(row, "images_qty")
+    )
+
+
+PARSERS = {"users": parse_user, "items": parse_item}
+
+
+def read_batch(
+    rows: Iterator[Union[dict, str]],
+    parse: Callable[[dict], tuple],
+    batch_size: int,
+    stats: IngestStats
+) -> Optional[List[tuple]]:
+    raw_rows = list(islice(rows, batch_size))
+    if not raw_rows:
+        return None
+    
+    records = []
+    for row in raw_rows:
+        stats.rows += 1
+        try:
+            if isinstance(row, str):
+                row = json.loads(row)
+            records.append(parse(row))
+        except (KeyError, TypeError, ValueError) as e:
+            stats.invalid += 1
+            if len(stats.errors) < BULK_INGEST_MAX_LOGGED_ERRORS:
+                stats.errors.append(f"строка {stats.rows}: {str(e)}")
+    return records
+
+
+async def ingest_file(
+    kind: str,
+    path: Path,
+    input_format: Optional[str] = None,
+    batch_size: int = BULK_INGEST_BATCH_SIZE
+) -> IngestStats:
+    if kind not in PARSERS:
+        raise BulkIngestError(f"Неизвестный тип данных {kind}: ожидается users или items")
+    parse = PARSERS[kind]
+    upsert = user_repository.upsert_users_bulk if kind == "users" else item_repository.upsert_items_bulk
+    input_format = input_format or detect_format(path)
+    rows = iter_rows(path, input_format)
+    stats = IngestStats(kind=kind)
+    started = time.perf_counter()
+    
+    try:
+        while True:
+            try:
+                records = await asyncio.to_thread(read_batch, rows, parse, batch_size, stats)
+            except (csv.Error, UnicodeDecodeError) as e:
+                raise BulkIngestError(f"Ошибка чтения {path.name} после строки {stats.rows}: {str(e)}")
+            if records is None:
+                break
+            if not records:
+                continue
+            
+            result = await upsert(records)
+            stats.upserted += result["upserted"]
+            stats.skipped += result["skipped"]
+            stats.seconds = time.perf_counter() - started
+            logger.info(f"Загрузка {kind}: обработано {stats.rows} строк, {stats.rows_per_second:.0f} строк/с")
+    finally:
+        rows.close()
+    
+    stats.seconds = time.perf_counter() - started
+    logger.info(
+        f"Загрузка {kind} завершена: строк={stats.rows}, изменено={stats.upserted}, "
+        f"без изменений={stats.unchanged}, пропущено={stats.skipped}, с ошибками={stats.invalid}, "
+        f"{stats.rows_per_second:.0f} строк/с"
+    )
+    return stats
@@ -0,0 +1,100 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+MISSING = object()
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
+
+
+class LRUCache:
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.stats = CacheStats()
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return default
+        
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self.clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+        
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+    
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl_seconds: Optional[float] = None,
+        generation: Optional[int] = None
+    ) -> bool:
+        if generation is not None and generation != self.generation:
+            return False
+        
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = self.clock() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        return True
+    
+    def invalidate(self, key: Hashable) -> None:
+        self.generation += 1
+        if self._entries.pop(key, MISSING) is not MISSING:
+            self.stats.invalidations += 1
+    
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        self.generation += 1
+        keys = [key for key, (value, _) in self._entries.items() if predicate(key, value)]
+        for key in keys:
+            del self._entries[key]
+        self.stats.invalidations += len(keys)
+        return len(keys)
+    
+    def clear(self) -> None:
+        self.generation += 1
+        self.stats.invalidations += len(self._entries)
+        self._entries.clear()
+    
+    def snapshot(self) -> dict:
+        return {"size": len(self._entries), "max_size": self.max_size, **self.stats.snapshot()}
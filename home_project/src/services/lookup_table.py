@@ -0,0 +1,81 @@
+import numpy as np
+import logging
+import time
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+IS_VERIFIED_LEVELS = 2
+IMAGES_QTY_LEVELS = 11
+DESCRIPTION_LENGTH_LEVELS = 1001
+CATEGORY_LEVELS = 101
+
+
+class ScoreLookupTable:
+    def __init__(self, probabilities: np.ndarray, label_indexes: np.ndarray, classes: np.ndarray, build_seconds: float):
+        self.probabilities = probabilities
+        self.label_indexes = label_indexes
+        self.classes = classes
+        self.build_seconds = build_seconds
+        self._flat_probabilities = probabilities.reshape(-1)
+        self._flat_label_indexes = label_indexes.reshape(-1)
+    
+    @property
+    def nbytes(self) -> int:
+        return self.probabilities.nbytes + self.label_indexes.nbytes
+    
+    @classmethod
+    def build(cls, scorer) -> "ScoreLookupTable":
+        started = time.perf_counter()
+        shape = (IS_VERIFIED_LEVELS, IMAGES_QTY_LEVELS, DESCRIPTION_LENGTH_LEVELS, CATEGORY_LEVELS)
+        probabilities = np.empty(shape, dtype=np.float32)
+        label_indexes = np.empty(shape, dtype=np.uint8)
+        
+        description_grid, category_grid = np.meshgrid(
+            np.arange(DESCRIPTION_LENGTH_LEVELS, dtype=np.float64) / 1000.0,
+            np.arange(CATEGORY_LEVELS, dtype=np.float64) / 100.0,
+            indexing="ij"
+        )
+        description_column = description_grid.ravel()
+        category_column = category_grid.ravel()
+        block_shape = (DESCRIPTION_LENGTH_LEVELS, CATEGORY_LEVELS)
+        
+        classes = np.asarray(scorer.classes)
+        for is_verified in range(IS_VERIFIED_LEVELS):
+            for images_qty in range(IMAGES_QTY_LEVELS):
+                features = np.column_stack([
+                    np.full(description_column.shape, float(is_verified)),
+                    np.full(description_column.shape, images_qty / 10.0),
+                    description_column,
+                    category_column
+                ])
+                labels, block_probabilities = scorer.score(features)
+                probabilities[is_verified, images_qty] = block_probabilities.reshape(block_shape)
+                label_indexes[is_verified, images_qty] = np.searchsorted(classes, labels).reshape(block_shape)
+        
+        table = cls(probabilities, label_indexes, classes, time.perf_counter() - started)
+        logger.info(
+            f"Построена таблица предсказаний: {probabilities.size} ячеек, "
+            f"{table.nbytes / 1024 / 1024:.1f} МБ, за {table.build_seconds:.3f} с"
+        )
+        return table
+    
+    def lookup(
+        self,
+        is_verified: np.ndarray,
+        images_qty: np.ndarray,
+        description_length: np.ndarray,
+        category: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        index = np.minimum(images_qty, IMAGES_QTY_LEVELS - 1)
+        index = index + is_verified * IMAGES_QTY_LEVELS
+        index = index * DESCRIPTION_LENGTH_LEVELS + np.minimum(description_length, DESCRIPTION_LENGTH_LEVELS - 1)
+        index = index * CATEGORY_LEVELS + np.minimum(category, CATEGORY_LEVELS - 1)
+        labels = self.classes.take(self._flat_label_indexes.take(index))
+        return labels, self._flat_probabilities.take(index).astype(np.float64)
+    
+    def lookup_one(self, is_verified: bool, images_qty: int, description_length: int, category: int) -> Tuple[object, float]:
+        index = int(is_verified) * IMAGES_QTY_LEVELS + min(images_qty, IMAGES_QTY_LEVELS - 1)
+        index = index * DESCRIPTION_LENGTH_LEVELS + min(description_length, DESCRIPTION_LENGTH_LEVELS - 1)
+        index = index * CATEGORY_LEVELS + min(category, CATEGORY_LEVELS - 1)
+        return self.classes[self._flat_label_indexes[index]], float(self._flat_probabilities[index])
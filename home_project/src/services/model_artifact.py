@@ -0,0 +1,160 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = "moderation-linear-model"
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+ARRAY_NAMES = ("coef", "intercept", "classes")
+FEATURE_SCHEMA = [
+    "is_verified_seller",
+    "images_qty / 10, не больше 1",
+    "description_length / 1000, не больше 1",
+    "category / 100, не больше 1"
+]
+
+
+class LinearModelArtifact:
+    def __init__(self, path: Path, manifest: dict, coef: np.ndarray, intercept: np.ndarray, classes: np.ndarray):
+        self.path = path
+        self.manifest = manifest
+        self.coef_ = coef
+        self.intercept_ = intercept
+        self.classes_ = classes
+    
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+    
+    def decision_function(self, features: np.ndarray) -> np.ndarray:
+        return np.asarray(features, dtype=np.float64) @ self.coef_[0] + self.intercept_[0]
+    
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        decision = self.decision_function(features)
+        with np.errstate(over="ignore"):
+            probabilities = 1.0 / (1.0 + np.exp(-decision))
+        return np.column_stack([1.0 - probabilities, probabilities])
+    
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return self.classes_[(self.decision_function(features) > 0).astype(np.intp)]
+    
+    def __reduce__(self):
+        return _restore_artifact, (str(self.path), self.manifest)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _combine_checksum(arrays: dict) -> str:
+    digest = hashlib.sha256()
+    for name in ARRAY_NAMES:
+        digest.update(f"{name}:{arrays[name]['sha256']}\n".encode())
+    return digest.hexdigest()
+
+
+def read_manifest(path) -> Optional[dict]:
+    try:
+        with open(Path(path) / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_artifact(model, path, version: Optional[str] = None, source: Optional[str] = None) -> dict:
+    path = Path(path)
+    if not all(hasattr(model, attr) for attr in ("coef_", "intercept_", "classes_")):
+        raise ValueError(f"Модель {type(model).__name__} не линейная, конвертация в артефакт не поддерживается")
+    coef = np.ascontiguousarray(model.coef_, dtype=np.float64)
+    intercept = np.ascontiguousarray(np.ravel(model.intercept_), dtype=np.float64)
+    classes = np.asarray(model.classes_)
+    if coef.shape != (1, len(FEATURE_SCHEMA)) or intercept.shape != (1,) or classes.shape != (2,):
+        raise ValueError(f"Поддерживаются только бинарные линейные модели с {len(FEATURE_SCHEMA)} признаками")
+    if classes.dtype == object:
+        raise ValueError("Классы модели должны быть числами или строками фиксированной длины")
+    
+    path.mkdir(parents=True, exist_ok=True)
+    arrays = {}
+    for name, array in zip(ARRAY_NAMES, (coef, intercept, classes)):
+        temp_path = path / f".{name}.npy.tmp"
+        with open(temp_path, "wb") as f:
+            np.save(f, array, allow_pickle=False)
+        sha256 = _file_sha256(temp_path)
+        file_name = f"{name}-{sha256[:16]}.npy"
+        os.replace(temp_path, path / file_name)
+        arrays[name] = {"file": file_name, "dtype": str(array.dtype), "shape": list(array.shape), "sha256": sha256}
+    
+    checksum = _combine_checksum(arrays)
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "version": version or checksum[:12],
+        "model_type": type(model).__name__,
+        "features": FEATURE_SCHEMA,
+        "arrays": arrays,
+        "checksum": checksum,
+        "source": source,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    temp_manifest = path / f".{MANIFEST_NAME}.tmp"
+    temp_manifest.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(temp_manifest, path / MANIFEST_NAME)
+    
+    referenced = {spec["file"] for spec in arrays.values()}
+    for stale in path.glob("*.npy"):
+        if stale.name not in referenced:
+            stale.unlink()
+    
+    logger.info(f"Артефакт модели {manifest['version']} сохранен в {path}")
+    return manifest
+
+
+def _open_artifact(path: Path, manifest: dict, verify: bool) -> LinearModelArtifact:
+    if manifest.get("format") != ARTIFACT_FORMAT or manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(
+            f"Неподдерживаемый формат артефакта {manifest.get('format')} версии {manifest.get('format_version')}"
+        )
+    if manifest.get("features") != FEATURE_SCHEMA:
+        raise ValueError(f"Схема признаков артефакта {manifest.get('features')} не совпадает со схемой сервиса")
+    if verify and _combine_checksum(manifest["arrays"]) != manifest["checksum"]:
+        raise ValueError(f"Контрольная сумма артефакта {path} не совпадает с манифестом")
+    
+    arrays = {}
+    for name in ARRAY_NAMES:
+        spec = manifest["arrays"][name]
+        file_path = path / spec["file"]
+        if not file_path.exists():
+            raise FileNotFoundError(f"Файл {file_path} артефакта версии {manifest['version']} не найден")
+        if verify and _file_sha256(file_path) != spec["sha256"]:
+            raise ValueError(f"Контрольная сумма {file_path} не совпадает с манифестом")
+        array = np.load(file_path, mmap_mode="r", allow_pickle=False)
+        if list(array.shape) != spec["shape"] or str(array.dtype) != spec["dtype"]:
+            raise ValueError(f"Массив {file_path} не совпадает с описанием в манифесте")
+        arrays[name] = array
+    
+    return LinearModelArtifact(path, manifest, arrays["coef"], arrays["intercept"], arrays["classes"])
+
+
+def _restore_artifact(path: str, manifest: dict) -> LinearModelArtifact:
+    return _open_artifact(Path(path), manifest, verify=False)
+
+
+def load_artifact(path, verify: bool = True) -> LinearModelArtifact:
+    path = Path(path)
+    manifest = read_manifest(path)
+    if manifest is None:
+        raise FileNotFoundError(f"Артефакт модели не найден: нет {path / MANIFEST_NAME}")
+    artifact = _open_artifact(path, manifest, verify)
+    logger.info(f"Артефакт модели {manifest['version']} загружен из {path}")
+    return artifact
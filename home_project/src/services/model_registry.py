@@ -0,0 +1,197 @@
+import asyncio
+import itertools
+import logging
+import os
+import time
+import weakref
+from pathlib import Path
+from typing import Optional
+from model import load_model, MODEL_ARTIFACT_PATH
+from services.model_artifact import load_artifact, read_manifest
+
+logger = logging.getLogger(__name__)
+
+MODEL_WATCH_ENABLED = os.getenv("MODEL_WATCH_ENABLED", "false").lower() == "true"
+MODEL_WATCH_INTERVAL_SECONDS = float(os.getenv("MODEL_WATCH_INTERVAL_SECONDS", "30"))
+
+_model_versions = itertools.count(1)
+
+
+class LocalFileModelSource:
+    def __init__(self, path: str = "model.pkl"):
+        self.path = Path(path)
+    
+    @property
+    def description(self) -> str:
+        return f"file:{self.path}"
+    
+    def current_version(self) -> Optional[str]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return f"{self.path.name}@{stat.st_mtime_ns}"
+    
+    def load(self, version: str):
+        return load_model(str(self.path))
+
+
+class MlflowModelSource:
+    def __init__(self, model_name: str = "moderation-model", stage: str = "Production"):
+        self.model_name = model_name
+        self.stage = stage
+    
+    @property
+    def description(self) -> str:
+        return f"mlflow:{self.model_name}/{self.stage}"
+    
+    def current_version(self) -> Optional[str]:
+        from mlflow.tracking import MlflowClient
+        
+        versions = MlflowClient().get_latest_versions(self.model_name, stages=[self.stage])
+        if not versions:
+            return None
+        return f"{self.model_name}/{versions[0].version}"
+    
+    def load(self, version: str):
+        import mlflow.sklearn
+        
+        return mlflow.sklearn.load_model(f"models:/{version}")
+
+
+class ArtifactModelSource:
+    def __init__(self, path: str = MODEL_ARTIFACT_PATH):
+        self.path = Path(path)
+    
+    @property
+    def description(self) -> str:
+        return f"artifact:{self.path}"
+    
+    def current_version(self) -> Optional[str]:
+        manifest = read_manifest(self.path)
+        return manifest["version"] if manifest is not None else None
+    
+    def load(self, version: str):
+        return load_artifact(self.path)
+
+
+def get_model_source(use_mlflow: bool):
+    if use_mlflow:
+        return MlflowModelSource()
+    if MODEL_ARTIFACT_PATH:
+        return ArtifactModelSource()
+    return LocalFileModelSource()
+
+
+class ModelRegistry:
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self.model = None
+        self.version: Optional[int] = None
+        self.label: Optional[str] = None
+        self.source_version: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.swaps = 0
+        self.last_error: Optional[str] = None
+        self.last_check: Optional[float] = None
+        self._services = weakref.WeakSet()
+        self._watch_task: Optional[asyncio.Task] = None
+        self._source = None
+    
+    def attach(self, service) -> None:
+        self._services.add(service)
+        if self.model is not None:
+            service.activate_model(service.prepare_model(self.model, self.version, self.label))
+    
+    def _prepare(self, model, version: Optional[int], label: Optional[str]) -> dict:
+        states = {}
+        prepared = {}
+        for service in list(self._services):
+            if service.scoring_mode not in states:
+                states[service.scoring_mode] = service.prepare_model(model, version, label)
+            state = states[service.scoring_mode]
+            prepared[service] = (state, service.prepare_process_pool(state))
+        return prepared
+    
+    def _activate(self, model, version: Optional[int], label: Optional[str], prepared: dict) -> None:
+        self.model = model
+        self.version = version
+        self.label = label
+        self.loaded_at = time.time() if model is not None else None
+        for service in list(self._services):
+            state, process_pool = prepared.get(service) or (service.prepare_model(model, version, label), None)
+            service.activate_model(state, process_pool)
+        self.swaps += 1
+    
+    def set_model(self, model, label: Optional[str] = None, source_version: Optional[str] = None) -> None:
+        version = next(_model_versions) if model is not None else None
+        label = label or source_version or (str(version) if version is not None else None)
+        self._activate(model, version, label, self._prepare(model, version, label))
+        self.source_version = source_version
+    
+    async def load(self, model, label: Optional[str] = None, source_version: Optional[str] = None) -> None:
+        version = next(_model_versions)
+        label = label or source_version or str(version)
+        started = time.perf_counter()
+        prepared = await asyncio.to_thread(self._prepare, model, version, label)
+        previous_label = self.label
+        self._activate(model, version, label, prepared)
+        self.source_version = source_version
+        logger.info(
+            f"Модель заменена: {previous_label} -> {label} "
+            f"(подготовка {time.perf_counter() - started:.3f} с, сервисов: {len(prepared)})"
+        )
+    
+    async def refresh(self, source) -> bool:
+        self.last_check = time.time()
+        source_version = await asyncio.to_thread(source.current_version)
+        if source_version is None or source_version == self.source_version:
+            return False
+        
+        logger.info(f"Обнаружена новая версия модели {source_version} в {source.description}, загрузка...")
+        model = await asyncio.to_thread(source.load, source_version)
+        await self.load(model, source_version=source_version)
+        self.last_error = None
+        return True
+    
+    async def _watch(self, source, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh(source)
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Ошибка при обновлении модели из {source.description}: {str(e)}", exc_info=True)
+    
+    def start_watching(self, source, interval: float = MODEL_WATCH_INTERVAL_SECONDS) -> None:
+        if self._watch_task is not None:
+            return
+        self._source = source
+        self._watch_task = asyncio.create_task(self._watch(source, interval))
+        logger.info(f"Отслеживание новых версий модели в {source.description} каждые {interval} с")
+    
+    async def stop_watching(self) -> None:
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        try:
+            await self._watch_task
+        except asyncio.CancelledError:
+            pass
+        self._watch_task = None
+    
+    def get_stats(self) -> dict:
+        return {
+            "version": self.label,
+            "source": self._source.description if self._source is not None else None,
+            "source_version": self.source_version,
+            "loaded_at": self.loaded_at,
+            "swaps": self.swaps,
+            "watching": self._watch_task is not None,
+            "last_check": self.last_check,
+            "last_error": self.last_error,
+            "services": len(self._services)
+        }
+
+
+model_registry = ModelRegistry(name="shared")
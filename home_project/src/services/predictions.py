@@ -1,14 +1,194 @@
+import asyncio
+import multiprocessing
 import numpy as np
 import logging
-from typing import Optional
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Hashable, List, Optional, Tuple
 from models.predictions import PredictionRequest, PredictionResponse
+from services.batching import MicroBatcher
+from services.scorers import compile_scorer
+from services.cache import CacheStats, LRUCache, MISSING
+from services.model_registry import ModelRegistry
+from services.lookup_table import (
+    ScoreLookupTable,
+    IMAGES_QTY_LEVELS,
+    DESCRIPTION_LENGTH_LEVELS,
+    CATEGORY_LEVELS
+)
 
 logger = logging.getLogger(__name__)
 
+PREDICTION_BATCHING_ENABLED = os.getenv("PREDICTION_BATCHING_ENABLED", "false").lower() == "true"
+PREDICTION_BATCH_MAX_SIZE = int(os.getenv("PREDICTION_BATCH_MAX_SIZE", "64"))
+PREDICTION_BATCH_MAX_WAIT_MS = float(os.getenv("PREDICTION_BATCH_MAX_WAIT_MS", "5"))
+PREDICTION_BATCH_QUEUE_SIZE = int(os.getenv("PREDICTION_BATCH_QUEUE_SIZE", "1024"))
+PREDICTION_SCORING_MODE = os.getenv("PREDICTION_SCORING_MODE", "direct").lower()
+PREDICTION_EXECUTION_MODE = os.getenv("PREDICTION_EXECUTION_MODE", "inline").lower()
+PREDICTION_EXECUTOR_WORKERS = int(os.getenv("PREDICTION_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+PREDICTION_CACHE_ENABLED = os.getenv("PREDICTION_CACHE_ENABLED", "false").lower() == "true"
+PREDICTION_CACHE_MAX_SIZE = int(os.getenv("PREDICTION_CACHE_MAX_SIZE", "100000"))
+
+_process_service: Optional["PredictionService"] = None
+
+prediction_cache = LRUCache(max_size=PREDICTION_CACHE_MAX_SIZE)
+prediction_cache_stats: Dict[str, CacheStats] = {}
+
+
+def get_prediction_cache_stats() -> dict:
+    return {
+        "enabled": PREDICTION_CACHE_ENABLED,
+        "size": len(prediction_cache),
+        "max_size": prediction_cache.max_size,
+        "evictions": prediction_cache.stats.evictions,
+        "invalidations": prediction_cache.stats.invalidations,
+        "endpoints": {
+            endpoint: {key: value for key, value in stats.snapshot().items() if key in ("hits", "misses", "hit_rate")}
+            for endpoint, stats in prediction_cache_stats.items()
+        }
+    }
+
+
+def _init_process_worker(model, scoring_mode: str, model_label: Optional[str] = None) -> None:
+    global _process_service
+    _process_service = PredictionService(batching=False, scoring_mode=scoring_mode, execution_mode="inline", cache=False)
+    _process_service.registry.set_model(model, label=model_label)
+
+
+def _process_predict(request: PredictionRequest) -> PredictionResponse:
+    return _process_service.predict(request)
+
+
+def _process_predict_batch(requests: List[PredictionRequest]) -> List[PredictionResponse]:
+    return _process_service.predict_batch(requests)
+
+
+def _process_ready() -> Optional[str]:
+    return _process_service.model_label
+
+
+def _process_score_raw(columns: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    return _process_service.score_raw(*columns)
+
+
+def build_feature_matrix(
+    is_verified: np.ndarray,
+    images_qty: np.ndarray,
+    description_length: np.ndarray,
+    category: np.ndarray
+) -> np.ndarray:
+    return np.column_stack([
+        is_verified.astype(np.float64),
+        np.minimum(images_qty / 10.0, 1.0),
+        np.minimum(description_length / 1000.0, 1.0),
+        np.minimum(category / 100.0, 1.0)
+    ])
+
+
+WARMUP_FEATURES = build_feature_matrix(*(np.zeros(1, dtype=np.int64) for _ in range(4)))
+
+
+class ModelState:
+    def __init__(self, model=None, version: Optional[int] = None, label: Optional[str] = None, scorer=None, lookup_table: Optional[ScoreLookupTable] = None):
+        self.model = model
+        self.version = version
+        self.label = label
+        self.scorer = scorer
+        self.lookup_table = lookup_table
+
+
+EMPTY_MODEL_STATE = ModelState()
+
 
 class PredictionService:
-    def __init__(self):
-        self.model: Optional[object] = None
+    def __init__(
+        self,
+        batching: Optional[bool] = None,
+        scoring_mode: Optional[str] = None,
+        execution_mode: Optional[str] = None,
+        executor_workers: Optional[int] = None,
+        cache: Optional[bool] = None,
+        name: str = "default",
+        registry: Optional[ModelRegistry] = None
+    ):
+        self.name = name
+        self.cache_enabled = PREDICTION_CACHE_ENABLED if cache is None else cache
+        self._state = EMPTY_MODEL_STATE
+        self.scoring_mode = (scoring_mode or PREDICTION_SCORING_MODE).lower()
+        if self.scoring_mode not in ("direct", "lookup"):
+            raise ValueError(f"Неизвестный режим скоринга: {self.scoring_mode}")
+        self.execution_mode = (execution_mode or PREDICTION_EXECUTION_MODE).lower()
+        if self.execution_mode not in ("inline", "thread", "process"):
+            raise ValueError(f"Неизвестный режим выполнения: {self.execution_mode}")
+        self.executor_workers = executor_workers or PREDICTION_EXECUTOR_WORKERS
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self.batcher: Optional[MicroBatcher] = None
+        
+        if batching is None:
+            batching = PREDICTION_BATCHING_ENABLED
+        if batching:
+            self.batcher = MicroBatcher(
+                self._predict_batch_uncached,
+                max_batch_size=PREDICTION_BATCH_MAX_SIZE,
+                max_wait_ms=PREDICTION_BATCH_MAX_WAIT_MS,
+                max_queue_size=PREDICTION_BATCH_QUEUE_SIZE
+            )
+        
+        self.registry = registry or ModelRegistry(name=name)
+        self.registry.attach(self)
+    
+    @property
+    def model(self) -> Optional[object]:
+        return self._state.model
+    
+    @model.setter
+    def model(self, model) -> None:
+        self.registry.set_model(model)
+    
+    @property
+    def model_version(self) -> Optional[int]:
+        return self._state.version
+    
+    @property
+    def model_label(self) -> Optional[str]:
+        return self._state.label
+    
+    @property
+    def scorer(self):
+        return self._state.scorer
+    
+    @property
+    def lookup_table(self) -> Optional[ScoreLookupTable]:
+        return self._state.lookup_table
+    
+    def prepare_model(self, model, version: Optional[int], label: Optional[str]) -> ModelState:
+        if model is None:
+            return EMPTY_MODEL_STATE
+        scorer = compile_scorer(model)
+        lookup_table = None
+        if scorer is not None and self.scoring_mode == "lookup":
+            lookup_table = ScoreLookupTable.build(scorer)
+        elif scorer is not None:
+            scorer.score(WARMUP_FEATURES)
+        return ModelState(model, version, label, scorer, lookup_table)
+    
+    def prepare_process_pool(self, state: ModelState) -> Optional[ProcessPoolExecutor]:
+        if self.execution_mode != "process" or state.model is None:
+            return None
+        process_pool = self._create_process_pool(state)
+        futures = [process_pool.submit(_process_ready) for _ in range(self.executor_workers)]
+        for future in futures:
+            future.result()
+        return process_pool
+    
+    def activate_model(self, state: ModelState, process_pool: Optional[ProcessPoolExecutor] = None) -> None:
+        previous_version = self._state.version
+        self._state = state
+        if previous_version is not None and previous_version != state.version:
+            prediction_cache.invalidate_where(lambda key, _: key[0] == previous_version)
+        self._reset_process_pool()
+        self._process_pool = process_pool
     
     def set_model(self, model):
         self.model = model
@@ -23,8 +203,54 @@ class PredictionService:
         features = np.array([[is_verified, images_normalized, description_length_normalized, category_normalized]])
         return features
     
+    def _extract_raw_batch(self, requests: List[PredictionRequest]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        count = len(requests)
+        is_verified = np.fromiter((request.is_verified_seller for request in requests), dtype=np.int64, count=count)
+        images_qty = np.fromiter((request.images_qty for request in requests), dtype=np.int64, count=count)
+        description_length = np.fromiter((len(request.description) for request in requests), dtype=np.int64, count=count)
+        category = np.fromiter((request.category for request in requests), dtype=np.int64, count=count)
+        return is_verified, images_qty, description_length, category
+    
+    def _prepare_features_batch(self, requests: List[PredictionRequest]) -> np.ndarray:
+        return build_feature_matrix(*self._extract_raw_batch(requests))
+    
+    def score_raw(
+        self,
+        is_verified: np.ndarray,
+        images_qty: np.ndarray,
+        description_length: np.ndarray,
+        category: np.ndarray,
+        state: Optional[ModelState] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        state = state or self._state
+        if state.model is None:
+            logger.error("Модель не загружена")
+            raise RuntimeError("Модель не загружена")
+        if state.lookup_table is not None:
+            return state.lookup_table.lookup(is_verified, images_qty, description_length, category)
+        return state.scorer.score(build_feature_matrix(is_verified, images_qty, description_length, category))
+    
+    def _cache_key(self, request: PredictionRequest) -> Hashable:
+        return (
+            self.model_version,
+            bool(request.is_verified_seller),
+            min(request.images_qty, IMAGES_QTY_LEVELS - 1),
+            min(len(request.description), DESCRIPTION_LENGTH_LEVELS - 1),
+            min(request.category, CATEGORY_LEVELS - 1)
+        )
+    
+    def _cache_get(self, key: Hashable, endpoint: str):
+        stats = prediction_cache_stats.setdefault(endpoint, CacheStats())
+        cached = prediction_cache.get(key)
+        if cached is MISSING:
+            stats.misses += 1
+        else:
+            stats.hits += 1
+        return cached
+    
     def predict(self, request: PredictionRequest) -> PredictionResponse:
-        if self.model is None:
+        state = self._state
+        if state.model is None:
             logger.error("Модель не загружена")
             raise RuntimeError("Модель не загружена")
         
@@ -36,11 +262,15 @@ class PredictionService:
         )
         
         try:
-            features = self._prepare_features(request)
-            logger.info(f"Подготовлены признаки для модели: {features[0]}")
-            
-            prediction = self.model.predict(features)[0]
-            probability = self.model.predict_proba(features)[0][1]
+            if state.lookup_table is not None:
+                prediction, probability = state.lookup_table.lookup_one(
+                    request.is_verified_seller, request.images_qty, len(request.description), request.category
+                )
+            else:
+                features = self._prepare_features(request)
+                logger.info(f"Подготовлены признаки для модели: {features[0]}")
+                predictions, probabilities = state.scorer.score(features)
+                prediction, probability = predictions[0], probabilities[0]
             
             is_violation = bool(prediction)
             
@@ -51,8 +281,150 @@ class PredictionService:
             
             return PredictionResponse(
                 is_violation=is_violation,
-                probability=float(probability)
+                probability=float(probability),
+                model_version=state.label
             )
         except Exception as e:
             logger.error(f"Ошибка при предсказании: {str(e)}", exc_info=True)
             raise
+    
+    def predict_batch(self, requests: List[PredictionRequest]) -> List[PredictionResponse]:
+        state = self._state
+        if state.model is None:
+            logger.error("Модель не загружена")
+            raise RuntimeError("Модель не загружена")
+        
+        if not requests:
+            return []
+        
+        try:
+            predictions, probabilities = self.score_raw(*self._extract_raw_batch(requests), state=state)
+            
+            logger.info(f"Выполнено пакетное предсказание: размер батча={len(requests)}")
+            
+            return [
+                PredictionResponse(
+                    is_violation=bool(prediction),
+                    probability=float(probability),
+                    model_version=state.label
+                )
+                for prediction, probability in zip(predictions, probabilities)
+            ]
+        except Exception as e:
+            logger.error(f"Ошибка при пакетном предсказании: {str(e)}", exc_info=True)
+            raise
+    
+    def _get_executor(self) -> Executor:
+        if self.execution_mode == "thread":
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.executor_workers,
+                    thread_name_prefix="prediction"
+                )
+            return self._thread_pool
+        
+        if self._process_pool is None:
+            self._process_pool = self._create_process_pool(self._state)
+        return self._process_pool
+    
+    def _create_process_pool(self, state: ModelState) -> ProcessPoolExecutor:
+        process_pool = ProcessPoolExecutor(
+            max_workers=self.executor_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_process_worker,
+            initargs=(state.model, self.scoring_mode, state.label)
+        )
+        logger.info(f"Запущен пул процессов для предсказаний: {self.executor_workers} процессов")
+        return process_pool
+    
+    def _reset_process_pool(self) -> None:
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=False)
+            self._process_pool = None
+            logger.info("Пул процессов для предсказаний остановлен")
+    
+    async def _execute(self, func, process_func, argument):
+        if self.model is None:
+            logger.error("Модель не загружена")
+            raise RuntimeError("Модель не загружена")
+        
+        if self.execution_mode == "inline":
+            return func(argument)
+        
+        loop = asyncio.get_running_loop()
+        if self.execution_mode == "thread":
+            return await loop.run_in_executor(self._get_executor(), func, argument)
+        return await loop.run_in_executor(self._get_executor(), process_func, argument)
+    
+    async def _predict_batch_uncached(self, requests: List[PredictionRequest]) -> List[PredictionResponse]:
+        return await self._execute(self.predict_batch, _process_predict_batch, requests)
+    
+    async def predict_batch_async(
+        self,
+        requests: List[PredictionRequest],
+        endpoint: Optional[str] = None
+    ) -> List[PredictionResponse]:
+        if not self.cache_enabled or self.model is None:
+            return await self._predict_batch_uncached(requests)
+        
+        endpoint = endpoint or self.name
+        generation = prediction_cache.generation
+        keys = [self._cache_key(request) for request in requests]
+        results = [self._cache_get(key, endpoint) for key in keys]
+        missing = [index for index, result in enumerate(results) if result is MISSING]
+        if missing:
+            computed = await self._predict_batch_uncached([requests[index] for index in missing])
+            for index, response in zip(missing, computed):
+                results[index] = response
+                prediction_cache.set(keys[index], response, generation=generation)
+        return results
+    
+    async def predict_async(self, request: PredictionRequest, endpoint: Optional[str] = None) -> PredictionResponse:
+        if not self.cache_enabled or self.model is None:
+            return await self._predict_uncached(request)
+        
+        key = self._cache_key(request)
+        cached = self._cache_get(key, endpoint or self.name)
+        if cached is not MISSING:
+            return cached
+        
+        generation = prediction_cache.generation
+        response = await self._predict_uncached(request)
+        prediction_cache.set(key, response, generation=generation)
+        return response
+    
+    async def _predict_uncached(self, request: PredictionRequest) -> PredictionResponse:
+        if self.batcher is None:
+            return await self._execute(self.predict, _process_predict, request)
+        
+        if self.model is None:
+            logger.error("Модель не загружена")
+            raise RuntimeError("Модель не загружена")
+        
+        return await self.batcher.submit(request)
+    
+    def get_scoring_stats(self) -> dict:
+        stats = {
+            "model_version": self.model_label,
+            "mode": self.scoring_mode,
+            "execution_mode": self.execution_mode,
+            "scorer": type(self.scorer).__name__ if self.scorer is not None else None,
+            "compiled": bool(getattr(self.scorer, "compiled", False))
+        }
+        if self.lookup_table is not None:
+            stats["lookup_table_bytes"] = self.lookup_table.nbytes
+            stats["lookup_table_build_seconds"] = round(self.lookup_table.build_seconds, 4)
+        return stats
+    
+    def get_batching_stats(self) -> Optional[dict]:
+        if self.batcher is None:
+            return None
+        return self.batcher.get_stats()
+    
+    async def close(self) -> None:
+        if self.batcher is not None:
+            await self.batcher.stop()
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False)
+            self._thread_pool = None
+        self._reset_process_pool()
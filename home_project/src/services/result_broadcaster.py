@@ -0,0 +1,107 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Optional, Set
+from clients.postgres_listener import postgres_listener, INVALIDATE_ALL
+from repositories.moderation_results import MODERATION_RESULTS_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+RESULT_STREAM_BUFFER_SIZE = int(os.getenv("RESULT_STREAM_BUFFER_SIZE", "100"))
+RESULT_STREAM_MAX_SUBSCRIBERS = int(os.getenv("RESULT_STREAM_MAX_SUBSCRIBERS", "1000"))
+
+RESET = object()
+DROPPED = object()
+
+
+class TooManySubscribersError(Exception):
+    pass
+
+
+class ResultSubscription:
+    def __init__(self, buffer_size: int, item_id: Optional[int] = None, status: Optional[str] = None):
+        self.item_id = item_id
+        self.status = status
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size + 1)
+        self.buffer_size = buffer_size
+        self.dropped = False
+    
+    def matches(self, row: dict) -> bool:
+        if self.item_id is not None and row.get("item_id") != self.item_id:
+            return False
+        if self.status is not None and row.get("status") != self.status:
+            return False
+        return True
+    
+    def offer(self, event) -> bool:
+        if self.queue.qsize() >= self.buffer_size:
+            return False
+        self.queue.put_nowait(event)
+        return True
+    
+    def drop(self) -> None:
+        self.dropped = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(DROPPED)
+    
+    async def get(self):
+        return await self.queue.get()
+
+
+class ResultBroadcaster:
+    def __init__(
+        self,
+        listener=postgres_listener,
+        buffer_size: int = RESULT_STREAM_BUFFER_SIZE,
+        max_subscribers: int = RESULT_STREAM_MAX_SUBSCRIBERS
+    ):
+        self.listener = listener
+        self.buffer_size = max(1, buffer_size)
+        self.max_subscribers = max_subscribers
+        self._subscriptions: Set[ResultSubscription] = set()
+        self.stats = {"events": 0, "delivered": 0, "dropped_subscribers": 0}
+    
+    async def subscribe(self, item_id: Optional[int] = None, status: Optional[str] = None) -> ResultSubscription:
+        if len(self._subscriptions) >= self.max_subscribers:
+            raise TooManySubscribersError(f"достигнут лимит подписчиков: {self.max_subscribers}")
+        await self.listener.subscribe(MODERATION_RESULTS_CHANNEL, self._on_notification)
+        subscription = ResultSubscription(self.buffer_size, item_id=item_id, status=status)
+        self._subscriptions.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: ResultSubscription) -> None:
+        self._subscriptions.discard(subscription)
+    
+    def _publish(self, subscription: ResultSubscription, event) -> None:
+        if subscription.offer(event):
+            self.stats["delivered"] += 1
+            return
+        self._subscriptions.discard(subscription)
+        subscription.drop()
+        self.stats["dropped_subscribers"] += 1
+        logger.warning(f"Подписчик потока результатов отключен: буфер из {self.buffer_size} событий переполнен")
+    
+    def _on_notification(self, payload: str) -> None:
+        if payload == INVALIDATE_ALL:
+            for subscription in list(self._subscriptions):
+                self._publish(subscription, RESET)
+            return
+        
+        try:
+            row = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Некорректное уведомление в канале {MODERATION_RESULTS_CHANNEL}: {payload[:200]}")
+            return
+        
+        self.stats["events"] += 1
+        for subscription in list(self._subscriptions):
+            if subscription.matches(row):
+                self._publish(subscription, row)
+    
+    def get_stats(self) -> dict:
+        return {**self.stats, "subscribers": len(self._subscriptions)}
+
+
+result_broadcaster = ResultBroadcaster()
@@ -0,0 +1,77 @@
+import numpy as np
+import logging
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+PARITY_PROBE_ROWS = 64
+PARITY_TOLERANCE = 1e-9
+
+
+class SklearnScorer:
+    compiled = False
+    
+    def __init__(self, model):
+        self.model = model
+        self.classes = np.asarray(model.classes_)
+    
+    def score(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        probabilities = self.model.predict_proba(features)
+        labels = self.classes[np.argmax(probabilities, axis=1)]
+        return labels, probabilities[:, 1]
+
+
+class LinearScorer:
+    compiled = True
+    
+    def __init__(self, coef: np.ndarray, intercept: float, classes: np.ndarray):
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(intercept)
+        self.classes = np.asarray(classes)
+        self.n_features = self.coef.shape[0]
+    
+    def score(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        decision = features @ self.coef + self.intercept
+        with np.errstate(over="ignore"):
+            probabilities = 1.0 / (1.0 + np.exp(-decision))
+        labels = self.classes[(decision > 0).astype(np.intp)]
+        return labels, probabilities
+
+
+def _compile_linear(model) -> LinearScorer:
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    intercept = np.ravel(np.asarray(model.intercept_, dtype=np.float64))
+    classes = np.asarray(model.classes_)
+    
+    if coef.ndim != 2 or coef.shape[0] != 1 or intercept.shape != (1,) or classes.shape != (2,):
+        raise ValueError("поддерживаются только бинарные линейные модели")
+    
+    return LinearScorer(coef[0], intercept[0], classes)
+
+
+def _check_parity(scorer: LinearScorer, model) -> None:
+    probe = np.random.default_rng(0).random((PARITY_PROBE_ROWS, scorer.n_features))
+    labels, probabilities = scorer.score(probe)
+    expected_probabilities = model.predict_proba(probe)[:, 1]
+    expected_labels = model.predict(probe)
+    
+    if not np.allclose(probabilities, expected_probabilities, rtol=0.0, atol=PARITY_TOLERANCE):
+        raise ValueError("вероятности не совпадают с predict_proba модели")
+    if not np.array_equal(labels, expected_labels):
+        raise ValueError("метки не совпадают с predict модели")
+
+
+def compile_scorer(model):
+    if not all(hasattr(model, attr) for attr in ("coef_", "intercept_", "classes_", "predict_proba")):
+        logger.info(f"Модель {type(model).__name__} не линейная, используется sklearn-скорер")
+        return SklearnScorer(model)
+    
+    try:
+        scorer = _compile_linear(model)
+        _check_parity(scorer, model)
+    except Exception as e:
+        logger.warning(f"Не удалось скомпилировать модель {type(model).__name__}: {str(e)}, используется sklearn-скорер")
+        return SklearnScorer(model)
+    
+    logger.info(f"Модель {type(model).__name__} скомпилирована в линейный скорер ({scorer.n_features} признаков)")
+    return scorer
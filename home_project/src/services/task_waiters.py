@@ -0,0 +1,98 @@
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Set
+from clients.postgres_listener import postgres_listener, INVALIDATE_ALL
+from repositories.moderation_results import MODERATION_RESULTS_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_POLL_INTERVAL_SECONDS = 1.0
+
+
+class TaskWaiters:
+    def __init__(self, listener=postgres_listener, fallback_poll_interval: float = FALLBACK_POLL_INTERVAL_SECONDS):
+        self.listener = listener
+        self.fallback_poll_interval = fallback_poll_interval
+        self._waiters: Dict[int, Set[asyncio.Future]] = {}
+        self.stats = {"waits": 0, "notified": 0, "timeouts": 0, "notifications": 0}
+    
+    @property
+    def waiting(self) -> int:
+        return sum(len(futures) for futures in self._waiters.values())
+    
+    def _on_notification(self, payload: str) -> None:
+        self.stats["notifications"] += 1
+        if payload == INVALIDATE_ALL:
+            for futures in self._waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_result(None)
+            return
+        
+        try:
+            row = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Некорректное уведомление в канале {MODERATION_RESULTS_CHANNEL}: {payload[:200]}")
+            return
+        
+        for future in self._waiters.get(row.get("id"), ()):
+            if not future.done():
+                future.set_result(row)
+    
+    async def _subscribe(self) -> bool:
+        try:
+            await self.listener.subscribe(MODERATION_RESULTS_CHANNEL, self._on_notification)
+            return True
+        except ConnectionError:
+            return False
+        except Exception as e:
+            logger.warning(f"Не удалось подписаться на {MODERATION_RESULTS_CHANNEL}, используется опрос БД: {str(e)}")
+            return False
+    
+    async def wait_for_result(
+        self,
+        task_id: int,
+        timeout: float,
+        fetch: Callable[[int], Awaitable[Optional[dict]]]
+    ) -> Optional[dict]:
+        self.stats["waits"] += 1
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        listening = await self._subscribe()
+        
+        while True:
+            future = loop.create_future()
+            self._waiters.setdefault(task_id, set()).add(future)
+            try:
+                task = await fetch(task_id)
+                if task is None or task["status"] != "pending":
+                    return task
+                
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self.stats["timeouts"] += 1
+                    return task
+                if not listening:
+                    remaining = min(remaining, self.fallback_poll_interval)
+                
+                try:
+                    row = await asyncio.wait_for(asyncio.shield(future), timeout=remaining)
+                except asyncio.TimeoutError:
+                    continue
+                
+                if row is not None and row.get("status") != "pending":
+                    self.stats["notified"] += 1
+                    return {**task, **row}
+            finally:
+                futures = self._waiters.get(task_id)
+                if futures is not None:
+                    futures.discard(future)
+                    if not futures:
+                        del self._waiters[task_id]
+    
+    def get_stats(self) -> dict:
+        return {**self.stats, "waiting": self.waiting}
+
+
+task_waiters = TaskWaiters()
@@ -0,0 +1,207 @@
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+import numpy as np
+from database import get_db_pool, close_db_pool
+from repositories.batch_scoring import BatchScoringRepository
+from services.predictions import PredictionService, _init_process_worker, _process_score_raw
+from model import get_model
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+BATCH_SCORING_CHUNK_SIZE = int(os.getenv("BATCH_SCORING_CHUNK_SIZE", "10000"))
+BATCH_SCORING_WORKERS = int(os.getenv("BATCH_SCORING_WORKERS", "0"))
+BATCH_SCORING_JOB_NAME = os.getenv("BATCH_SCORING_JOB_NAME", "full_rescore")
+
+batch_scoring_repository = BatchScoringRepository()
+
+
+def rows_to_columns(rows: List) -> Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    count = len(rows)
+    item_ids = np.fromiter((row["item_id"] for row in rows), dtype=np.int64, count=count)
+    columns = tuple(
+        np.fromiter((row[column] for row in rows), dtype=np.int64, count=count)
+        for column in ("is_verified_seller", "images_qty", "description_length", "category")
+    )
+    return item_ids, columns
+
+
+def build_results(
+    item_ids: np.ndarray,
+    predictions: np.ndarray,
+    probabilities: np.ndarray,
+    processed_at: datetime
+) -> List[Tuple]:
+    return [
+        (int(item_id), "completed", bool(prediction), float(probability), processed_at)
+        for item_id, prediction, probability in zip(item_ids.tolist(), predictions, probabilities.tolist())
+    ]
+
+
+class ScoringProgress:
+    def __init__(self, total: int):
+        self.total = total
+        self.scored = 0
+        self.chunks = 0
+        self.started = time.perf_counter()
+    
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+    
+    @property
+    def items_per_second(self) -> float:
+        return self.scored / self.elapsed if self.elapsed else 0.0
+    
+    def report(self, last_item_id: int) -> None:
+        percent = self.scored / self.total * 100 if self.total else 100.0
+        remaining = (self.total - self.scored) / self.items_per_second if self.items_per_second else 0.0
+        logger.info(
+            f"Скоринг каталога: {self.scored}/{self.total} ({percent:.1f}%), "
+            f"{self.items_per_second:.0f} объявлений/с, последний item_id={last_item_id}, "
+            f"осталось ~{remaining:.0f} с"
+        )
+    
+    def snapshot(self) -> dict:
+        return {
+            "scored": self.scored,
+            "total": self.total,
+            "chunks": self.chunks,
+            "seconds": round(self.elapsed, 3),
+            "items_per_second": round(self.items_per_second, 1)
+        }
+
+
+class ChunkScorer:
+    def __init__(self, service: PredictionService, workers: int):
+        self.service = service
+        self.workers = workers
+        self.pool: Optional[ProcessPoolExecutor] = None
+        if workers > 0:
+            self.pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process_worker,
+                initargs=(service.model, service.scoring_mode)
+            )
+    
+    @property
+    def max_in_flight(self) -> int:
+        return self.workers * 2 if self.workers > 0 else 1
+    
+    async def score(self, columns: Tuple[np.ndarray, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        if self.pool is None:
+            return self.service.score_raw(*columns)
+        return await asyncio.get_running_loop().run_in_executor(self.pool, _process_score_raw, columns)
+    
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+
+async def run_batch_scoring(
+    service: PredictionService,
+    job_name: str = BATCH_SCORING_JOB_NAME,
+    chunk_size: int = BATCH_SCORING_CHUNK_SIZE,
+    workers: int = BATCH_SCORING_WORKERS,
+    restart: bool = False
+) -> dict:
+    if restart:
+        await batch_scoring_repository.reset_checkpoint(job_name)
+    checkpoint = await batch_scoring_repository.get_checkpoint(job_name)
+    after_item_id = checkpoint["last_item_id"] if checkpoint else 0
+    if checkpoint:
+        logger.info(
+            f"Продолжение задания {job_name} после item_id={after_item_id} "
+            f"(уже оценено {checkpoint['scored_items']} объявлений)"
+        )
+    
+    progress = ScoringProgress(await batch_scoring_repository.count_items(after_item_id))
+    scorer = ChunkScorer(service, workers)
+    pending = deque()
+    
+    async def flush_oldest() -> None:
+        item_ids, scoring = pending.popleft()
+        predictions, probabilities = await scoring
+        last_item_id = int(item_ids[-1])
+        await batch_scoring_repository.write_results(
+            job_name,
+            build_results(item_ids, predictions, probabilities, datetime.now()),
+            last_item_id
+        )
+        progress.scored += len(item_ids)
+        progress.chunks += 1
+        progress.report(last_item_id)
+    
+    chunks = batch_scoring_repository.iter_item_chunks(after_item_id, chunk_size)
+    try:
+        async for rows in chunks:
+            item_ids, columns = rows_to_columns(rows)
+            pending.append((item_ids, asyncio.ensure_future(scorer.score(columns))))
+            if len(pending) >= scorer.max_in_flight:
+                await flush_oldest()
+        while pending:
+            await flush_oldest()
+    finally:
+        await chunks.aclose()
+        for _, scoring in pending:
+            scoring.cancel()
+        scorer.close()
+    
+    summary = progress.snapshot()
+    logger.info(
+        f"Задание {job_name} завершено: оценено {summary['scored']} объявлений за {summary['seconds']:.1f} с "
+        f"({summary['items_per_second']:.0f} объявлений/с)"
+    )
+    return summary
+
+
+async def main_async(args) -> None:
+    await get_db_pool()
+    try:
+        use_mlflow = os.getenv("USE_MLFLOW", "false").lower() == "true"
+        service = PredictionService(
+            batching=False,
+            scoring_mode=args.scoring_mode,
+            execution_mode="inline",
+            cache=False,
+            name="batch_scoring"
+        )
+        service.set_model(get_model(use_mlflow=use_mlflow))
+        await run_batch_scoring(service, args.job, args.chunk_size, args.workers, args.restart)
+    finally:
+        await close_db_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетный скоринг всего каталога объявлений с записью в moderation_results")
+    parser.add_argument("--job", default=BATCH_SCORING_JOB_NAME, help="Имя задания (ключ контрольной точки)")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_SCORING_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=BATCH_SCORING_WORKERS, help="Число процессов скоринга, 0 - в текущем процессе")
+    parser.add_argument("--scoring-mode", choices=["direct", "lookup"], default=None)
+    parser.add_argument("--restart", action="store_true", help="Начать заново, сбросив контрольную точку")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Iterable, Optional, Set
+from aiokafka.abc import ConsumerRebalanceListener
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionOffsetTracker:
+    def __init__(self):
+        self.in_flight: Set[int] = set()
+        self.last_started: Optional[int] = None
+        self.committed: Optional[int] = None
+    
+    def start(self, offset: int) -> None:
+        self.in_flight.add(offset)
+        if self.last_started is None or offset > self.last_started:
+            self.last_started = offset
+    
+    def complete(self, offset: int) -> None:
+        self.in_flight.discard(offset)
+    
+    def committable(self) -> Optional[int]:
+        if self.last_started is None:
+            return None
+        position = min(self.in_flight) if self.in_flight else self.last_started + 1
+        if self.committed is not None and position <= self.committed:
+            return None
+        return position
+
+
+class OffsetTracker:
+    def __init__(self):
+        self.partitions: Dict[object, PartitionOffsetTracker] = {}
+    
+    def start(self, partition, offset: int) -> None:
+        self.partitions.setdefault(partition, PartitionOffsetTracker()).start(offset)
+    
+    def complete(self, partition, offset: int) -> None:
+        self.partitions[partition].complete(offset)
+    
+    def committable(self) -> Dict[object, int]:
+        offsets = {}
+        for partition, tracker in self.partitions.items():
+            position = tracker.committable()
+            if position is not None:
+                offsets[partition] = position
+        return offsets
+    
+    def mark_committed(self, offsets: Dict[object, int]) -> None:
+        for partition, position in offsets.items():
+            if partition in self.partitions:
+                self.partitions[partition].committed = position
+    
+    def forget(self, partitions: Iterable) -> None:
+        for partition in partitions:
+            self.partitions.pop(partition, None)
+
+
+class ProcessorRebalanceListener(ConsumerRebalanceListener):
+    def __init__(self, processor: "ConcurrentPartitionProcessor"):
+        self.processor = processor
+    
+    async def on_partitions_revoked(self, revoked) -> None:
+        await self.processor.revoke(revoked)
+    
+    async def on_partitions_assigned(self, assigned) -> None:
+        logger.info(f"Назначены партиции: {sorted(str(partition) for partition in assigned)}")
+
+
+class ConcurrentPartitionProcessor:
+    def __init__(
+        self,
+        consumer,
+        handler: Callable[[dict], Awaitable[None]],
+        max_in_flight_per_partition: int = 8,
+        max_records: int = 500,
+        poll_timeout_ms: int = 500
+    ):
+        self.consumer = consumer
+        self.handler = handler
+        self.max_in_flight_per_partition = max(1, max_in_flight_per_partition)
+        self.max_records = max_records
+        self.poll_timeout_ms = poll_timeout_ms
+        self.offsets = OffsetTracker()
+        self.rebalance_listener = ProcessorRebalanceListener(self)
+        self._backlog: Dict[object, Deque] = {}
+        self._in_flight: Dict[object, int] = {}
+        self._partition_tasks: Dict[object, Set[asyncio.Task]] = {}
+        self._paused: Set[object] = set()
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def _process(self, partition, message) -> None:
+        try:
+            await self.handler(message.value)
+        except asyncio.CancelledError:
+            self._release(partition)
+            raise
+        except Exception as e:
+            logger.error(
+                f"Необработанная ошибка для сообщения {partition}@{message.offset}: {str(e)}. "
+                f"Смещения партиции не будут закоммичены дальше него, сообщение будет прочитано повторно",
+                exc_info=True
+            )
+            self._release(partition)
+            return
+        self.offsets.complete(partition, message.offset)
+        self._release(partition)
+    
+    def _release(self, partition) -> None:
+        self._in_flight[partition] -= 1
+        self._fill(partition)
+    
+    def _start(self, partition, message) -> None:
+        self._in_flight[partition] = self._in_flight.get(partition, 0) + 1
+        self.offsets.start(partition, message.offset)
+        task = asyncio.create_task(self._process(partition, message))
+        partition_tasks = self._partition_tasks.setdefault(partition, set())
+        self._tasks.add(task)
+        partition_tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(partition_tasks.discard)
+    
+    def _fill(self, partition) -> None:
+        backlog = self._backlog.get(partition)
+        while backlog and self._in_flight.get(partition, 0) < self.max_in_flight_per_partition:
+            self._start(partition, backlog.popleft())
+        if backlog and partition not in self._paused:
+            self.consumer.pause(partition)
+            self._paused.add(partition)
+        elif not backlog and partition in self._paused:
+            self.consumer.resume(partition)
+            self._paused.discard(partition)
+    
+    def _dispatch(self, partition, messages) -> None:
+        self._backlog.setdefault(partition, deque()).extend(messages)
+        self._fill(partition)
+    
+    async def commit(self) -> None:
+        offsets = self.offsets.committable()
+        if not offsets:
+            return
+        try:
+            await self.consumer.commit(offsets)
+        except Exception as e:
+            logger.warning(f"Не удалось закоммитить смещения {offsets}: {str(e)}")
+            return
+        self.offsets.mark_committed(offsets)
+    
+    async def revoke(self, partitions) -> None:
+        partitions = list(partitions)
+        for partition in partitions:
+            self._backlog.pop(partition, None)
+            self._paused.discard(partition)
+        tasks = [task for partition in partitions for task in self._partition_tasks.get(partition, ())]
+        if tasks:
+            logger.info(f"Отзыв партиций: ожидание завершения {len(tasks)} сообщений в обработке")
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await self.commit()
+        self.offsets.forget(partitions)
+        for partition in partitions:
+            self._in_flight.pop(partition, None)
+            self._partition_tasks.pop(partition, None)
+    
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        stop = stop or asyncio.Event()
+        try:
+            while not stop.is_set():
+                batches = await self.consumer.getmany(timeout_ms=self.poll_timeout_ms, max_records=self.max_records)
+                for partition, messages in batches.items():
+                    self._dispatch(partition, messages)
+                await self.commit()
+        finally:
+            await self.drain()
+    
+    async def drain(self) -> None:
+        self._backlog.clear()
+        if self._tasks:
+            logger.info(f"Ожидание завершения {len(self._tasks)} сообщений в обработке")
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        await self.commit()
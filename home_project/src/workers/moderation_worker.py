@@ -4,18 +4,24 @@ import logging
 import os
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 project_root = Path(__file__).parent.parent.parent
 src_path = project_root / "src"
 sys.path.insert(0, str(src_path))
 
 from aiokafka import AIOKafkaConsumer
-from database import get_db_pool, close_db_pool
+from database import get_db_pool, close_db_pool, unit_of_work
 from repositories.items import ItemRepository
 from repositories.moderation_results import ModerationResultsRepository
+from repositories.partitions import ModerationPartitionsRepository
 from services.predictions import PredictionService
+from services.model_registry import model_registry, get_model_source, MODEL_WATCH_ENABLED
 from models.predictions import PredictionRequest
 from clients.kafka import send_to_dlq, DLQ_TOPIC
+from clients.postgres_listener import close_listener
+from workers.concurrency import ConcurrentPartitionProcessor
+from workers.retries import RetryScheduler, compute_retry_delay
 from model import get_model
 
 logging.basicConfig(
@@ -27,11 +33,29 @@ logger = logging.getLogger(__name__)
 KAFKA_BOOTSTRAP_SERVERS = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
 MODERATION_TOPIC = "moderation"
 MAX_RETRIES = 3
-RETRY_DELAY_SECONDS = int(os.getenv("RETRY_DELAY_SECONDS", "5"))
+RETRY_DELAY_SECONDS = float(os.getenv("RETRY_DELAY_SECONDS", "5"))
+RETRY_MAX_DELAY_SECONDS = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "60"))
+WORKER_BATCH_MODE = os.getenv("WORKER_BATCH_MODE", "false").lower() == "true"
+WORKER_BATCH_SIZE = int(os.getenv("WORKER_BATCH_SIZE", "100"))
+WORKER_POLL_TIMEOUT_MS = int(os.getenv("WORKER_POLL_TIMEOUT_MS", "500"))
+WORKER_CONCURRENT_MODE = os.getenv("WORKER_CONCURRENT_MODE", "false").lower() == "true"
+WORKER_MAX_IN_FLIGHT_PER_PARTITION = int(os.getenv("WORKER_MAX_IN_FLIGHT_PER_PARTITION", "8"))
 
 item_repository = ItemRepository()
 moderation_repository = ModerationResultsRepository()
-prediction_service = PredictionService()
+prediction_service = PredictionService(name="worker", registry=model_registry)
+
+
+def build_prediction_request(item_data: dict) -> PredictionRequest:
+    return PredictionRequest(
+        seller_id=item_data["seller_id"],
+        is_verified_seller=item_data["is_verified_seller"],
+        item_id=item_data["item_id"],
+        name=item_data["name"],
+        description=item_data["description"],
+        category=item_data["category"],
+        images_qty=item_data["images_qty"]
+    )
 
 
 def is_retryable_error(error: Exception) -> bool:
@@ -42,118 +66,278 @@ def is_retryable_error(error: Exception) -> bool:
     return False
 
 
-async def process_message_with_retry(message_value: dict, retry_count: int = 0) -> None:
+def schedule_retry(message_value: dict, retry_count: int, error: Exception) -> asyncio.Future:
+    delay = compute_retry_delay(retry_count, RETRY_DELAY_SECONDS, RETRY_MAX_DELAY_SECONDS)
+    logger.warning(
+        f"Временная ошибка при обработке item_id={message_value.get('item_id')}: {str(error)}. "
+        f"Повтор через {delay:.1f} секунд..."
+    )
+    return retry_scheduler.schedule({**message_value, "retry_count": retry_count + 1}, delay)
+
+
+async def fail_task(task_id: Optional[int], item_id: Optional[int], error_msg: str) -> None:
+    async with unit_of_work():
+        if task_id is None and item_id:
+            task = await moderation_repository.get_latest_task_by_item_id(item_id)
+            task_id = task["id"] if task else None
+        if task_id is not None:
+            await moderation_repository.update_task_failed(task_id, error_msg)
+
+
+async def handle_message(message_value: dict) -> Optional[asyncio.Future]:
+    retry_count = message_value.get("retry_count", 0)
     item_id = message_value.get("item_id")
-    if not item_id:
+    task_id = message_value.get("task_id")
+    if not item_id and not task_id:
         error_msg = "item_id отсутствует в сообщении"
         logger.error(error_msg)
         await send_to_dlq(message_value, error_msg, retry_count)
-        return
+        return None
     
     try:
-        logger.info(f"Обработка сообщения для item_id={item_id} (попытка {retry_count + 1}/{MAX_RETRIES})")
-        
-        item_data = await item_repository.get_item_by_item_id(item_id)
+        logger.info(
+            f"Обработка сообщения для item_id={item_id}, task_id={task_id} "
+            f"(попытка {retry_count + 1}/{MAX_RETRIES})"
+        )
         
-        tasks = await moderation_repository.get_tasks_by_item_id(item_id)
-        if not tasks:
+        task, item_data = await moderation_repository.get_task_for_processing(task_id=task_id, item_id=item_id)
+        if not task:
             error_msg = f"Задача модерации для item_id={item_id} не найдена"
             logger.error(error_msg)
             await send_to_dlq(message_value, error_msg, retry_count)
-            return
+            return None
+        
+        task_id = task["id"]
+        item_id = task["item_id"]
         
-        task = tasks[0]
+        if message_value.get("task_id") and task["status"] != "pending":
+            logger.info(f"Задача {task_id} уже обработана (статус {task['status']}), сообщение пропущено")
+            return None
         
         if not item_data:
             error_msg = f"Объявление с item_id={item_id} не найдено"
             logger.error(error_msg)
-            await moderation_repository.update_task_failed(task["id"], error_msg)
+            await moderation_repository.update_task_failed(task_id, error_msg)
             await send_to_dlq(message_value, error_msg, retry_count)
-            return
+            return None
         
-        request = PredictionRequest(
-            seller_id=item_data["seller_id"],
-            is_verified_seller=item_data["is_verified_seller"],
-            item_id=item_data["item_id"],
-            name=item_data["name"],
-            description=item_data["description"],
-            category=item_data["category"],
-            images_qty=item_data["images_qty"]
-        )
+        request = build_prediction_request(item_data)
         
-        result = prediction_service.predict(request)
+        result = await prediction_service.predict_async(request)
         
         await moderation_repository.update_task_completed(
-            task["id"],
+            task_id,
             result.is_violation,
             result.probability
         )
         
         logger.info(f"Модерация завершена для item_id={item_id}, is_violation={result.is_violation}")
-        
+    
     except RuntimeError as e:
         if is_retryable_error(e) and retry_count < MAX_RETRIES - 1:
-            logger.warning(f"Временная ошибка при обработке item_id={item_id}: {str(e)}. Повтор через {RETRY_DELAY_SECONDS} секунд...")
-            await asyncio.sleep(RETRY_DELAY_SECONDS)
-            await process_message_with_retry(message_value, retry_count + 1)
-        else:
-            error_msg = f"Модель не загружена: {str(e)}"
-            logger.error(error_msg)
-            
-            tasks = await moderation_repository.get_tasks_by_item_id(item_id)
-            if tasks:
-                await moderation_repository.update_task_failed(tasks[0]["id"], error_msg)
-            
-            await send_to_dlq(message_value, error_msg, retry_count)
+            return schedule_retry(message_value, retry_count, e)
+        
+        error_msg = f"Модель не загружена: {str(e)}"
+        logger.error(error_msg)
         
+        await fail_task(task_id, item_id, error_msg)
+        await send_to_dlq(message_value, error_msg, retry_count)
+    
     except Exception as e:
         if is_retryable_error(e) and retry_count < MAX_RETRIES - 1:
-            logger.warning(f"Временная ошибка при обработке item_id={item_id}: {str(e)}. Повтор через {RETRY_DELAY_SECONDS} секунд...")
-            await asyncio.sleep(RETRY_DELAY_SECONDS)
-            await process_message_with_retry(message_value, retry_count + 1)
+            return schedule_retry(message_value, retry_count, e)
+        
+        error_msg = f"Ошибка при обработке сообщения: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        
+        await fail_task(task_id, item_id, error_msg)
+        await send_to_dlq(message_value, error_msg, retry_count)
+    
+    return None
+
+
+retry_scheduler = RetryScheduler(handle_message)
+
+
+async def process_message_to_completion(message_value: dict) -> None:
+    retry = await handle_message(message_value)
+    while retry is not None:
+        retry = await retry
+
+
+async def handle_batch(message_values: List[dict]) -> None:
+    pending = []
+    for message_value in message_values:
+        if not message_value.get("item_id") and not message_value.get("task_id"):
+            error_msg = "item_id отсутствует в сообщении"
+            logger.error(error_msg)
+            await send_to_dlq(message_value, error_msg, 0)
+        else:
+            pending.append(message_value)
+    
+    if not pending:
+        return
+    
+    task_ids = list({message_value["task_id"] for message_value in pending if message_value.get("task_id")})
+    item_ids = list({message_value["item_id"] for message_value in pending if not message_value.get("task_id")})
+    addressed_tasks = {}
+    items = {}
+    tasks = {}
+    try:
+        async with unit_of_work():
+            if task_ids:
+                addressed_tasks = await moderation_repository.get_tasks_for_processing(task_ids)
+            if item_ids:
+                items = await item_repository.get_items_by_item_ids(item_ids)
+                tasks = await moderation_repository.get_latest_tasks_by_item_ids(item_ids)
+    except Exception as e:
+        logger.error(f"Ошибка пакетного чтения из БД: {str(e)}. Сообщения будут обработаны по одному", exc_info=True)
+        for message_value in pending:
+            await handle_message(message_value)
+        return
+    
+    results = {}
+    dlq_messages = []
+    scored_messages = []
+    requests = []
+    for message_value in pending:
+        item_id = message_value.get("item_id")
+        if message_value.get("task_id"):
+            task, item_data = addressed_tasks.get(message_value["task_id"], (None, None))
         else:
+            task, item_data = tasks.get(item_id), items.get(item_id)
+        if not task:
+            error_msg = f"Задача модерации для item_id={item_id} не найдена"
+            logger.error(error_msg)
+            dlq_messages.append((message_value, error_msg))
+            continue
+        
+        item_id = task.get("item_id") or item_id
+        if message_value.get("task_id") and task["status"] != "pending":
+            logger.info(f"Задача {task['id']} уже обработана (статус {task['status']}), сообщение пропущено")
+            continue
+        
+        if not item_data:
+            error_msg = f"Объявление с item_id={item_id} не найдено"
+            logger.error(error_msg)
+            results[task["id"]] = {"task_id": task["id"], "status": "failed", "error_message": error_msg}
+            dlq_messages.append((message_value, error_msg))
+            continue
+        
+        try:
+            requests.append(build_prediction_request(item_data))
+        except Exception as e:
             error_msg = f"Ошибка при обработке сообщения: {str(e)}"
-            logger.error(error_msg, exc_info=True)
-            
-            tasks = await moderation_repository.get_tasks_by_item_id(item_id)
-            if tasks:
-                await moderation_repository.update_task_failed(tasks[0]["id"], error_msg)
-            
-            await send_to_dlq(message_value, error_msg, retry_count)
+            logger.error(error_msg)
+            results[task["id"]] = {"task_id": task["id"], "status": "failed", "error_message": error_msg}
+            dlq_messages.append((message_value, error_msg))
+            continue
+        scored_messages.append((message_value, task))
+    
+    fallback_messages = []
+    if requests:
+        try:
+            predictions = await prediction_service.predict_batch_async(requests)
+        except Exception as e:
+            logger.warning(f"Ошибка пакетного предсказания: {str(e)}. Сообщения будут обработаны по одному")
+            fallback_messages = [message_value for message_value, _ in scored_messages]
+        else:
+            for (_, task), prediction in zip(scored_messages, predictions):
+                results[task["id"]] = {
+                    "task_id": task["id"],
+                    "status": "completed",
+                    "is_violation": prediction.is_violation,
+                    "probability": prediction.probability
+                }
+    
+    try:
+        await moderation_repository.update_tasks_bulk(list(results.values()))
+    except Exception as e:
+        logger.error(f"Ошибка пакетной записи результатов: {str(e)}. Сообщения будут обработаны по одному", exc_info=True)
+        for message_value in pending:
+            await handle_message(message_value)
+        return
+    
+    for message_value, error_msg in dlq_messages:
+        await send_to_dlq(message_value, error_msg, 0)
+    
+    for message_value in fallback_messages:
+        await handle_message(message_value)
+    
+    logger.info(
+        f"Обработан батч из {len(message_values)} сообщений: "
+        f"записано результатов={len(results)}, в DLQ={len(dlq_messages)}, по одному={len(fallback_messages)}"
+    )
 
 
-async def process_message(message_value: dict) -> None:
-    await process_message_with_retry(message_value, retry_count=0)
+async def consume_batches(consumer: AIOKafkaConsumer) -> None:
+    while True:
+        batches = await consumer.getmany(timeout_ms=WORKER_POLL_TIMEOUT_MS, max_records=WORKER_BATCH_SIZE)
+        message_values = [message.value for records in batches.values() for message in records]
+        if not message_values:
+            continue
+        logger.info(f"Получено {len(message_values)} сообщений из топика {MODERATION_TOPIC}")
+        await handle_batch(message_values)
 
 
 async def consume_messages():
     await get_db_pool()
+    partitions = await ModerationPartitionsRepository().ensure_partitions()
+    logger.info(f"Партиции moderation_results созданы до {partitions[-1]}")
     
     use_mlflow = os.getenv("USE_MLFLOW", "false").lower() == "true"
+    model_source = get_model_source(use_mlflow)
     model = get_model(use_mlflow=use_mlflow)
-    prediction_service.set_model(model)
-    logger.info("Модель загружена в воркере")
+    source_version = model_source.current_version()
+    model_registry.set_model(model, source_version=source_version)
+    logger.info(f"Модель {model_registry.label} загружена в воркере")
+    if MODEL_WATCH_ENABLED:
+        model_registry.start_watching(model_source)
     
     consumer = AIOKafkaConsumer(
-        MODERATION_TOPIC,
         bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
         value_deserializer=lambda m: json.loads(m.decode('utf-8')),
         group_id="moderation_workers",
         auto_offset_reset="earliest",
-        enable_auto_commit=True
+        enable_auto_commit=not WORKER_CONCURRENT_MODE
     )
+    processor = None
+    if WORKER_CONCURRENT_MODE:
+        processor = ConcurrentPartitionProcessor(
+            consumer,
+            process_message_to_completion,
+            max_in_flight_per_partition=WORKER_MAX_IN_FLIGHT_PER_PARTITION,
+            max_records=WORKER_BATCH_SIZE,
+            poll_timeout_ms=WORKER_POLL_TIMEOUT_MS
+        )
+        consumer.subscribe([MODERATION_TOPIC], listener=processor.rebalance_listener)
+    else:
+        consumer.subscribe([MODERATION_TOPIC])
     
     await consumer.start()
     logger.info(f"Воркер запущен, подписка на топик {MODERATION_TOPIC}")
     
     try:
-        async for message in consumer:
-            logger.info(f"Получено сообщение из топика {MODERATION_TOPIC}: {message.value}")
-            await process_message(message.value)
+        if processor is not None:
+            logger.info(
+                f"Конкурентный режим: до {WORKER_MAX_IN_FLIGHT_PER_PARTITION} сообщений в обработке на партицию, "
+                f"коммит смещений вручную"
+            )
+            await processor.run()
+        elif WORKER_BATCH_MODE:
+            logger.info(f"Пакетный режим: до {WORKER_BATCH_SIZE} сообщений, таймаут {WORKER_POLL_TIMEOUT_MS} мс")
+            await consume_batches(consumer)
+        else:
+            async for message in consumer:
+                logger.info(f"Получено сообщение из топика {MODERATION_TOPIC}: {message.value}")
+                await handle_message(message.value)
     except Exception as e:
         logger.error(f"Ошибка в воркере: {str(e)}", exc_info=True)
     finally:
+        await model_registry.stop_watching()
+        await retry_scheduler.stop()
         await consumer.stop()
+        await close_listener()
         await close_db_pool()
 
 
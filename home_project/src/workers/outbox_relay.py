@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from database import get_db_pool, close_db_pool
+from repositories.outbox import OutboxRepository
+from clients.kafka import get_producer, close_producer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+OUTBOX_POLL_INTERVAL_MS = int(os.getenv("OUTBOX_POLL_INTERVAL_MS", "200"))
+OUTBOX_ERROR_BACKOFF_SECONDS = float(os.getenv("OUTBOX_ERROR_BACKOFF_SECONDS", "5"))
+
+outbox_repository = OutboxRepository()
+
+
+async def publish_records(records: List[dict]) -> None:
+    producer = await get_producer()
+    deliveries = [await producer.send(record["topic"], record["payload"]) for record in records]
+    await asyncio.gather(*deliveries)
+
+
+async def relay_once() -> int:
+    return await outbox_repository.publish_pending(OUTBOX_BATCH_SIZE, publish_records)
+
+
+async def run_relay(stop: Optional[asyncio.Event] = None) -> None:
+    stop = stop or asyncio.Event()
+    await get_db_pool()
+    logger.info(f"Релей outbox запущен: до {OUTBOX_BATCH_SIZE} сообщений за проход")
+    
+    try:
+        while not stop.is_set():
+            try:
+                published = await relay_once()
+            except Exception as e:
+                logger.error(
+                    f"Ошибка публикации outbox: {str(e)}. Повтор через {OUTBOX_ERROR_BACKOFF_SECONDS} секунд",
+                    exc_info=True
+                )
+                await asyncio.sleep(OUTBOX_ERROR_BACKOFF_SECONDS)
+                continue
+            
+            if published:
+                logger.info(f"Опубликовано сообщений из outbox: {published}")
+            if published < OUTBOX_BATCH_SIZE:
+                await asyncio.sleep(OUTBOX_POLL_INTERVAL_MS / 1000)
+    finally:
+        await close_producer()
+        await close_db_pool()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run_relay())
+    except KeyboardInterrupt:
+        logger.info("Релей outbox остановлен")
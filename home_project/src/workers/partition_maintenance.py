@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import os
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from database import get_db_pool, close_db_pool
+from repositories.partitions import ModerationPartitionsRepository, MODERATION_RESULTS_PARTITIONS_AHEAD
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MODERATION_RESULTS_RETENTION_MONTHS = int(os.getenv("MODERATION_RESULTS_RETENTION_MONTHS", "6"))
+MODERATION_RESULTS_ARCHIVE_DIR = os.getenv("MODERATION_RESULTS_ARCHIVE_DIR", "archive/moderation_results")
+PARTITION_MAINTENANCE_INTERVAL_SECONDS = float(os.getenv("PARTITION_MAINTENANCE_INTERVAL_SECONDS", "3600"))
+
+partitions_repository = ModerationPartitionsRepository()
+
+
+def retention_cutoff(today: date, retention_months: int) -> date:
+    month_index = today.year * 12 + today.month - 1 - retention_months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+async def archive_partition(partition: dict) -> Path:
+    name = partition["name"]
+    if partition["attached"] or partition["detach_pending"]:
+        await partitions_repository.detach_partition(name, finalize=partition["detach_pending"])
+        logger.info(f"Партиция {name} отсоединена от moderation_results")
+    
+    archive_dir = Path(MODERATION_RESULTS_ARCHIVE_DIR)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    archive_path = archive_dir / f"{name}.csv.gz"
+    temp_path = archive_dir / f"{name}.csv.gz.tmp"
+    rows = await partitions_repository.archive_partition(name, temp_path)
+    temp_path.replace(archive_path)
+    
+    await partitions_repository.drop_partition(name)
+    logger.info(f"Партиция {name} заархивирована в {archive_path} ({rows} строк) и удалена")
+    return archive_path
+
+
+async def maintain_once(today: Optional[date] = None) -> dict:
+    today = today or date.today()
+    ensured = await partitions_repository.ensure_partitions(MODERATION_RESULTS_PARTITIONS_AHEAD)
+    
+    archived = []
+    if MODERATION_RESULTS_RETENTION_MONTHS > 0:
+        cutoff = retention_cutoff(today, MODERATION_RESULTS_RETENTION_MONTHS)
+        for partition in await partitions_repository.list_partitions():
+            if partition["month"] < cutoff:
+                await archive_partition(partition)
+                archived.append(partition["name"])
+    
+    return {"partitions": ensured, "archived": archived}
+
+
+async def run_maintenance(stop: Optional[asyncio.Event] = None) -> None:
+    stop = stop or asyncio.Event()
+    await get_db_pool()
+    logger.info(
+        f"Обслуживание партиций запущено: создание на {MODERATION_RESULTS_PARTITIONS_AHEAD} мес. вперед, "
+        f"хранение {MODERATION_RESULTS_RETENTION_MONTHS} мес., архив в {MODERATION_RESULTS_ARCHIVE_DIR}"
+    )
+    
+    try:
+        while not stop.is_set():
+            try:
+                result = await maintain_once()
+                if result["archived"]:
+                    logger.info(f"Заархивировано партиций: {len(result['archived'])}")
+            except Exception as e:
+                logger.error(f"Ошибка обслуживания партиций: {str(e)}", exc_info=True)
+            
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=PARTITION_MAINTENANCE_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await close_db_pool()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run_maintenance())
+    except KeyboardInterrupt:
+        logger.info("Обслуживание партиций остановлено")
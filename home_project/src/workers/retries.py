@@ -0,0 +1,97 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def compute_retry_delay(retry_count: int, base_delay: float, max_delay: float, rng: Optional[random.Random] = None) -> float:
+    rng = rng or random
+    ceiling = min(max_delay, base_delay * (2 ** retry_count))
+    return rng.uniform(ceiling / 2, ceiling)
+
+
+class RetryScheduler:
+    def __init__(self, handler: Callable[[dict], Awaitable[Any]]):
+        self.handler = handler
+        self._heap: List[Tuple[float, int, dict, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running: Set[asyncio.Task] = set()
+    
+    @property
+    def pending(self) -> int:
+        return len(self._heap) + len(self._running)
+    
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+    
+    def schedule(self, message: dict, delay: float) -> asyncio.Future:
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._heap, (loop.time() + delay, next(self._sequence), message, future))
+        self._wakeup.set()
+        return future
+    
+    async def _execute(self, message: dict, future: asyncio.Future) -> None:
+        try:
+            result = await self.handler(message)
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+            raise
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            timeout = None
+            if self._heap:
+                timeout = self._heap[0][0] - loop.time()
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            _, _, message, future = heapq.heappop(self._heap)
+            task = loop.create_task(self._execute(message, future))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._running):
+            task.cancel()
+        if self._running:
+            await asyncio.gather(*list(self._running), return_exceptions=True)
+        if self._heap:
+            logger.warning(f"Остановка планировщика повторов, не выполнено повторов: {len(self._heap)}")
+        for _, _, _, future in self._heap:
+            if not future.done():
+                future.cancel()
+        self._heap.clear()
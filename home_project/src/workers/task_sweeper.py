@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from database import get_db_pool, close_db_pool
+from repositories.moderation_results import ModerationResultsRepository
+from clients.kafka import send_moderation_request, close_producer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SWEEPER_STUCK_AFTER_SECONDS = float(os.getenv("SWEEPER_STUCK_AFTER_SECONDS", "300"))
+SWEEPER_BATCH_SIZE = int(os.getenv("SWEEPER_BATCH_SIZE", "100"))
+SWEEPER_MAX_ATTEMPTS = int(os.getenv("SWEEPER_MAX_ATTEMPTS", "3"))
+SWEEPER_INTERVAL_SECONDS = float(os.getenv("SWEEPER_INTERVAL_SECONDS", "30"))
+
+moderation_repository = ModerationResultsRepository()
+
+
+async def sweep_once() -> dict:
+    tasks = await moderation_repository.claim_stuck_tasks(SWEEPER_STUCK_AFTER_SECONDS, SWEEPER_BATCH_SIZE)
+    
+    expired = [task for task in tasks if task["sweep_attempts"] > SWEEPER_MAX_ATTEMPTS]
+    if expired:
+        await moderation_repository.update_tasks_bulk([
+            {
+                "task_id": task["id"],
+                "status": "failed",
+                "error_message": f"Задача не обработана после {SWEEPER_MAX_ATTEMPTS} повторных отправок"
+            }
+            for task in expired
+        ])
+        logger.warning(f"Помечены как failed зависшие задачи: {[task['id'] for task in expired]}")
+    
+    requeued = 0
+    for task in tasks:
+        if task["sweep_attempts"] > SWEEPER_MAX_ATTEMPTS:
+            continue
+        try:
+            await send_moderation_request(task["item_id"], task_id=task["id"])
+            requeued += 1
+        except Exception as e:
+            logger.error(
+                f"Не удалось повторно отправить задачу task_id={task['id']}: {str(e)}. "
+                f"Повтор через {SWEEPER_STUCK_AFTER_SECONDS} секунд"
+            )
+    
+    if requeued:
+        logger.info(f"Повторно отправлено зависших задач: {requeued}")
+    return {"claimed": len(tasks), "requeued": requeued, "failed": len(expired)}
+
+
+async def run_sweeper(stop: Optional[asyncio.Event] = None) -> None:
+    stop = stop or asyncio.Event()
+    await get_db_pool()
+    logger.info(
+        f"Sweeper запущен: задачи pending старше {SWEEPER_STUCK_AFTER_SECONDS} секунд, "
+        f"до {SWEEPER_BATCH_SIZE} задач за проход"
+    )
+    
+    try:
+        while not stop.is_set():
+            try:
+                result = await sweep_once()
+            except Exception as e:
+                logger.error(f"Ошибка при поиске зависших задач: {str(e)}", exc_info=True)
+                result = {"claimed": 0}
+            
+            if result["claimed"] < SWEEPER_BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=SWEEPER_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+    finally:
+        await close_producer()
+        await close_db_pool()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run_sweeper())
+    except KeyboardInterrupt:
+        logger.info("Sweeper остановлен")
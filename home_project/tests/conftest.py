@@ -2,6 +2,7 @@ import sys
 from pathlib import Path
 import pytest
 import asyncio
+import numpy as np
 from fastapi.testclient import TestClient
 import os
 
@@ -39,6 +40,7 @@ async def db_pool():
     import asyncpg
     async with pool_instance.acquire() as conn:
         await conn.execute("TRUNCATE TABLE moderation_results CASCADE")
+        await conn.execute("TRUNCATE TABLE moderation_outbox")
         await conn.execute("TRUNCATE TABLE items CASCADE")
         await conn.execute("TRUNCATE TABLE users CASCADE")
     
@@ -52,6 +54,19 @@ async def db_pool():
         del os.environ["DATABASE_URL"]
 
 
+@pytest.fixture
+def make_model():
+    from sklearn.linear_model import LogisticRegression
+    
+    def train(seed: int = 42, flip: bool = False):
+        rng = np.random.RandomState(seed)
+        X = rng.rand(200, 4)
+        y = ((X[:, 0] < 0.3) & (X[:, 1] < 0.2)) != flip
+        return LogisticRegression().fit(X, y.astype(int))
+    
+    return train
+
+
 @pytest.fixture
 def client():
     return TestClient(app)
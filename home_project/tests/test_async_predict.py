@@ -1,11 +1,14 @@
 import pytest
 import asyncio
+import json
 from unittest.mock import AsyncMock, patch
 from fastapi import status
 from conftest import client, db_pool
 from repositories.users import UserRepository
 from repositories.items import ItemRepository
 from repositories.moderation_results import ModerationResultsRepository
+from routers.async_predict import build_batch_items, stream_batch_items
+from models.moderation import ModerationResultsBatchResponse
 
 
 class TestAsyncPredictEndpoint:
@@ -37,7 +40,7 @@ class TestAsyncPredictEndpoint:
         assert isinstance(data["task_id"], int)
         assert data["task_id"] > 0
         
-        mock_send.assert_called_once_with(201)
+        mock_send.assert_called_once_with(201, task_id=data["task_id"])
     
     @pytest.mark.asyncio
     async def test_async_predict_item_not_found(self, client, db_pool):
@@ -173,3 +176,138 @@ class TestModerationResultEndpoint:
     def test_get_moderation_result_invalid_task_id(self, client):
         response = client.get("/moderation_result/-1")
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestAsyncPredictDedupe:
+    
+    async def create_item(self, seller_id: int, item_id: int, description: str = "Описание") -> None:
+        await UserRepository().create_user(seller_id=seller_id, is_verified_seller=False)
+        await ItemRepository().create_item(
+            item_id=item_id,
+            seller_id=seller_id,
+            name="Товар",
+            description=description,
+            category=1,
+            images_qty=2
+        )
+    
+    @pytest.mark.asyncio
+    @patch('routers.async_predict.send_moderation_request')
+    async def test_repeated_requests_reuse_pending_task(self, mock_send, client, db_pool, monkeypatch):
+        monkeypatch.setattr("routers.async_predict.MODERATION_DEDUPE_ENABLED", True)
+        mock_send.return_value = None
+        await self.create_item(110, 210)
+        
+        first = client.post("/async_predict?item_id=210").json()
+        second = client.post("/async_predict?item_id=210").json()
+        
+        assert first["task_id"] == second["task_id"]
+        assert second["message"] == "Moderation request already pending"
+        mock_send.assert_called_once()
+        assert len(await ModerationResultsRepository().get_tasks_by_item_id(210)) == 1
+        
+        await ModerationResultsRepository().update_task_completed(first["task_id"], False, 0.1)
+        third = client.post("/async_predict?item_id=210").json()
+        assert third["task_id"] != first["task_id"]
+    
+    @pytest.mark.asyncio
+    @patch('routers.async_predict.send_moderation_request')
+    async def test_changed_item_gets_new_task(self, mock_send, client, db_pool, monkeypatch):
+        monkeypatch.setattr("routers.async_predict.MODERATION_DEDUPE_ENABLED", True)
+        mock_send.return_value = None
+        await self.create_item(111, 211)
+        
+        first = client.post("/async_predict?item_id=211").json()
+        await self.create_item(111, 211, description="Новое описание")
+        second = client.post("/async_predict?item_id=211").json()
+        
+        assert first["task_id"] != second["task_id"]
+        assert mock_send.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_inserts_create_single_task(self, db_pool):
+        await self.create_item(112, 212)
+        repo = ModerationResultsRepository()
+        
+        tasks = await asyncio.gather(*(repo.create_task(212, dedupe_key="212:0:test") for _ in range(10)))
+        
+        assert len({task["id"] for task in tasks}) == 1
+        assert sum(task["created"] for task in tasks) == 1
+
+
+class TestModerationResultsBatchGet:
+    
+    async def create_tasks(self) -> list:
+        await UserRepository().create_user(seller_id=120, is_verified_seller=True)
+        await ItemRepository().create_item(
+            item_id=220,
+            seller_id=120,
+            name="Товар",
+            description="Описание",
+            category=1,
+            images_qty=1
+        )
+        repo = ModerationResultsRepository()
+        first = await repo.create_task(220)
+        second = await repo.create_task(220)
+        await repo.update_task_completed(second["id"], True, 0.9)
+        return [first["id"], second["id"]]
+    
+    @pytest.mark.asyncio
+    async def test_results_in_request_order_with_not_found(self, client, db_pool):
+        first_id, second_id = await self.create_tasks()
+        
+        response = client.post("/moderation_results:batchGet", json={"task_ids": [second_id, 999999, first_id, second_id]})
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        
+        assert [result["task_id"] for result in results] == [second_id, 999999, first_id, second_id]
+        assert [result["found"] for result in results] == [True, False, True, True]
+        assert results[0]["status"] == "completed"
+        assert results[0]["is_violation"] is True
+        assert results[1]["status"] is None
+        assert results[2]["status"] == "pending"
+    
+    @pytest.mark.asyncio
+    async def test_out_of_range_ids_are_not_found(self, client, db_pool):
+        first_id, _ = await self.create_tasks()
+        oversized_id = 2 ** 31
+        
+        response = client.post("/moderation_results:batchGet", json={"task_ids": [oversized_id, first_id, -1]})
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        
+        assert [result["task_id"] for result in results] == [oversized_id, first_id, -1]
+        assert [result["found"] for result in results] == [False, True, False]
+    
+    @pytest.mark.asyncio
+    async def test_large_batch_is_streamed(self, client, db_pool, monkeypatch):
+        monkeypatch.setattr("routers.async_predict.MODERATION_RESULTS_STREAM_THRESHOLD", 2)
+        monkeypatch.setattr("routers.async_predict.MODERATION_RESULTS_STREAM_CHUNK_SIZE", 1)
+        first_id, second_id = await self.create_tasks()
+        
+        response = client.post("/moderation_results:batchGet", json={"task_ids": [first_id, 0, second_id]})
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert [result["task_id"] for result in results] == [first_id, 0, second_id]
+        assert [result["found"] for result in results] == [True, False, True]
+    
+    def test_stream_matches_regular_response(self, monkeypatch):
+        monkeypatch.setattr("routers.async_predict.MODERATION_RESULTS_STREAM_CHUNK_SIZE", 2)
+        task_ids = [5, 0, 6, 5]
+        tasks = {
+            5: {"status": "completed", "is_violation": True, "probability": 0.9, "error_message": None},
+            6: {"status": "failed", "is_violation": None, "probability": None, "error_message": "Модель не загружена"}
+        }
+        
+        chunks = stream_batch_items(task_ids, tasks)
+        assert next(chunks) == '{"results":['
+        streamed = json.loads("".join(['{"results":[', *chunks]))
+        
+        expected = ModerationResultsBatchResponse(results=build_batch_items(task_ids, tasks)).model_dump()
+        assert streamed == expected
+    
+    def test_too_many_ids(self, client, monkeypatch):
+        monkeypatch.setattr("routers.async_predict.MODERATION_RESULTS_BATCH_MAX_IDS", 2)
+        response = client.post("/moderation_results:batchGet", json={"task_ids": [1, 2, 3]})
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
@@ -0,0 +1,97 @@
+import pytest
+from model import train_model
+from models.predictions import PredictionRequest
+from services.predictions import PredictionService
+from workers import batch_scoring
+from workers.batch_scoring import run_batch_scoring
+
+
+def make_row(item_id: int) -> dict:
+    return {
+        "item_id": item_id,
+        "is_verified_seller": item_id % 2 == 0,
+        "images_qty": item_id % 12,
+        "description_length": item_id * 37 % 1500,
+        "category": item_id % 120
+    }
+
+
+class FakeBatchScoringRepository:
+    def __init__(self, item_ids, checkpoint=None):
+        self.rows = [make_row(item_id) for item_id in item_ids]
+        self.checkpoint = checkpoint
+        self.written = []
+        self.checkpoints = []
+    
+    async def reset_checkpoint(self, job_name):
+        self.checkpoint = None
+    
+    async def get_checkpoint(self, job_name):
+        return self.checkpoint
+    
+    async def count_items(self, after_item_id):
+        return sum(1 for row in self.rows if row["item_id"] > after_item_id)
+    
+    async def iter_item_chunks(self, after_item_id, chunk_size):
+        rows = [row for row in self.rows if row["item_id"] > after_item_id]
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+    
+    async def write_results(self, job_name, results, last_item_id):
+        self.written.extend(results)
+        self.checkpoints.append(last_item_id)
+
+
+class TestBatchScoring:
+    
+    @pytest.fixture
+    def service(self):
+        service = PredictionService(batching=False, execution_mode="inline", cache=False)
+        service.set_model(train_model())
+        return service
+    
+    @pytest.mark.asyncio
+    async def test_scores_catalog_in_chunks(self, service, monkeypatch):
+        repository = FakeBatchScoringRepository(range(1, 26))
+        monkeypatch.setattr(batch_scoring, "batch_scoring_repository", repository)
+        
+        summary = await run_batch_scoring(service, job_name="test", chunk_size=10, workers=0)
+        
+        assert summary["scored"] == 25
+        assert summary["chunks"] == 3
+        assert repository.checkpoints == [10, 20, 25]
+        assert [result[0] for result in repository.written] == list(range(1, 26))
+        
+        row = make_row(7)
+        expected = service.predict(PredictionRequest(
+            seller_id=1,
+            is_verified_seller=row["is_verified_seller"],
+            item_id=7,
+            name="Товар",
+            description="а" * row["description_length"],
+            category=row["category"],
+            images_qty=row["images_qty"]
+        ))
+        _, status, is_violation, probability, _ = repository.written[6]
+        assert status == "completed"
+        assert is_violation == expected.is_violation
+        assert probability == pytest.approx(expected.probability)
+    
+    @pytest.mark.asyncio
+    async def test_resumes_from_checkpoint(self, service, monkeypatch):
+        repository = FakeBatchScoringRepository(range(1, 26), checkpoint={"last_item_id": 20, "scored_items": 20})
+        monkeypatch.setattr(batch_scoring, "batch_scoring_repository", repository)
+        
+        summary = await run_batch_scoring(service, job_name="test", chunk_size=10, workers=0)
+        
+        assert summary["scored"] == 5
+        assert [result[0] for result in repository.written] == list(range(21, 26))
+    
+    @pytest.mark.asyncio
+    async def test_restart_ignores_checkpoint(self, service, monkeypatch):
+        repository = FakeBatchScoringRepository(range(1, 6), checkpoint={"last_item_id": 5, "scored_items": 5})
+        monkeypatch.setattr(batch_scoring, "batch_scoring_repository", repository)
+        
+        summary = await run_batch_scoring(service, job_name="test", chunk_size=10, workers=0, restart=True)
+        
+        assert summary["scored"] == 5
@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import AsyncMock
+from services import bulk_ingest
+from services.bulk_ingest import ingest_file, detect_format, parse_item, BulkIngestError
+
+
+class TestBulkIngest:
+    
+    @pytest.fixture
+    def repositories(self, monkeypatch):
+        users = AsyncMock()
+        users.upsert_users_bulk.return_value = {"upserted": 1, "skipped": 0}
+        items = AsyncMock()
+        items.upsert_items_bulk.side_effect = lambda records: {"upserted": len(records) - 1, "skipped": 1}
+        monkeypatch.setattr(bulk_ingest, "user_repository", users)
+        monkeypatch.setattr(bulk_ingest, "item_repository", items)
+        return users, items
+    
+    @pytest.mark.asyncio
+    async def test_csv_items_loaded_in_batches(self, repositories, tmp_path):
+        _, items = repositories
+        path = tmp_path / "items.csv"
+        path.write_text(
+            "item_id,seller_id,name,description,category,images_qty\n"
+            "1,10,Велосипед,\"Почти новый,\nс корзиной\",3,2\n"
+            "2,10,Самокат,,1,0\n"
+            "3,11,Коляска,Описание,2,1\n"
+            "4,11,,Без названия,2,1\n"
+            "5,12,Стол,Описание,-1,1\n",
+            encoding="utf-8"
+        )
+        
+        stats = await ingest_file("items", path, batch_size=2)
+        
+        assert items.upsert_items_bulk.await_count == 2
+        first_batch = items.upsert_items_bulk.await_args_list[0].args[0]
+        assert first_batch[0] == (1, 10, "Велосипед", "Почти новый,\nс корзиной", 3, 2)
+        assert first_batch[1][3] == ""
+        assert stats.rows == 5
+        assert stats.invalid == 2
+        assert stats.skipped == 2
+        assert len(stats.errors) == 2
+        assert stats.snapshot()["rows_per_second"] > 0
+    
+    @pytest.mark.asyncio
+    async def test_ndjson_users_with_bad_line(self, repositories, tmp_path):
+        users, _ = repositories
+        path = tmp_path / "users.ndjson"
+        path.write_text(
+            '{"seller_id": 1, "is_verified_seller": true}\n'
+            '\n'
+            '{"seller_id": 2, "is_verified_seller": "нет"}\n'
+            'не json\n'
+            '{"seller_id": 3, "is_verified_seller": "false"}\n',
+            encoding="utf-8"
+        )
+        
+        stats = await ingest_file("users", path)
+        
+        records = users.upsert_users_bulk.await_args.args[0]
+        assert records == [(1, True), (3, False)]
+        assert stats.rows == 4
+        assert stats.invalid == 2
+    
+    def test_detect_format(self, tmp_path):
+        assert detect_format(tmp_path / "a.csv") == "csv"
+        assert detect_format(tmp_path / "a.jsonl") == "ndjson"
+        assert detect_format(tmp_path / "a", "application/x-ndjson; charset=utf-8") == "ndjson"
+        with pytest.raises(BulkIngestError):
+            detect_format(tmp_path / "a.xlsx")
+    
+    def test_parse_item_requires_positive_ids(self):
+        with pytest.raises(ValueError):
+            parse_item({"item_id": "0", "seller_id": "1", "name": "Товар", "category": "1", "images_qty": "1"})
@@ -0,0 +1,228 @@
+import asyncio
+import time
+import pytest
+from collections import namedtuple
+from aiokafka.structs import TopicPartition
+from workers.concurrency import ConcurrentPartitionProcessor, PartitionOffsetTracker
+
+FakeMessage = namedtuple("FakeMessage", ["offset", "value"])
+
+
+class FakeConsumer:
+    def __init__(self, partitions: dict, stop: asyncio.Event, records_per_poll: int = 10):
+        self.pending = {tp: [FakeMessage(offset, value) for offset, value in messages] for tp, messages in partitions.items()}
+        self.stop = stop
+        self.records_per_poll = records_per_poll
+        self.commits = []
+        self.paused = set()
+    
+    async def getmany(self, timeout_ms: int = 0, max_records: int = None):
+        batch = {}
+        for tp, messages in self.pending.items():
+            if messages and tp not in self.paused:
+                batch[tp] = messages[:self.records_per_poll]
+                self.pending[tp] = messages[self.records_per_poll:]
+        if not any(self.pending.values()) and not batch and not self.paused:
+            self.stop.set()
+        await asyncio.sleep(0 if batch else 0.001)
+        return batch
+    
+    async def commit(self, offsets: dict):
+        self.commits.append(dict(offsets))
+    
+    def pause(self, *partitions):
+        self.paused.update(partitions)
+    
+    def resume(self, *partitions):
+        self.paused.difference_update(partitions)
+
+
+def make_partition(count: int, start: int = 0) -> list:
+    return [(offset, {"item_id": offset + 1}) for offset in range(start, start + count)]
+
+
+async def run_processor(partitions: dict, handler, max_in_flight: int) -> FakeConsumer:
+    stop = asyncio.Event()
+    consumer = FakeConsumer(partitions, stop)
+    processor = ConcurrentPartitionProcessor(consumer, handler, max_in_flight_per_partition=max_in_flight)
+    await processor.run(stop)
+    return consumer
+
+
+class TestPartitionOffsetTracker:
+    
+    def test_commits_only_contiguous_prefix(self):
+        tracker = PartitionOffsetTracker()
+        for offset in range(5):
+            tracker.start(offset)
+        for offset in (0, 1, 3, 4):
+            tracker.complete(offset)
+        assert tracker.committable() == 2
+        
+        tracker.committed = 2
+        assert tracker.committable() is None
+        
+        tracker.complete(2)
+        assert tracker.committable() == 5
+    
+    def test_offset_gaps(self):
+        tracker = PartitionOffsetTracker()
+        for offset in (10, 12, 15):
+            tracker.start(offset)
+        tracker.complete(10)
+        tracker.complete(15)
+        assert tracker.committable() == 12
+        tracker.complete(12)
+        assert tracker.committable() == 16
+
+
+class TestConcurrentPartitionProcessor:
+    
+    @pytest.mark.asyncio
+    async def test_throughput_scales_with_concurrency(self):
+        async def handler(value):
+            await asyncio.sleep(0.02)
+        
+        partitions = {TopicPartition("moderation", 0): make_partition(40)}
+        
+        started = time.perf_counter()
+        await run_processor(partitions, handler, max_in_flight=1)
+        serial = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        consumer = await run_processor(partitions, handler, max_in_flight=8)
+        concurrent = time.perf_counter() - started
+        
+        assert serial / concurrent > 3
+        assert consumer.commits[-1] == {TopicPartition("moderation", 0): 40}
+    
+    @pytest.mark.asyncio
+    async def test_in_flight_limit_per_partition(self):
+        in_flight = {0: 0, 1: 0}
+        peak = {0: 0, 1: 0}
+        
+        async def handler(value):
+            partition = value["partition"]
+            in_flight[partition] += 1
+            peak[partition] = max(peak[partition], in_flight[partition])
+            await asyncio.sleep(0.01)
+            in_flight[partition] -= 1
+        
+        partitions = {
+            TopicPartition("moderation", p): [(offset, {"partition": p}) for offset in range(30)]
+            for p in (0, 1)
+        }
+        await run_processor(partitions, handler, max_in_flight=3)
+        assert peak == {0: 3, 1: 3}
+    
+    @pytest.mark.asyncio
+    async def test_no_commit_past_unfinished_message(self):
+        tp = TopicPartition("moderation", 0)
+        release = asyncio.Event()
+        
+        async def handler(value):
+            if value["item_id"] == 3:
+                await release.wait()
+        
+        stop = asyncio.Event()
+        consumer = FakeConsumer({tp: make_partition(10)}, stop)
+        processor = ConcurrentPartitionProcessor(consumer, handler, max_in_flight_per_partition=10)
+        
+        run_task = asyncio.create_task(processor.run(stop))
+        while not stop.is_set():
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        await processor.commit()
+        
+        assert consumer.commits
+        assert all(offsets[tp] <= 2 for offsets in consumer.commits)
+        
+        release.set()
+        await run_task
+        assert consumer.commits[-1][tp] == 10
+    
+    @pytest.mark.asyncio
+    async def test_handler_error_is_not_committed(self):
+        tp = TopicPartition("moderation", 0)
+        processed = []
+        committable = []
+        
+        async def handler(value):
+            committable.append(processor.offsets.committable().get(tp))
+            if value["item_id"] == 2:
+                raise ValueError("ошибка обработки")
+            processed.append(value["item_id"])
+        
+        stop = asyncio.Event()
+        consumer = FakeConsumer({tp: make_partition(5)}, stop)
+        processor = ConcurrentPartitionProcessor(consumer, handler, max_in_flight_per_partition=4)
+        await processor.run(stop)
+        
+        assert processed == [1, 3, 4, 5]
+        assert all(position is None or position <= 1 for position in committable)
+        assert processor.offsets.committable().get(tp) in (None, 1)
+        assert all(offsets[tp] <= 1 for offsets in consumer.commits)
+    
+    @pytest.mark.asyncio
+    async def test_saturated_partition_does_not_block_others(self):
+        slow, fast = TopicPartition("moderation", 0), TopicPartition("moderation", 1)
+        release = asyncio.Event()
+        processed = []
+        
+        async def handler(value):
+            if value["partition"] == 0:
+                await release.wait()
+            processed.append(value["partition"])
+        
+        stop = asyncio.Event()
+        consumer = FakeConsumer({
+            slow: [(offset, {"partition": 0}) for offset in range(20)],
+            fast: [(offset, {"partition": 1}) for offset in range(20)]
+        }, stop)
+        processor = ConcurrentPartitionProcessor(consumer, handler, max_in_flight_per_partition=2)
+        
+        run_task = asyncio.create_task(processor.run(stop))
+        for _ in range(100):
+            if processed.count(1) == 20:
+                break
+            await asyncio.sleep(0.01)
+        
+        assert processed.count(1) == 20
+        assert slow in consumer.paused
+        
+        release.set()
+        await run_task
+        committed = {}
+        for offsets in consumer.commits:
+            committed.update(offsets)
+        assert committed == {slow: 20, fast: 20}
+    
+    @pytest.mark.asyncio
+    async def test_revoked_partition_is_drained_and_committed(self):
+        tp = TopicPartition("moderation", 0)
+        release = asyncio.Event()
+        processed = []
+        
+        async def handler(value):
+            await release.wait()
+            processed.append(value["item_id"])
+        
+        stop = asyncio.Event()
+        consumer = FakeConsumer({tp: make_partition(10)}, stop)
+        processor = ConcurrentPartitionProcessor(consumer, handler, max_in_flight_per_partition=3)
+        
+        batches = await consumer.getmany()
+        processor._dispatch(tp, batches[tp])
+        assert tp in consumer.paused
+        
+        revoke_task = asyncio.create_task(processor.rebalance_listener.on_partitions_revoked([tp]))
+        await asyncio.sleep(0.01)
+        assert not revoke_task.done()
+        release.set()
+        await revoke_task
+        
+        assert processed == [1, 2, 3]
+        assert consumer.commits[-1] == {tp: 3}
+        assert processor.offsets.partitions == {}
+        assert not processor._tasks
+
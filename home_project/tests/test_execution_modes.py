@@ -0,0 +1,111 @@
+import asyncio
+import time
+import pytest
+from models.predictions import PredictionRequest
+from services.predictions import PredictionService
+
+
+def make_request(item_id: int) -> PredictionRequest:
+    return PredictionRequest(
+        seller_id=1,
+        is_verified_seller=item_id % 2 == 0,
+        item_id=item_id,
+        name="Товар",
+        description="Описание" * item_id,
+        category=item_id,
+        images_qty=item_id % 11
+    )
+
+
+class SlowModel:
+    def __init__(self, model, delay: float):
+        self.model = model
+        self.delay = delay
+        self.classes_ = model.classes_
+    
+    def predict_proba(self, features):
+        time.sleep(self.delay)
+        return self.model.predict_proba(features)
+
+
+class TestExecutionModes:
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("execution_mode", ["inline", "thread", "process"])
+    async def test_predict_async_matches_predict(self, execution_mode, make_model):
+        service = PredictionService(batching=False, execution_mode=execution_mode, executor_workers=2)
+        service.set_model(make_model())
+        requests = [make_request(i) for i in range(1, 11)]
+        
+        try:
+            results = await asyncio.gather(*(service.predict_async(request) for request in requests))
+            batch_results = await service.predict_batch_async(requests)
+        finally:
+            await service.close()
+        
+        expected = [service.predict(request) for request in requests]
+        assert [r.is_violation for r in results] == [r.is_violation for r in expected]
+        assert [r.probability for r in results] == pytest.approx([r.probability for r in expected])
+        assert [r.probability for r in batch_results] == pytest.approx([r.probability for r in expected])
+    
+    @pytest.mark.asyncio
+    async def test_process_pool_is_started_with_model(self, make_model):
+        service = PredictionService(batching=False, execution_mode="process", executor_workers=2)
+        try:
+            service.set_model(make_model())
+            process_pool = service._process_pool
+            
+            assert process_pool is not None
+            assert len(process_pool._processes) == 2
+            await service.predict_async(make_request(3))
+            assert service._process_pool is process_pool
+        finally:
+            await service.close()
+    
+    @pytest.mark.asyncio
+    async def test_process_pool_uses_swapped_model(self, make_model):
+        service = PredictionService(batching=False, execution_mode="process", executor_workers=1)
+        service.set_model(make_model())
+        request = make_request(3)
+        
+        try:
+            await service.predict_async(request)
+            new_model = make_model(seed=7)
+            new_model.coef_ = -new_model.coef_
+            service.set_model(new_model)
+            result = await service.predict_async(request)
+        finally:
+            await service.close()
+        
+        assert result.probability == pytest.approx(service.predict(request).probability)
+    
+    @pytest.mark.asyncio
+    async def test_thread_mode_does_not_block_event_loop(self, make_model):
+        service = PredictionService(batching=False, execution_mode="thread", executor_workers=2)
+        service.model = SlowModel(make_model(), delay=0.3)
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+        
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            await service.predict_async(make_request(1))
+        finally:
+            ticker_task.cancel()
+            await service.close()
+        
+        assert ticks >= 10
+    
+    @pytest.mark.asyncio
+    async def test_model_not_loaded(self):
+        service = PredictionService(batching=False, execution_mode="thread")
+        with pytest.raises(RuntimeError, match="Модель не загружена"):
+            await service.predict_async(make_request(1))
+    
+    def test_unknown_execution_mode(self):
+        with pytest.raises(ValueError):
+            PredictionService(execution_mode="unknown")
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import model
+from model import get_model, get_or_train_model, save_model, train_model
+
+src_path = Path(__file__).parent.parent / "src"
+
+
+class TestFastStart:
+    
+    def test_missing_artifact_is_not_trained(self, tmp_path):
+        model_path = tmp_path / "model.pkl"
+        
+        with pytest.raises(FileNotFoundError):
+            get_or_train_model(str(model_path), allow_training=False)
+        
+        assert not model_path.exists()
+    
+    def test_fast_start_disables_training_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(model, "MODEL_FAST_START", True)
+        
+        with pytest.raises(FileNotFoundError):
+            get_model(model_path=str(tmp_path / "model.pkl"))
+    
+    def test_fast_start_loads_prebuilt_artifact(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(model, "MODEL_FAST_START", True)
+        model_path = tmp_path / "model.pkl"
+        save_model(train_model(), str(model_path))
+        
+        loaded = get_model(model_path=str(model_path))
+        
+        assert list(loaded.classes_) == [0, 1]
+        assert not (tmp_path / "model.pkl.tmp").exists()
+    
+    @pytest.mark.parametrize("module", ["main", "workers.moderation_worker"])
+    def test_import_does_not_load_sklearn_or_mlflow(self, module):
+        output = subprocess.run(
+            [sys.executable, "-c", f"import sys; import {module}; print('sklearn' in sys.modules, 'mlflow' in sys.modules)"],
+            cwd=src_path, capture_output=True, text=True, check=True
+        ).stdout.split()
+        
+        assert output == ["False", "False"]
@@ -0,0 +1,135 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+import database
+from repositories import items
+from repositories.items import ItemRepository
+from services.cache import LRUCache, MISSING
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def make_item(item_id: int, seller_id: int = 1) -> dict:
+    return {
+        "id": item_id,
+        "item_id": item_id,
+        "seller_id": seller_id,
+        "name": "Товар",
+        "description": "Описание",
+        "category": 1,
+        "images_qty": 2,
+        "is_verified_seller": True
+    }
+
+
+class FakePool:
+    def __init__(self, rows: dict):
+        self.rows = rows
+        self.acquired = 0
+        self.conn = MagicMock()
+        self.conn.fetchrow = AsyncMock(side_effect=lambda query, item_id: self.rows.get(item_id))
+    
+    async def acquire(self, timeout=None):
+        self.acquired += 1
+        return self.conn
+    
+    async def release(self, conn):
+        pass
+
+
+class TestLRUCache:
+    
+    def test_lru_eviction(self):
+        cache = LRUCache(max_size=2)
+        cache.set(1, "a")
+        cache.set(2, "b")
+        assert cache.get(1) == "a"
+        cache.set(3, "c")
+        
+        assert cache.get(2) is MISSING
+        assert cache.get(1) == "a"
+        assert cache.get(3) == "c"
+        assert cache.stats.evictions == 1
+    
+    def test_ttl_expiration(self):
+        clock = FakeClock()
+        cache = LRUCache(max_size=10, ttl_seconds=5, clock=clock)
+        cache.set(1, "a")
+        cache.set(2, None, ttl_seconds=1)
+        
+        clock.now = 2
+        assert cache.get(1) == "a"
+        assert cache.get(2) is MISSING
+        clock.now = 6
+        assert cache.get(1) is MISSING
+        assert cache.stats.expirations == 2
+    
+    def test_stale_fill_is_rejected_after_invalidation(self):
+        cache = LRUCache(max_size=10)
+        generation = cache.generation
+        cache.invalidate(1)
+        
+        assert cache.set(1, "stale", generation=generation) is False
+        assert cache.get(1) is MISSING
+
+
+class TestItemCache:
+    
+    @pytest.fixture
+    def fake_pool(self, monkeypatch):
+        pool = FakePool({1: make_item(1, seller_id=10), 2: make_item(2, seller_id=20)})
+        monkeypatch.setattr(items, "ITEM_CACHE_ENABLED", True)
+        monkeypatch.setattr(items, "item_cache", LRUCache(max_size=100, ttl_seconds=60))
+        monkeypatch.setattr(database, "get_db_pool", AsyncMock(return_value=pool))
+        monkeypatch.setattr(items.postgres_listener, "subscribe", AsyncMock())
+        return pool
+    
+    @pytest.mark.asyncio
+    async def test_cache_hit_does_not_acquire_connection(self, fake_pool):
+        repository = ItemRepository()
+        first = await repository.get_item_by_item_id(1)
+        second = await repository.get_item_by_item_id(1)
+        
+        assert first == second == make_item(1, seller_id=10)
+        assert fake_pool.acquired == 1
+        assert items.item_cache.stats.hits == 1
+        assert items.item_cache.stats.misses == 1
+    
+    @pytest.mark.asyncio
+    async def test_negative_lookup_is_cached(self, fake_pool):
+        repository = ItemRepository()
+        assert await repository.get_item_by_item_id(999) is None
+        assert await repository.get_item_by_item_id(999) is None
+        assert fake_pool.acquired == 1
+    
+    @pytest.mark.asyncio
+    async def test_notifications_invalidate_entries(self, fake_pool):
+        repository = ItemRepository()
+        await repository.get_item_by_item_id(1)
+        await repository.get_item_by_item_id(2)
+        
+        items._on_items_changed("1")
+        await repository.get_item_by_item_id(1)
+        await repository.get_item_by_item_id(2)
+        assert fake_pool.acquired == 3
+        
+        items._on_users_changed("20")
+        await repository.get_item_by_item_id(1)
+        await repository.get_item_by_item_id(2)
+        assert fake_pool.acquired == 4
+        
+        items._on_items_changed("*")
+        assert len(items.item_cache) == 0
+    
+    @pytest.mark.asyncio
+    async def test_cache_disabled_queries_every_time(self, fake_pool, monkeypatch):
+        monkeypatch.setattr(items, "ITEM_CACHE_ENABLED", False)
+        repository = ItemRepository()
+        await repository.get_item_by_item_id(1)
+        await repository.get_item_by_item_id(1)
+        assert fake_pool.acquired == 2
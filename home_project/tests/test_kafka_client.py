@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from clients import kafka
+
+
+class FakeProducer:
+    def __init__(self):
+        self.deliveries = []
+        self.send_and_wait = AsyncMock()
+    
+    async def send(self, topic, value):
+        delivery = asyncio.get_running_loop().create_future()
+        self.deliveries.append((topic, value, delivery))
+        return delivery
+
+
+class TestBufferedProducer:
+    
+    @pytest.mark.asyncio
+    async def test_buffered_send_does_not_wait_for_ack(self, monkeypatch):
+        fake_producer = FakeProducer()
+        monkeypatch.setattr(kafka, "KAFKA_PRODUCER_MODE", "buffered")
+        monkeypatch.setattr(kafka, "get_producer", AsyncMock(return_value=fake_producer))
+        
+        await kafka.send_moderation_request(201, task_id=7)
+        
+        assert len(fake_producer.deliveries) == 1
+        topic, value, delivery = fake_producer.deliveries[0]
+        assert topic == kafka.MODERATION_TOPIC
+        assert value["item_id"] == 201
+        assert not delivery.done()
+        fake_producer.send_and_wait.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_delivery_failure_calls_failure_callback(self, monkeypatch):
+        on_failure = AsyncMock()
+        fake_producer = FakeProducer()
+        monkeypatch.setattr(kafka, "KAFKA_PRODUCER_MODE", "buffered")
+        monkeypatch.setattr(kafka, "get_producer", AsyncMock(return_value=fake_producer))
+        failed_before = kafka.producer_stats["failed"]
+        
+        await kafka.send_moderation_request(201, task_id=7, on_delivery_failure=on_failure)
+        _, _, delivery = fake_producer.deliveries[0]
+        delivery.set_exception(Exception("broker unavailable"))
+        await asyncio.sleep(0)
+        await asyncio.gather(*list(kafka._delivery_failure_tasks))
+        
+        on_failure.assert_awaited_once()
+        task_id, error_message = on_failure.await_args.args
+        assert task_id == 7
+        assert "broker unavailable" in error_message
+        assert kafka.producer_stats["failed"] == failed_before + 1
+    
+    @pytest.mark.asyncio
+    async def test_successful_delivery(self, monkeypatch):
+        on_failure = AsyncMock()
+        fake_producer = FakeProducer()
+        monkeypatch.setattr(kafka, "KAFKA_PRODUCER_MODE", "buffered")
+        monkeypatch.setattr(kafka, "get_producer", AsyncMock(return_value=fake_producer))
+        delivered_before = kafka.producer_stats["delivered"]
+        
+        await kafka.send_moderation_request(201, task_id=7, on_delivery_failure=on_failure)
+        fake_producer.deliveries[0][2].set_result(MagicMock())
+        await asyncio.sleep(0)
+        
+        assert kafka.producer_stats["delivered"] == delivered_before + 1
+        on_failure.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_sync_mode_waits_for_ack(self, monkeypatch):
+        fake_producer = FakeProducer()
+        monkeypatch.setattr(kafka, "KAFKA_PRODUCER_MODE", "sync")
+        monkeypatch.setattr(kafka, "get_producer", AsyncMock(return_value=fake_producer))
+        
+        await kafka.send_moderation_request(201, task_id=7)
+        
+        fake_producer.send_and_wait.assert_awaited_once()
+        assert fake_producer.deliveries == []
+    
+    def test_message_carries_task_id_and_schema_version(self):
+        message = kafka.build_moderation_message(201, task_id=7)
+        assert message["item_id"] == 201
+        assert message["task_id"] == 7
+        assert message["schema_version"] == kafka.MODERATION_MESSAGE_SCHEMA_VERSION
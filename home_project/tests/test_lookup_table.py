@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from models.predictions import PredictionRequest
+from services.predictions import PredictionService
+
+
+def make_requests() -> list:
+    rng = np.random.default_rng(7)
+    requests = [
+        PredictionRequest(
+            seller_id=1,
+            is_verified_seller=bool(rng.integers(0, 2)),
+            item_id=i + 1,
+            name="Товар",
+            description="A" * int(rng.integers(0, 1500)),
+            category=int(rng.integers(0, 150)),
+            images_qty=int(rng.integers(0, 15))
+        )
+        for i in range(300)
+    ]
+    requests.append(PredictionRequest(
+        seller_id=1, is_verified_seller=False, item_id=1000, name="Товар",
+        description="", category=0, images_qty=0
+    ))
+    requests.append(PredictionRequest(
+        seller_id=1, is_verified_seller=True, item_id=1001, name="Товар",
+        description="A" * 5000, category=10000, images_qty=500
+    ))
+    return requests
+
+
+class TestScoreLookupTable:
+    
+    @pytest.fixture(autouse=True)
+    def services(self, make_model):
+        self.direct_service = PredictionService(batching=False, scoring_mode="direct")
+        self.lookup_service = PredictionService(batching=False, scoring_mode="lookup")
+        model = make_model()
+        self.direct_service.set_model(model)
+        self.lookup_service.set_model(model)
+    
+    def test_table_is_built_on_model_load(self):
+        table = self.lookup_service.lookup_table
+        assert table is not None
+        assert table.probabilities.dtype == np.float32
+        assert table.probabilities.shape == (2, 11, 1001, 101)
+        assert self.direct_service.lookup_table is None
+    
+    def test_lookup_matches_direct_scoring(self):
+        requests = make_requests()
+        expected = self.direct_service.predict_batch(requests)
+        actual = self.lookup_service.predict_batch(requests)
+        
+        for expected_result, actual_result in zip(expected, actual):
+            assert actual_result.is_violation == expected_result.is_violation
+            assert actual_result.probability == pytest.approx(expected_result.probability, abs=1e-6)
+    
+    def test_single_predict_uses_table(self):
+        request = make_requests()[0]
+        expected = self.direct_service.predict(request)
+        actual = self.lookup_service.predict(request)
+        assert actual.is_violation == expected.is_violation
+        assert actual.probability == pytest.approx(expected.probability, abs=1e-6)
+    
+    def test_table_is_rebuilt_on_model_swap(self):
+        first_table = self.lookup_service.lookup_table
+        new_model = RandomForestClassifier(n_estimators=3, random_state=0).fit(
+            np.random.rand(50, 4), np.arange(50) % 2
+        )
+        self.lookup_service.set_model(new_model)
+        self.direct_service.set_model(new_model)
+        assert self.lookup_service.lookup_table is not first_table
+        
+        requests = make_requests()[:50]
+        expected = self.direct_service.predict_batch(requests)
+        actual = self.lookup_service.predict_batch(requests)
+        assert [r.is_violation for r in actual] == [r.is_violation for r in expected]
+        
+        self.lookup_service.model = None
+        assert self.lookup_service.lookup_table is None
+    
+    def test_unknown_scoring_mode(self):
+        with pytest.raises(ValueError):
+            PredictionService(scoring_mode="unknown")
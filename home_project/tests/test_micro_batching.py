@@ -0,0 +1,111 @@
+import asyncio
+import pytest
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from models.predictions import PredictionRequest, PredictionResponse
+from services.predictions import PredictionService
+from services.batching import MicroBatcher, PredictionQueueFullError
+
+
+def make_request(item_id: int, images_qty: int = 3) -> PredictionRequest:
+    return PredictionRequest(
+        seller_id=1,
+        is_verified_seller=item_id % 2 == 0,
+        item_id=item_id,
+        name="Товар",
+        description="Описание" * (item_id % 50),
+        category=item_id % 100,
+        images_qty=images_qty
+    )
+
+
+class TestMicroBatching:
+    
+    def setup_method(self):
+        np.random.seed(42)
+        X = np.random.rand(100, 4)
+        y = (X[:, 0] < 0.3) & (X[:, 1] < 0.2)
+        y = y.astype(int)
+        self.model = LogisticRegression()
+        self.model.fit(X, y)
+    
+    def test_predict_batch_matches_single_predictions(self):
+        service = PredictionService(batching=False)
+        service.set_model(self.model)
+        requests = [make_request(i) for i in range(1, 21)]
+        
+        batch_results = service.predict_batch(requests)
+        single_results = [service.predict(request) for request in requests]
+        
+        assert len(batch_results) == len(requests)
+        for batch_result, single_result in zip(batch_results, single_results):
+            assert isinstance(batch_result, PredictionResponse)
+            assert batch_result.is_violation == single_result.is_violation
+            assert batch_result.probability == pytest.approx(single_result.probability)
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_batched(self):
+        service = PredictionService(batching=True)
+        service.batcher = MicroBatcher(service.predict_batch, max_batch_size=8, max_wait_ms=50, max_queue_size=100)
+        service.set_model(self.model)
+        requests = [make_request(i) for i in range(1, 33)]
+        
+        try:
+            results = await asyncio.gather(*(service.predict_async(request) for request in requests))
+        finally:
+            await service.close()
+        
+        expected = service.predict_batch(requests)
+        assert [r.probability for r in results] == pytest.approx([r.probability for r in expected])
+        
+        stats = service.get_batching_stats()
+        assert stats["requests_total"] == 32
+        assert stats["max_batch_size"] == 8
+        assert stats["batches_total"] < 32
+    
+    @pytest.mark.asyncio
+    async def test_model_not_loaded(self):
+        service = PredictionService(batching=True)
+        with pytest.raises(RuntimeError, match="Модель не загружена"):
+            await service.predict_async(make_request(1))
+    
+    @pytest.mark.asyncio
+    async def test_handler_error_is_propagated_to_all_callers(self):
+        def failing_handler(items):
+            raise ValueError("ошибка модели")
+        
+        batcher = MicroBatcher(failing_handler, max_batch_size=4, max_wait_ms=20)
+        try:
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(4)), return_exceptions=True)
+        finally:
+            await batcher.stop()
+        
+        assert all(isinstance(result, ValueError) for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_queue_full(self):
+        batcher = MicroBatcher(lambda items: items, max_batch_size=1, max_wait_ms=0, max_queue_size=1)
+        try:
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(5)), return_exceptions=True)
+        finally:
+            await batcher.stop()
+        
+        assert any(isinstance(result, PredictionQueueFullError) for result in results)
+        assert batcher.get_stats()["rejected_total"] > 0
+    
+    @pytest.mark.asyncio
+    async def test_stop_fails_in_flight_batch(self):
+        started = asyncio.Event()
+        
+        async def hanging_handler(items):
+            started.set()
+            await asyncio.Event().wait()
+        
+        batcher = MicroBatcher(hanging_handler, max_batch_size=2, max_wait_ms=0)
+        submits = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        await asyncio.wait_for(started.wait(), timeout=1)
+        await batcher.stop()
+        
+        results = await asyncio.wait_for(asyncio.gather(*submits, return_exceptions=True), timeout=1)
+        
+        assert all(isinstance(result, RuntimeError) for result in results)
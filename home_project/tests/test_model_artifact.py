@@ -0,0 +1,164 @@
+import json
+import pickle
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from model import get_model
+from models.predictions import PredictionRequest
+from services.model_artifact import save_artifact, load_artifact, read_manifest, MANIFEST_NAME
+from services.model_registry import ModelRegistry, ArtifactModelSource
+from services.predictions import PredictionService
+from services.scorers import LinearScorer
+
+src_path = Path(__file__).parent.parent / "src"
+
+
+class TestModelArtifact:
+    
+    def test_roundtrip_matches_sklearn(self, make_model, tmp_path):
+        model = make_model()
+        save_artifact(model, tmp_path)
+        
+        artifact = load_artifact(tmp_path)
+        features = np.random.default_rng(0).random((100, 4))
+        
+        assert isinstance(artifact.coef_, np.memmap)
+        np.testing.assert_allclose(artifact.predict_proba(features), model.predict_proba(features), atol=1e-12)
+        np.testing.assert_array_equal(artifact.predict(features), model.predict(features))
+    
+    def test_manifest_describes_artifact(self, make_model, tmp_path):
+        save_artifact(make_model(), tmp_path, version="v1", source="model.pkl")
+        
+        manifest = read_manifest(tmp_path)
+        
+        assert manifest["version"] == "v1"
+        assert manifest["source"] == "model.pkl"
+        assert manifest["model_type"] == "LogisticRegression"
+        assert len(manifest["features"]) == 4
+        assert manifest["arrays"]["coef"]["shape"] == [1, 4]
+        assert len(manifest["checksum"]) == 64
+    
+    def test_corrupted_array_is_rejected(self, make_model, tmp_path):
+        save_artifact(make_model(), tmp_path)
+        coef_path = tmp_path / read_manifest(tmp_path)["arrays"]["coef"]["file"]
+        data = bytearray(coef_path.read_bytes())
+        data[-1] ^= 0xFF
+        coef_path.write_bytes(bytes(data))
+        
+        with pytest.raises(ValueError):
+            load_artifact(tmp_path)
+    
+    def test_feature_schema_mismatch_is_rejected(self, make_model, tmp_path):
+        save_artifact(make_model(), tmp_path)
+        manifest = read_manifest(tmp_path)
+        manifest["features"] = manifest["features"][:3]
+        (tmp_path / MANIFEST_NAME).write_text(json.dumps(manifest), encoding="utf-8")
+        
+        with pytest.raises(ValueError):
+            load_artifact(tmp_path)
+    
+    def test_non_linear_model_is_rejected(self, tmp_path):
+        model = RandomForestClassifier(n_estimators=2).fit(np.random.rand(20, 4), np.arange(20) % 2)
+        
+        with pytest.raises(ValueError):
+            save_artifact(model, tmp_path)
+    
+    def test_missing_artifact(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_artifact(tmp_path / "model_artifact")
+    
+    def test_pickling_reopens_mmap(self, make_model, tmp_path):
+        save_artifact(make_model(), tmp_path)
+        artifact = load_artifact(tmp_path)
+        
+        restored = pickle.loads(pickle.dumps(artifact))
+        
+        assert isinstance(restored.coef_, np.memmap)
+        assert restored.version == artifact.version
+    
+    def test_pickling_keeps_pickled_version(self, make_model, tmp_path):
+        save_artifact(make_model(), tmp_path / "v1", version="v1")
+        pickled = pickle.dumps(load_artifact(tmp_path / "v1"))
+        save_artifact(make_model(flip=True), tmp_path / "v2", version="v2")
+        for file_path in (tmp_path / "v2").iterdir():
+            shutil.copy(file_path, tmp_path / "v1")
+        
+        restored = pickle.loads(pickled)
+        
+        assert restored.version == "v1"
+        assert load_artifact(tmp_path / "v1").version == "v2"
+        np.testing.assert_array_equal(restored.coef_, make_model().coef_)
+    
+    def test_pickled_artifact_refuses_replaced_files(self, make_model, tmp_path):
+        save_artifact(make_model(), tmp_path, version="v1")
+        pickled = pickle.dumps(load_artifact(tmp_path))
+        save_artifact(make_model(flip=True), tmp_path, version="v2")
+        
+        with pytest.raises(FileNotFoundError):
+            pickle.loads(pickled)
+    
+    def test_resave_keeps_loaded_artifact_valid(self, make_model, tmp_path):
+        save_artifact(make_model(), tmp_path, version="v1")
+        first = load_artifact(tmp_path)
+        expected = np.array(first.coef_)
+        
+        save_artifact(make_model(flip=True), tmp_path, version="v2")
+        
+        np.testing.assert_array_equal(first.coef_, expected)
+        assert load_artifact(tmp_path).version == "v2"
+        assert len(list(tmp_path.glob("*.npy"))) == 3
+    
+    def test_prediction_service_compiles_artifact(self, make_model, tmp_path):
+        model = make_model()
+        save_artifact(model, tmp_path, version="v1")
+        service = PredictionService(batching=False)
+        service.set_model(load_artifact(tmp_path))
+        request = PredictionRequest(
+            seller_id=1,
+            is_verified_seller=True,
+            item_id=1,
+            name="Товар",
+            description="Описание товара",
+            category=5,
+            images_qty=3
+        )
+        
+        response = service.predict(request)
+        
+        assert isinstance(service.scorer, LinearScorer)
+        expected = model.predict_proba(service._prepare_features(request))[0, 1]
+        assert response.probability == pytest.approx(expected)
+    
+    def test_get_model_prefers_artifact(self, make_model, tmp_path):
+        save_artifact(make_model(), tmp_path, version="v1")
+        
+        model = get_model(model_path=str(tmp_path / "missing.pkl"), allow_training=False, artifact_path=str(tmp_path))
+        
+        assert model.version == "v1"
+    
+    @pytest.mark.asyncio
+    async def test_registry_picks_up_new_artifact_version(self, make_model, tmp_path):
+        save_artifact(make_model(), tmp_path, version="v1")
+        source = ArtifactModelSource(str(tmp_path))
+        registry = ModelRegistry()
+        service = PredictionService(batching=False, registry=registry)
+        
+        assert await registry.refresh(source) is True
+        save_artifact(make_model(flip=True), tmp_path, version="v2")
+        assert await registry.refresh(source) is True
+        
+        assert service.model_label == "v2"
+    
+    def test_loading_artifact_does_not_import_sklearn(self, make_model, tmp_path):
+        save_artifact(make_model(), tmp_path)
+        
+        output = subprocess.run(
+            [sys.executable, "-c", f"import sys; from model import get_model; get_model(artifact_path={str(tmp_path)!r}); print('sklearn' in sys.modules)"],
+            cwd=src_path, capture_output=True, text=True, check=True
+        ).stdout.split()
+        
+        assert output == ["False"]
@@ -0,0 +1,142 @@
+import asyncio
+import os
+import pytest
+from model import save_model
+from models.predictions import PredictionRequest
+from services.model_registry import ModelRegistry, LocalFileModelSource
+from services.predictions import PredictionService
+
+
+def make_request(is_verified_seller: bool = False) -> PredictionRequest:
+    return PredictionRequest(
+        seller_id=1,
+        is_verified_seller=is_verified_seller,
+        item_id=1,
+        name="Товар",
+        description="Описание товара",
+        category=5,
+        images_qty=3
+    )
+
+
+class TestModelRegistry:
+    
+    def test_services_share_model_and_version(self, make_model):
+        registry = ModelRegistry()
+        direct_service = PredictionService(batching=False, registry=registry)
+        lookup_service = PredictionService(batching=False, scoring_mode="lookup", registry=registry)
+        
+        registry.set_model(make_model(42), label="v1")
+        
+        assert direct_service.model is lookup_service.model
+        assert direct_service.model_label == lookup_service.model_label == "v1"
+        assert lookup_service.lookup_table is not None
+        assert direct_service.predict(make_request()).model_version == "v1"
+        assert lookup_service.predict(make_request()).model_version == "v1"
+    
+    def test_services_with_same_scoring_mode_share_state(self, make_model):
+        registry = ModelRegistry()
+        first = PredictionService(batching=False, scoring_mode="lookup", registry=registry)
+        second = PredictionService(batching=False, scoring_mode="lookup", registry=registry)
+        direct_service = PredictionService(batching=False, registry=registry)
+        
+        registry.set_model(make_model(42), label="v1")
+        
+        assert first.lookup_table is second.lookup_table
+        assert first.scorer is second.scorer
+        assert direct_service.scorer is not first.scorer
+        assert direct_service.lookup_table is None
+    
+    def test_service_attached_later_gets_active_model(self, make_model):
+        registry = ModelRegistry()
+        registry.set_model(make_model(42), label="v1")
+        
+        service = PredictionService(batching=False, registry=registry)
+        
+        assert service.model is registry.model
+        assert service.predict(make_request()).model_version == "v1"
+    
+    def test_setting_model_on_service_updates_all_services(self, make_model):
+        registry = ModelRegistry()
+        first = PredictionService(batching=False, registry=registry)
+        second = PredictionService(batching=False, registry=registry)
+        first.set_model(make_model(42))
+        
+        second.model = None
+        
+        assert first.model is None
+        with pytest.raises(RuntimeError):
+            first.predict(make_request())
+    
+    def test_standalone_services_are_independent(self, make_model):
+        first = PredictionService(batching=False)
+        second = PredictionService(batching=False)
+        
+        first.set_model(make_model(42))
+        
+        assert second.model is None
+    
+    @pytest.mark.asyncio
+    async def test_load_swaps_model_without_failing_requests(self, make_model):
+        registry = ModelRegistry()
+        service = PredictionService(batching=False, scoring_mode="lookup", registry=registry)
+        registry.set_model(make_model(42), label="v1")
+        request = make_request()
+        before = service.predict(request)
+        
+        swap = asyncio.create_task(registry.load(make_model(42, flip=True), label="v2"))
+        responses = []
+        while not swap.done():
+            responses.append(await service.predict_async(request))
+            await asyncio.sleep(0)
+        await swap
+        after = service.predict(request)
+        
+        assert {response.model_version for response in responses} <= {"v1", "v2"}
+        assert after.model_version == "v2"
+        assert after.is_violation != before.is_violation
+        assert registry.swaps == 2
+    
+    @pytest.mark.asyncio
+    async def test_refresh_loads_new_file_version(self, make_model, tmp_path):
+        path = tmp_path / "model.pkl"
+        save_model(make_model(42), str(path))
+        source = LocalFileModelSource(str(path))
+        registry = ModelRegistry()
+        service = PredictionService(batching=False, registry=registry)
+        
+        assert await registry.refresh(source) is True
+        first_version = service.model_label
+        assert await registry.refresh(source) is False
+        
+        save_model(make_model(42, flip=True), str(path))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+        
+        assert await registry.refresh(source) is True
+        assert service.model_label != first_version
+        assert service.predict(make_request()).model_version == service.model_label
+    
+    @pytest.mark.asyncio
+    async def test_broken_file_keeps_current_model(self, make_model, tmp_path):
+        path = tmp_path / "model.pkl"
+        save_model(make_model(42), str(path))
+        source = LocalFileModelSource(str(path))
+        registry = ModelRegistry()
+        service = PredictionService(batching=False, registry=registry)
+        await registry.refresh(source)
+        model = service.model
+        
+        path.write_bytes(b"not a model")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+        
+        registry.start_watching(source, interval=0.01)
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            await registry.stop_watching()
+        
+        assert service.model is model
+        assert registry.last_error is not None
+        assert service.predict(make_request()).model_version == service.model_label
@@ -0,0 +1,98 @@
+import json
+import pytest
+from services.result_broadcaster import ResultBroadcaster, TooManySubscribersError, DROPPED
+from routers import moderation_stream
+from routers.moderation_stream import event_stream
+
+
+class FakeListener:
+    def __init__(self):
+        self.callbacks = []
+    
+    async def subscribe(self, channel, callback):
+        if callback not in self.callbacks:
+            self.callbacks.append(callback)
+    
+    def notify(self, row) -> None:
+        payload = row if isinstance(row, str) else json.dumps(row)
+        for callback in self.callbacks:
+            callback(payload)
+
+
+def make_row(task_id: int, item_id: int, status: str = "completed") -> dict:
+    return {
+        "id": task_id,
+        "item_id": item_id,
+        "status": status,
+        "is_violation": status == "completed",
+        "probability": 0.8 if status == "completed" else None,
+        "error_message": None if status == "completed" else "Ошибка модели"
+    }
+
+
+class TestResultBroadcaster:
+    
+    @pytest.mark.asyncio
+    async def test_fan_out_with_filters(self):
+        listener = FakeListener()
+        broadcaster = ResultBroadcaster(listener=listener, buffer_size=10)
+        everything = await broadcaster.subscribe()
+        by_item = await broadcaster.subscribe(item_id=2)
+        failed_only = await broadcaster.subscribe(status="failed")
+        
+        listener.notify(make_row(1, 1))
+        listener.notify(make_row(2, 2, "failed"))
+        
+        assert [(await everything.get())["id"] for _ in range(2)] == [1, 2]
+        assert (await by_item.get())["id"] == 2
+        assert (await failed_only.get())["id"] == 2
+        assert by_item.queue.empty() and failed_only.queue.empty()
+    
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_is_dropped(self):
+        listener = FakeListener()
+        broadcaster = ResultBroadcaster(listener=listener, buffer_size=3)
+        slow = await broadcaster.subscribe()
+        fast = await broadcaster.subscribe()
+        
+        for task_id in range(1, 5):
+            listener.notify(make_row(task_id, task_id))
+            await fast.get()
+        
+        assert slow.dropped
+        assert await slow.get() is DROPPED
+        assert broadcaster.get_stats()["subscribers"] == 1
+        assert broadcaster.stats["dropped_subscribers"] == 1
+        assert not fast.dropped
+    
+    @pytest.mark.asyncio
+    async def test_subscriber_limit(self):
+        broadcaster = ResultBroadcaster(listener=FakeListener(), max_subscribers=1)
+        await broadcaster.subscribe()
+        with pytest.raises(TooManySubscribersError):
+            await broadcaster.subscribe()
+
+
+class TestModerationStream:
+    
+    @pytest.mark.asyncio
+    async def test_event_stream_formats_events(self, monkeypatch):
+        listener = FakeListener()
+        broadcaster = ResultBroadcaster(listener=listener, buffer_size=10)
+        monkeypatch.setattr(moderation_stream, "result_broadcaster", broadcaster)
+        subscription = await broadcaster.subscribe(item_id=5)
+        stream = event_stream(subscription, heartbeat_seconds=0.05)
+        
+        assert await stream.__anext__() == ": keepalive\n\n"
+        listener.notify(make_row(7, 5))
+        chunk = await stream.__anext__()
+        lines = chunk.strip().split("\n")
+        assert lines[0] == "id: 7"
+        assert lines[1] == "event: result"
+        assert json.loads(lines[2][len("data: "):])["probability"] == 0.8
+        
+        listener.notify("*")
+        assert "event: reset" in await stream.__anext__()
+        
+        await stream.aclose()
+        assert broadcaster.get_stats()["subscribers"] == 0
@@ -0,0 +1,316 @@
+import random
+import time
+import pytest
+import numpy as np
+from unittest.mock import AsyncMock, patch
+from sklearn.linear_model import LogisticRegression
+import database
+from workers import moderation_worker
+from workers.retries import compute_retry_delay
+
+
+def make_item(item_id: int, **overrides) -> dict:
+    item = {
+        "item_id": item_id,
+        "seller_id": 1,
+        "is_verified_seller": item_id % 2 == 0,
+        "name": "Товар",
+        "description": "Описание",
+        "category": 1,
+        "images_qty": 2
+    }
+    item.update(overrides)
+    return item
+
+
+@pytest.fixture
+def trained_service():
+    np.random.seed(42)
+    X = np.random.rand(100, 4)
+    y = (X[:, 0] < 0.3) & (X[:, 1] < 0.2)
+    model = LogisticRegression()
+    model.fit(X, y.astype(int))
+    
+    original_model = moderation_worker.prediction_service.model
+    moderation_worker.prediction_service.set_model(model)
+    yield moderation_worker.prediction_service
+    moderation_worker.prediction_service.model = original_model
+
+
+class TestBatchProcessing:
+    
+    @pytest.mark.asyncio
+    @patch('workers.moderation_worker.send_to_dlq', new_callable=AsyncMock)
+    @patch('workers.moderation_worker.moderation_repository')
+    @patch('workers.moderation_worker.item_repository')
+    async def test_handle_batch_uses_bulk_queries(self, mock_items, mock_tasks, mock_dlq, trained_service):
+        mock_items.get_items_by_item_ids = AsyncMock(return_value={1: make_item(1), 2: make_item(2)})
+        mock_tasks.get_latest_tasks_by_item_ids = AsyncMock(return_value={1: {"id": 11}, 2: {"id": 12}})
+        mock_tasks.update_tasks_bulk = AsyncMock()
+        
+        await moderation_worker.handle_batch([{"item_id": 1}, {"item_id": 2}])
+        
+        mock_items.get_items_by_item_ids.assert_awaited_once()
+        assert sorted(mock_items.get_items_by_item_ids.await_args.args[0]) == [1, 2]
+        mock_tasks.update_tasks_bulk.assert_awaited_once()
+        results = mock_tasks.update_tasks_bulk.await_args.args[0]
+        assert sorted(result["task_id"] for result in results) == [11, 12]
+        assert all(result["status"] == "completed" for result in results)
+        
+        expected = trained_service.predict(moderation_worker.build_prediction_request(make_item(1)))
+        result = next(result for result in results if result["task_id"] == 11)
+        assert result["probability"] == pytest.approx(expected.probability)
+        mock_dlq.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    @patch('workers.moderation_worker.send_to_dlq', new_callable=AsyncMock)
+    @patch('workers.moderation_worker.moderation_repository')
+    @patch('workers.moderation_worker.item_repository')
+    async def test_bad_messages_are_isolated(self, mock_items, mock_tasks, mock_dlq, trained_service):
+        mock_items.get_items_by_item_ids = AsyncMock(return_value={1: make_item(1), 4: make_item(4, name="")})
+        mock_tasks.get_latest_tasks_by_item_ids = AsyncMock(return_value={1: {"id": 11}, 2: {"id": 12}, 4: {"id": 14}})
+        mock_tasks.update_tasks_bulk = AsyncMock()
+        
+        messages = [{"item_id": 1}, {"item_id": 2}, {"item_id": 3}, {"timestamp": "x"}, {"item_id": 4}]
+        await moderation_worker.handle_batch(messages)
+        
+        results = {result["task_id"]: result for result in mock_tasks.update_tasks_bulk.await_args.args[0]}
+        assert results[11]["status"] == "completed"
+        assert results[12]["status"] == "failed"
+        assert "не найдено" in results[12]["error_message"]
+        assert results[14]["status"] == "failed"
+        
+        dlq_messages = [call.args[0] for call in mock_dlq.await_args_list]
+        assert {"item_id": 1} not in dlq_messages
+        assert {"item_id": 2} in dlq_messages
+        assert {"item_id": 3} in dlq_messages
+        assert {"timestamp": "x"} in dlq_messages
+        assert {"item_id": 4} in dlq_messages
+    
+    @pytest.mark.asyncio
+    @patch('workers.moderation_worker.handle_message', new_callable=AsyncMock)
+    @patch('workers.moderation_worker.send_to_dlq', new_callable=AsyncMock)
+    @patch('workers.moderation_worker.moderation_repository')
+    @patch('workers.moderation_worker.item_repository')
+    async def test_model_error_falls_back_to_single_processing(self, mock_items, mock_tasks, mock_dlq, mock_process):
+        original_model = moderation_worker.prediction_service.model
+        moderation_worker.prediction_service.model = None
+        mock_items.get_items_by_item_ids = AsyncMock(return_value={1: make_item(1), 2: make_item(2)})
+        mock_tasks.get_latest_tasks_by_item_ids = AsyncMock(return_value={1: {"id": 11}, 2: {"id": 12}})
+        mock_tasks.update_tasks_bulk = AsyncMock()
+        
+        try:
+            await moderation_worker.handle_batch([{"item_id": 1}, {"item_id": 2}])
+        finally:
+            moderation_worker.prediction_service.model = original_model
+        
+        assert [call.args[0] for call in mock_process.await_args_list] == [{"item_id": 1}, {"item_id": 2}]
+        mock_dlq.assert_not_awaited()
+
+
+class TestConnectionScope:
+    
+    @pytest.fixture
+    def predict_spy(self, trained_service, monkeypatch):
+        units = []
+        predict_async = trained_service.predict_async
+        predict_batch_async = trained_service.predict_batch_async
+        
+        async def spy_predict(request):
+            units.append(database._active_unit())
+            return await predict_async(request)
+        
+        async def spy_predict_batch(requests):
+            units.append(database._active_unit())
+            return await predict_batch_async(requests)
+        
+        monkeypatch.setattr(trained_service, "predict_async", spy_predict)
+        monkeypatch.setattr(trained_service, "predict_batch_async", spy_predict_batch)
+        return units
+    
+    @pytest.mark.asyncio
+    @patch('workers.moderation_worker.send_to_dlq', new_callable=AsyncMock)
+    @patch('workers.moderation_worker.moderation_repository')
+    async def test_message_prediction_holds_no_connection(self, mock_tasks, mock_dlq, predict_spy):
+        mock_tasks.get_task_for_processing = AsyncMock(
+            return_value=({"id": 55, "item_id": 5, "status": "pending"}, make_item(5))
+        )
+        mock_tasks.update_task_completed = AsyncMock()
+        
+        await moderation_worker.handle_message({"item_id": 5, "task_id": 55})
+        
+        assert predict_spy == [None]
+        mock_tasks.update_task_completed.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    @patch('workers.moderation_worker.send_to_dlq', new_callable=AsyncMock)
+    @patch('workers.moderation_worker.moderation_repository')
+    @patch('workers.moderation_worker.item_repository')
+    async def test_batch_prediction_holds_no_connection(self, mock_items, mock_tasks, mock_dlq, predict_spy):
+        mock_items.get_items_by_item_ids = AsyncMock(return_value={1: make_item(1), 2: make_item(2)})
+        mock_tasks.get_latest_tasks_by_item_ids = AsyncMock(return_value={1: {"id": 11}, 2: {"id": 12}})
+        mock_tasks.update_tasks_bulk = AsyncMock()
+        
+        await moderation_worker.handle_batch([{"item_id": 1}, {"item_id": 2}])
+        
+        assert predict_spy == [None]
+        mock_tasks.update_tasks_bulk.assert_awaited_once()
+
+
+class TestDelayedRetries:
+    
+    def setup_method(self):
+        self.item_patch = patch('workers.moderation_worker.item_repository')
+        self.task_patch = patch('workers.moderation_worker.moderation_repository')
+        self.dlq_patch = patch('workers.moderation_worker.send_to_dlq', new_callable=AsyncMock)
+        self.mock_items = self.item_patch.start()
+        self.mock_tasks = self.task_patch.start()
+        self.mock_dlq = self.dlq_patch.start()
+        self.mock_tasks.get_task_for_processing = AsyncMock(
+            side_effect=lambda task_id=None, item_id=None: (
+                {"id": item_id + 10, "item_id": item_id, "status": "pending"},
+                make_item(item_id)
+            )
+        )
+        self.mock_tasks.update_task_completed = AsyncMock()
+        self.mock_tasks.update_task_failed = AsyncMock()
+    
+    def teardown_method(self):
+        patch.stopall()
+    
+    def test_retry_delay_is_exponential_with_cap(self):
+        rng = random.Random(0)
+        for retry_count in range(10):
+            ceiling = min(30.0, 1.0 * 2 ** retry_count)
+            delay = compute_retry_delay(retry_count, 1.0, 30.0, rng)
+            assert ceiling / 2 <= delay <= ceiling
+    
+    @pytest.mark.asyncio
+    async def test_retry_does_not_block_other_messages(self, trained_service, monkeypatch):
+        monkeypatch.setattr('workers.moderation_worker.RETRY_DELAY_SECONDS', 0.2)
+        original_predict = trained_service.predict_async
+        calls = []
+        
+        async def flaky_predict(request):
+            calls.append(request.item_id)
+            if request.item_id == 1 and calls.count(1) == 1:
+                raise RuntimeError("Модель не загружена")
+            return await original_predict(request)
+        
+        monkeypatch.setattr(trained_service, 'predict_async', flaky_predict)
+        
+        started = time.perf_counter()
+        retry = await moderation_worker.handle_message({"item_id": 1})
+        await moderation_worker.handle_message({"item_id": 2})
+        assert time.perf_counter() - started < 0.1
+        assert retry is not None
+        assert moderation_worker.retry_scheduler.pending == 1
+        self.mock_tasks.update_task_completed.assert_awaited_once()
+        assert self.mock_tasks.update_task_completed.await_args.args[0] == 12
+        
+        assert await retry is None
+        assert calls == [1, 2, 1]
+        assert self.mock_tasks.update_task_completed.await_count == 2
+        await moderation_worker.retry_scheduler.stop()
+    
+    @pytest.mark.asyncio
+    async def test_retry_count_travels_with_message_until_dlq(self, trained_service, monkeypatch):
+        monkeypatch.setattr('workers.moderation_worker.RETRY_DELAY_SECONDS', 0.01)
+        seen_retry_counts = []
+        original_handler = moderation_worker.retry_scheduler.handler
+        
+        async def recording_handler(message_value):
+            seen_retry_counts.append(message_value["retry_count"])
+            return await original_handler(message_value)
+        
+        async def failing_predict(request):
+            raise RuntimeError("Модель не загружена")
+        
+        monkeypatch.setattr(moderation_worker.retry_scheduler, 'handler', recording_handler)
+        monkeypatch.setattr(trained_service, 'predict_async', failing_predict)
+        
+        await moderation_worker.process_message_to_completion({"item_id": 3})
+        await moderation_worker.retry_scheduler.stop()
+        
+        assert seen_retry_counts == list(range(1, moderation_worker.MAX_RETRIES))
+        self.mock_tasks.update_task_failed.assert_awaited_once()
+        self.mock_dlq.assert_awaited_once()
+        dlq_message, _, retry_count = self.mock_dlq.await_args.args
+        assert dlq_message["retry_count"] == moderation_worker.MAX_RETRIES - 1
+        assert retry_count == moderation_worker.MAX_RETRIES - 1
+
+
+class TestTaskAddressedMessages:
+    
+    @pytest.mark.asyncio
+    @patch('workers.moderation_worker.send_to_dlq', new_callable=AsyncMock)
+    @patch('workers.moderation_worker.moderation_repository')
+    async def test_message_with_task_id_uses_single_lookup(self, mock_tasks, mock_dlq, trained_service):
+        mock_tasks.get_task_for_processing = AsyncMock(
+            return_value=({"id": 55, "item_id": 5, "status": "pending"}, make_item(5))
+        )
+        mock_tasks.update_task_completed = AsyncMock()
+        
+        await moderation_worker.handle_message({"schema_version": 2, "item_id": 5, "task_id": 55})
+        
+        mock_tasks.get_task_for_processing.assert_awaited_once_with(task_id=55, item_id=5)
+        mock_tasks.update_task_completed.assert_awaited_once()
+        assert mock_tasks.update_task_completed.await_args.args[0] == 55
+        mock_tasks.get_tasks_by_item_id.assert_not_called()
+        mock_dlq.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    @patch('workers.moderation_worker.send_to_dlq', new_callable=AsyncMock)
+    @patch('workers.moderation_worker.moderation_repository')
+    async def test_already_processed_task_is_skipped(self, mock_tasks, mock_dlq, trained_service):
+        mock_tasks.get_task_for_processing = AsyncMock(
+            return_value=({"id": 55, "item_id": 5, "status": "completed"}, make_item(5))
+        )
+        mock_tasks.update_task_completed = AsyncMock()
+        
+        await moderation_worker.handle_message({"schema_version": 2, "item_id": 5, "task_id": 55})
+        
+        mock_tasks.update_task_completed.assert_not_awaited()
+        mock_dlq.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    @patch('workers.moderation_worker.send_to_dlq', new_callable=AsyncMock)
+    @patch('workers.moderation_worker.moderation_repository')
+    async def test_failure_updates_addressed_task_without_extra_lookup(self, mock_tasks, mock_dlq, trained_service):
+        mock_tasks.get_task_for_processing = AsyncMock(
+            return_value=({"id": 55, "item_id": 5, "status": "pending"}, make_item(5, name=""))
+        )
+        mock_tasks.update_task_failed = AsyncMock()
+        mock_tasks.get_latest_task_by_item_id = AsyncMock()
+        
+        await moderation_worker.handle_message({"schema_version": 2, "item_id": 5, "task_id": 55})
+        
+        mock_tasks.update_task_failed.assert_awaited_once()
+        assert mock_tasks.update_task_failed.await_args.args[0] == 55
+        mock_tasks.get_latest_task_by_item_id.assert_not_awaited()
+        mock_dlq.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    @patch('workers.moderation_worker.send_to_dlq', new_callable=AsyncMock)
+    @patch('workers.moderation_worker.moderation_repository')
+    @patch('workers.moderation_worker.item_repository')
+    async def test_batch_mixes_addressed_and_legacy_messages(self, mock_items, mock_tasks, mock_dlq, trained_service):
+        mock_tasks.get_tasks_for_processing = AsyncMock(return_value={
+            21: ({"id": 21, "item_id": 1, "status": "pending"}, make_item(1)),
+            22: ({"id": 22, "item_id": 2, "status": "completed"}, make_item(2))
+        })
+        mock_items.get_items_by_item_ids = AsyncMock(return_value={3: make_item(3)})
+        mock_tasks.get_latest_tasks_by_item_ids = AsyncMock(return_value={3: {"id": 13}})
+        mock_tasks.update_tasks_bulk = AsyncMock()
+        
+        await moderation_worker.handle_batch([
+            {"schema_version": 2, "item_id": 1, "task_id": 21},
+            {"schema_version": 2, "item_id": 2, "task_id": 22},
+            {"item_id": 3}
+        ])
+        
+        assert sorted(mock_tasks.get_tasks_for_processing.await_args.args[0]) == [21, 22]
+        assert mock_items.get_items_by_item_ids.await_args.args[0] == [3]
+        results = mock_tasks.update_tasks_bulk.await_args.args[0]
+        assert sorted(result["task_id"] for result in results) == [13, 21]
+        mock_dlq.assert_not_awaited()
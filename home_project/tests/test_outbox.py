@@ -0,0 +1,101 @@
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, patch
+from fastapi import status
+from conftest import client, db_pool
+from repositories.users import UserRepository
+from repositories.items import ItemRepository
+from repositories.outbox import OutboxRepository
+from clients.kafka import MODERATION_TOPIC
+from workers import outbox_relay
+
+
+async def create_item(seller_id: int, item_id: int) -> None:
+    await UserRepository().create_user(seller_id=seller_id, is_verified_seller=False)
+    await ItemRepository().create_item(
+        item_id=item_id,
+        seller_id=seller_id,
+        name="Товар",
+        description="Описание",
+        category=1,
+        images_qty=2
+    )
+
+
+class FakeProducer:
+    def __init__(self):
+        self.sent = []
+    
+    async def send(self, topic, value):
+        self.sent.append((topic, value))
+        delivery = asyncio.get_running_loop().create_future()
+        delivery.set_result(None)
+        return delivery
+
+
+class TestOutbox:
+    
+    @pytest.mark.asyncio
+    @patch('routers.async_predict.send_moderation_request')
+    async def test_async_predict_writes_outbox(self, mock_send, client, db_pool, monkeypatch):
+        monkeypatch.setattr("routers.async_predict.OUTBOX_ENABLED", True)
+        await create_item(301, 401)
+        
+        response = client.post("/async_predict?item_id=401")
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        task_id = response.json()["task_id"]
+        mock_send.assert_not_called()
+        
+        async with db_pool.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT task_id, topic, published_at FROM moderation_outbox WHERE task_id = $1",
+                task_id
+            )
+        assert row["task_id"] == task_id
+        assert row["topic"] == MODERATION_TOPIC
+        assert row["published_at"] is None
+    
+    @pytest.mark.asyncio
+    async def test_relay_publishes_and_marks_sent(self, client, db_pool, monkeypatch):
+        monkeypatch.setattr("routers.async_predict.OUTBOX_ENABLED", True)
+        task_ids = []
+        for index in range(3):
+            await create_item(310 + index, 410 + index)
+            response = client.post(f"/async_predict?item_id={410 + index}")
+            assert response.status_code == status.HTTP_202_ACCEPTED
+            task_ids.append(response.json()["task_id"])
+        
+        fake_producer = FakeProducer()
+        monkeypatch.setattr(outbox_relay, "get_producer", AsyncMock(return_value=fake_producer))
+        
+        assert await outbox_relay.relay_once() == 3
+        sent = [value for _, value in fake_producer.sent if value["task_id"] in task_ids]
+        assert [value["item_id"] for value in sent] == [410, 411, 412]
+        assert await OutboxRepository().count_unpublished() == 0
+        assert await outbox_relay.relay_once() == 0
+    
+    @pytest.mark.asyncio
+    async def test_failed_publish_keeps_rows(self, client, db_pool, monkeypatch):
+        monkeypatch.setattr("routers.async_predict.OUTBOX_ENABLED", True)
+        await create_item(320, 420)
+        assert client.post("/async_predict?item_id=420").status_code == status.HTTP_202_ACCEPTED
+        
+        async def failing_publish(records):
+            raise Exception("broker unavailable")
+        
+        with pytest.raises(Exception):
+            await OutboxRepository().publish_pending(10, failing_publish)
+        assert await OutboxRepository().count_unpublished() == 1
+    
+    @pytest.mark.asyncio
+    async def test_outbox_rows_removed_with_task(self, client, db_pool, monkeypatch):
+        monkeypatch.setattr("routers.async_predict.OUTBOX_ENABLED", True)
+        await create_item(330, 430)
+        response = client.post("/async_predict?item_id=430")
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        task_id = response.json()["task_id"]
+        
+        async with db_pool.acquire() as conn:
+            await conn.execute("DELETE FROM items WHERE item_id = 430")
+            remaining = await conn.fetchval("SELECT COUNT(*) FROM moderation_outbox WHERE task_id = $1", task_id)
+        assert remaining == 0
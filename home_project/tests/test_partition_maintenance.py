@@ -0,0 +1,78 @@
+import gzip
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock
+from repositories.partitions import partition_month, _quote_partition
+from workers import partition_maintenance
+from workers.partition_maintenance import maintain_once, retention_cutoff
+
+
+class FakePartitionsRepository:
+    def __init__(self, partitions):
+        self.partitions = partitions
+        self.ensure_partitions = AsyncMock(return_value=["moderation_results_p202610"])
+        self.detach_partition = AsyncMock()
+        self.drop_partition = AsyncMock()
+    
+    async def list_partitions(self):
+        return self.partitions
+    
+    async def archive_partition(self, name, path):
+        with gzip.open(path, "wb") as archive:
+            archive.write(b"id,item_id\n1,1\n")
+        return 1
+
+
+def make_partition(name: str, attached: bool = True, detach_pending: bool = False) -> dict:
+    return {
+        "name": name,
+        "month": partition_month(name),
+        "attached": attached,
+        "detach_pending": detach_pending
+    }
+
+
+class TestPartitionMaintenance:
+    
+    def test_retention_cutoff(self):
+        assert retention_cutoff(date(2026, 10, 18), 6) == date(2026, 4, 1)
+        assert retention_cutoff(date(2026, 2, 1), 3) == date(2025, 11, 1)
+    
+    def test_partition_names_are_validated(self):
+        assert partition_month("moderation_results_p202603") == date(2026, 3, 1)
+        with pytest.raises(ValueError):
+            _quote_partition("moderation_results; DROP TABLE items")
+    
+    @pytest.mark.asyncio
+    async def test_old_partitions_are_archived(self, monkeypatch, tmp_path):
+        repository = FakePartitionsRepository([
+            make_partition("moderation_results_p202602"),
+            make_partition("moderation_results_p202603", attached=False, detach_pending=True),
+            make_partition("moderation_results_p202604"),
+            make_partition("moderation_results_p202610")
+        ])
+        monkeypatch.setattr(partition_maintenance, "partitions_repository", repository)
+        monkeypatch.setattr(partition_maintenance, "MODERATION_RESULTS_RETENTION_MONTHS", 6)
+        monkeypatch.setattr(partition_maintenance, "MODERATION_RESULTS_ARCHIVE_DIR", str(tmp_path))
+        
+        result = await maintain_once(today=date(2026, 10, 18))
+        
+        assert result["archived"] == ["moderation_results_p202602", "moderation_results_p202603"]
+        repository.ensure_partitions.assert_awaited_once()
+        assert repository.detach_partition.await_args_list[0].kwargs == {"finalize": False}
+        assert repository.detach_partition.await_args_list[1].kwargs == {"finalize": True}
+        assert repository.drop_partition.await_count == 2
+        with gzip.open(tmp_path / "moderation_results_p202602.csv.gz") as archive:
+            assert archive.read().startswith(b"id,item_id")
+        assert not list(tmp_path.glob("*.tmp"))
+    
+    @pytest.mark.asyncio
+    async def test_retention_disabled(self, monkeypatch, tmp_path):
+        repository = FakePartitionsRepository([make_partition("moderation_results_p201001")])
+        monkeypatch.setattr(partition_maintenance, "partitions_repository", repository)
+        monkeypatch.setattr(partition_maintenance, "MODERATION_RESULTS_RETENTION_MONTHS", 0)
+        
+        result = await maintain_once(today=date(2026, 10, 18))
+        
+        assert result["archived"] == []
+        repository.drop_partition.assert_not_awaited()
@@ -0,0 +1,96 @@
+import pytest
+import numpy as np
+from fastapi import status
+from sklearn.linear_model import LogisticRegression
+from conftest import client
+from models.predictions import PredictionRequest
+from routers.predictions import prediction_service
+
+
+@pytest.fixture
+def trained_model():
+    np.random.seed(42)
+    X = np.random.rand(100, 4)
+    y = (X[:, 0] < 0.3) & (X[:, 1] < 0.2)
+    y = y.astype(int)
+    model = LogisticRegression()
+    model.fit(X, y)
+
+    original_model = prediction_service.model
+    prediction_service.set_model(model)
+    yield model
+    prediction_service.model = original_model
+
+
+def make_payload(item_id: int, **overrides) -> dict:
+    payload = {
+        "seller_id": 12345,
+        "is_verified_seller": item_id % 2 == 0,
+        "item_id": item_id,
+        "name": "Товар",
+        "description": "Описание" * (item_id % 30),
+        "category": item_id % 150,
+        "images_qty": item_id % 12
+    }
+    payload.update(overrides)
+    return payload
+
+
+class TestPredictBatchEndpoint:
+
+    def test_predict_batch_success(self, client, trained_model):
+        payload = [make_payload(item_id) for item_id in range(1, 51)]
+        response = client.post("/predict_batch", json=payload)
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert len(results) == 50
+
+        for index, result in enumerate(results):
+            expected = prediction_service.predict(PredictionRequest(**payload[index]))
+            assert result["index"] == index
+            assert result["item_id"] == payload[index]["item_id"]
+            assert result["error"] is None
+            assert result["is_violation"] == expected.is_violation
+            assert result["probability"] == pytest.approx(expected.probability)
+
+    def test_predict_batch_reports_item_errors(self, client, trained_model):
+        payload = [
+            make_payload(1),
+            make_payload(2, name=""),
+            make_payload(3, images_qty=-1),
+            "not_an_object",
+            make_payload(5)
+        ]
+        response = client.post("/predict_batch", json=payload)
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert [result["index"] for result in results] == [0, 1, 2, 3, 4]
+
+        assert results[0]["error"] is None and results[0]["probability"] is not None
+        assert "name" in results[1]["error"]
+        assert results[1]["item_id"] == 2
+        assert results[1]["probability"] is None
+        assert "images_qty" in results[2]["error"]
+        assert results[3]["error"] is not None
+        assert results[3]["item_id"] is None
+        assert results[4]["error"] is None and results[4]["probability"] is not None
+
+    def test_predict_batch_empty(self, client, trained_model):
+        response = client.post("/predict_batch", json=[])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"] == []
+
+    def test_predict_batch_too_large(self, client, trained_model, monkeypatch):
+        monkeypatch.setattr("routers.predictions.PREDICT_BATCH_MAX_ITEMS", 3)
+        payload = [make_payload(item_id) for item_id in range(1, 5)]
+        response = client.post("/predict_batch", json=payload)
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+    def test_predict_batch_model_not_loaded(self, client):
+        original_model = prediction_service.model
+        prediction_service.model = None
+        try:
+            response = client.post("/predict_batch", json=[make_payload(1)])
+            assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        finally:
+            prediction_service.model = original_model
@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import patch
+from models.predictions import PredictionRequest
+from services import predictions
+from services.predictions import PredictionService
+from services.cache import LRUCache
+
+
+def make_request(item_id: int, description: str = "Описание", images_qty: int = 3) -> PredictionRequest:
+    return PredictionRequest(
+        seller_id=1,
+        is_verified_seller=True,
+        item_id=item_id,
+        name="Товар",
+        description=description,
+        category=5,
+        images_qty=images_qty
+    )
+
+
+class TestPredictionCache:
+    
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self, monkeypatch):
+        monkeypatch.setattr(predictions, "prediction_cache", LRUCache(max_size=1000))
+        monkeypatch.setattr(predictions, "prediction_cache_stats", {})
+    
+    @pytest.mark.asyncio
+    async def test_same_features_hit_cache(self, make_model):
+        service = PredictionService(batching=False, cache=True, name="simple_predict")
+        service.set_model(make_model(42))
+        
+        with patch.object(service, "predict", wraps=service.predict) as predict:
+            first = await service.predict_async(make_request(1))
+            second = await service.predict_async(make_request(2))
+            third = await service.predict_async(make_request(3, images_qty=7))
+        
+        assert first == second
+        assert third == service.predict(make_request(3, images_qty=7))
+        assert predict.call_count == 2
+        stats = predictions.get_prediction_cache_stats()["endpoints"]["simple_predict"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_batch_uses_cache_per_item(self, make_model):
+        service = PredictionService(batching=False, cache=True, name="predict")
+        service.set_model(make_model(42))
+        await service.predict_async(make_request(1))
+        
+        requests = [make_request(1), make_request(2, images_qty=8), make_request(3, description="")]
+        with patch.object(service, "predict_batch", wraps=service.predict_batch) as predict_batch:
+            results = await service.predict_batch_async(requests, endpoint="predict_batch")
+        
+        assert results[0] == service.predict(requests[0])
+        assert results[1:] == service.predict_batch(requests[1:])
+        assert len(predict_batch.call_args.args[0]) == 2
+        stats = predictions.get_prediction_cache_stats()["endpoints"]
+        assert stats["predict_batch"]["hits"] == 1
+        assert stats["predict"]["misses"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_model_swap_invalidates_entries(self, make_model):
+        service = PredictionService(batching=False, cache=True)
+        first_model = make_model(42)
+        second_model = make_model(7)
+        service.set_model(first_model)
+        await service.predict_async(make_request(1))
+        assert len(predictions.prediction_cache) == 1
+        
+        service.set_model(second_model)
+        assert len(predictions.prediction_cache) == 0
+        
+        result = await service.predict_async(make_request(1))
+        expected_probability = second_model.predict_proba(service._prepare_features(make_request(1)))[0, 1]
+        assert result.probability == pytest.approx(expected_probability)
+    
+    @pytest.mark.asyncio
+    async def test_cache_disabled(self, make_model):
+        service = PredictionService(batching=False, cache=False)
+        service.set_model(make_model(42))
+        await service.predict_async(make_request(1))
+        await service.predict_async(make_request(1))
+        assert len(predictions.prediction_cache) == 0
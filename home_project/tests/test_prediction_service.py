@@ -101,3 +101,21 @@ class TestPredictionService:
         assert features[0][1] == 1.0
         assert features[0][2] == 1.0
         assert features[0][3] == 1.0
+    
+    def test_prepare_features_batch_matches_single(self):
+        requests = [
+            PredictionRequest(
+                seller_id=1,
+                is_verified_seller=i % 2 == 0,
+                item_id=100 + i,
+                name="Товар",
+                description="A" * (i * 97),
+                category=i * 13,
+                images_qty=i
+            )
+            for i in range(20)
+        ]
+        features = self.service._prepare_features_batch(requests)
+        assert features.shape == (20, 4)
+        for row, request in zip(features, requests):
+            assert np.array_equal(row, self.service._prepare_features(request)[0])
@@ -1,4 +1,6 @@
 import pytest
+import asyncio
+import json
 import sys
 from pathlib import Path
 
@@ -8,6 +10,8 @@ sys.path.insert(0, str(src_path))
 
 from repositories.users import UserRepository
 from repositories.items import ItemRepository
+from repositories.moderation_results import ModerationResultsRepository, MODERATION_RESULTS_CHANNEL
+from repositories.partitions import ModerationPartitionsRepository
 
 
 class TestUserRepository:
@@ -112,3 +116,211 @@ class TestItemRepository:
         item = await repo.get_item_by_item_id(102)
         assert item is not None
         assert item["is_verified_seller"] is True
+    
+    @pytest.mark.asyncio
+    async def test_get_items_by_item_ids(self, db_pool):
+        user_repo = UserRepository()
+        await user_repo.create_user(seller_id=13, is_verified_seller=True)
+        
+        repo = ItemRepository()
+        for item_id in (103, 104):
+            await repo.create_item(
+                item_id=item_id,
+                seller_id=13,
+                name="Товар",
+                description="Описание",
+                category=1,
+                images_qty=1
+            )
+        items = await repo.get_items_by_item_ids([103, 104, 99999])
+        assert set(items.keys()) == {103, 104}
+        assert items[103]["is_verified_seller"] is True
+
+
+class TestBulkUpsert:
+    
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_users_and_items(self, db_pool):
+        user_repo = UserRepository()
+        item_repo = ItemRepository()
+        
+        result = await user_repo.upsert_users_bulk([(50, False), (51, True), (50, True)])
+        assert result == {"upserted": 2, "skipped": 0}
+        assert (await user_repo.get_user_by_seller_id(50))["is_verified_seller"] is True
+        
+        records = [
+            (500, 50, "Товар 1", "Описание", 1, 2),
+            (501, 51, "Товар 2", "", 2, 0),
+            (502, 999, "Без продавца", "Описание", 1, 1)
+        ]
+        result = await item_repo.upsert_items_bulk(records)
+        assert result == {"upserted": 2, "skipped": 1}
+        assert (await item_repo.get_item_by_item_id(501))["is_verified_seller"] is True
+        assert await item_repo.get_item_by_item_id(502) is None
+        
+        before = await item_repo.get_item_by_item_id(500)
+        result = await item_repo.upsert_items_bulk([(500, 50, "Товар 1", "Описание", 1, 2), (501, 51, "Новое имя", "", 2, 0)])
+        assert result == {"upserted": 1, "skipped": 0}
+        assert (await item_repo.get_item_by_item_id(500))["updated_at"] == before["updated_at"]
+        assert (await item_repo.get_item_by_item_id(501))["name"] == "Новое имя"
+
+
+class TestModerationResultsRepository:
+    
+    @pytest.mark.asyncio
+    async def test_bulk_task_lookup_and_update(self, db_pool):
+        await UserRepository().create_user(seller_id=20, is_verified_seller=False)
+        item_repo = ItemRepository()
+        for item_id in (300, 301):
+            await item_repo.create_item(
+                item_id=item_id,
+                seller_id=20,
+                name="Товар",
+                description="Описание",
+                category=1,
+                images_qty=1
+            )
+        
+        repo = ModerationResultsRepository()
+        await repo.create_task(300)
+        latest = await repo.create_task(300)
+        other = await repo.create_task(301)
+        
+        tasks = await repo.get_latest_tasks_by_item_ids([300, 301])
+        assert tasks[300]["id"] == latest["id"]
+        assert tasks[301]["id"] == other["id"]
+        
+        await repo.update_tasks_bulk([
+            {"task_id": latest["id"], "status": "completed", "is_violation": True, "probability": 0.9},
+            {"task_id": other["id"], "status": "failed", "error_message": "Объявление не найдено"}
+        ])
+        
+        completed = await repo.get_task_by_id(latest["id"])
+        assert completed["status"] == "completed"
+        assert completed["is_violation"] is True
+        assert completed["probability"] == 0.9
+        
+        failed = await repo.get_task_by_id(other["id"])
+        assert failed["status"] == "failed"
+        assert failed["error_message"] == "Объявление не найдено"
+        assert failed["processed_at"] is not None
+    
+    @pytest.mark.asyncio
+    async def test_updates_notify_listeners(self, db_pool):
+        await UserRepository().create_user(seller_id=21, is_verified_seller=False)
+        await ItemRepository().create_item(
+            item_id=310,
+            seller_id=21,
+            name="Товар",
+            description="Описание",
+            category=1,
+            images_qty=1
+        )
+        repo = ModerationResultsRepository()
+        completed_task = await repo.create_task(310)
+        failed_task = await repo.create_task(310)
+        
+        notifications = asyncio.Queue()
+        async with db_pool.acquire() as conn:
+            await conn.add_listener(
+                MODERATION_RESULTS_CHANNEL,
+                lambda connection, pid, channel, payload: notifications.put_nowait(json.loads(payload))
+            )
+            await repo.update_task_completed(completed_task["id"], False, 0.25)
+            await repo.update_task_failed(failed_task["id"], "Ошибка модели")
+            
+            first = await asyncio.wait_for(notifications.get(), timeout=5)
+            second = await asyncio.wait_for(notifications.get(), timeout=5)
+        
+        assert first["id"] == completed_task["id"]
+        assert first["status"] == "completed"
+        assert first["probability"] == 0.25
+        assert second["id"] == failed_task["id"]
+        assert second["status"] == "failed"
+        assert second["error_message"] == "Ошибка модели"
+    
+    @pytest.mark.asyncio
+    async def test_get_task_for_processing(self, db_pool):
+        await UserRepository().create_user(seller_id=22, is_verified_seller=True)
+        await ItemRepository().create_item(
+            item_id=320,
+            seller_id=22,
+            name="Товар",
+            description="Описание",
+            category=3,
+            images_qty=4
+        )
+        repo = ModerationResultsRepository()
+        older = await repo.create_task(320)
+        latest = await repo.create_task(320)
+        
+        task, item = await repo.get_task_for_processing(task_id=older["id"], item_id=320)
+        assert task["id"] == older["id"]
+        assert task["status"] == "pending"
+        assert item["item_id"] == 320
+        assert item["is_verified_seller"] is True
+        
+        task, item = await repo.get_task_for_processing(item_id=320)
+        assert task["id"] == latest["id"]
+        
+        task, item = await repo.get_task_for_processing(task_id=999999)
+        assert task is None and item is None
+        
+        tasks = await repo.get_tasks_for_processing([older["id"], latest["id"]])
+        assert set(tasks) == {older["id"], latest["id"]}
+        assert tasks[latest["id"]][1]["images_qty"] == 4
+    
+    @pytest.mark.asyncio
+    async def test_tasks_are_stored_in_monthly_partitions(self, db_pool):
+        await UserRepository().create_user(seller_id=23, is_verified_seller=False)
+        await ItemRepository().create_item(
+            item_id=330,
+            seller_id=23,
+            name="Товар",
+            description="Описание",
+            category=1,
+            images_qty=1
+        )
+        partitions_repo = ModerationPartitionsRepository()
+        ensured = await partitions_repo.ensure_partitions(1)
+        task = await ModerationResultsRepository().create_task(330)
+        
+        async with db_pool.acquire() as conn:
+            partition = await conn.fetchval(
+                "SELECT tableoid::regclass::text FROM moderation_results WHERE id = $1",
+                task["id"]
+            )
+        assert partition == ensured[0]
+        
+        listed = {partition["name"]: partition for partition in await partitions_repo.list_partitions()}
+        assert listed[ensured[0]]["attached"] is True
+        assert listed[ensured[1]]["detach_pending"] is False
+    
+    @pytest.mark.asyncio
+    async def test_claim_stuck_tasks(self, db_pool):
+        await UserRepository().create_user(seller_id=24, is_verified_seller=False)
+        await ItemRepository().create_item(
+            item_id=340,
+            seller_id=24,
+            name="Товар",
+            description="Описание",
+            category=1,
+            images_qty=1
+        )
+        repo = ModerationResultsRepository()
+        stuck = [await repo.create_task(340) for _ in range(3)]
+        fresh = await repo.create_task(340)
+        await repo.update_task_completed(stuck[2]["id"], False, 0.1)
+        async with db_pool.acquire() as conn:
+            await conn.execute(
+                "UPDATE moderation_results SET created_at = created_at - INTERVAL '10 minutes' WHERE id = ANY($1::int[])",
+                [task["id"] for task in stuck]
+            )
+        
+        first, second = await asyncio.gather(repo.claim_stuck_tasks(60, 10), repo.claim_stuck_tasks(60, 10))
+        claimed = first + second
+        assert sorted(task["id"] for task in claimed) == [stuck[0]["id"], stuck[1]["id"]]
+        assert all(task["sweep_attempts"] == 1 for task in claimed)
+        assert fresh["id"] not in {task["id"] for task in claimed}
+        
+        assert await repo.claim_stuck_tasks(60, 10) == []
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.ensemble import RandomForestClassifier
+from services.scorers import compile_scorer, LinearScorer, SklearnScorer
+from services.predictions import PredictionService
+
+
+def make_dataset():
+    np.random.seed(42)
+    X = np.random.rand(500, 4)
+    y = (X[:, 0] < 0.3) & (X[:, 1] < 0.2)
+    return X, y.astype(int)
+
+
+class TestCompiledScorer:
+    
+    def test_logistic_regression_is_compiled(self):
+        X, y = make_dataset()
+        model = LogisticRegression().fit(X, y)
+        scorer = compile_scorer(model)
+        assert isinstance(scorer, LinearScorer)
+        assert scorer.compiled is True
+    
+    @pytest.mark.parametrize("model", [
+        LogisticRegression(),
+        LogisticRegression(C=0.01, fit_intercept=False),
+        SGDClassifier(loss="log_loss", random_state=0),
+    ])
+    def test_parity_with_sklearn(self, model):
+        X, y = make_dataset()
+        model.fit(X, y)
+        scorer = compile_scorer(model)
+        
+        features = np.vstack([X, np.random.default_rng(1).random((200, 4)), np.eye(4), np.zeros((1, 4))])
+        labels, probabilities = scorer.score(features)
+        
+        assert isinstance(scorer, LinearScorer)
+        np.testing.assert_allclose(probabilities, model.predict_proba(features)[:, 1], rtol=0, atol=1e-12)
+        np.testing.assert_array_equal(labels, model.predict(features))
+    
+    def test_non_linear_model_falls_back_to_sklearn(self):
+        X, y = make_dataset()
+        model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+        scorer = compile_scorer(model)
+        assert isinstance(scorer, SklearnScorer)
+        assert scorer.compiled is False
+        
+        labels, probabilities = scorer.score(X[:10])
+        np.testing.assert_allclose(probabilities, model.predict_proba(X[:10])[:, 1])
+        np.testing.assert_array_equal(labels, model.predict(X[:10]))
+    
+    def test_multiclass_model_falls_back_to_sklearn(self):
+        X, _ = make_dataset()
+        y = (X[:, 0] * 3).astype(int)
+        model = LogisticRegression().fit(X, y)
+        assert isinstance(compile_scorer(model), SklearnScorer)
+    
+    def test_service_recompiles_scorer_on_model_swap(self):
+        X, y = make_dataset()
+        service = PredictionService(batching=False)
+        service.set_model(LogisticRegression().fit(X, y))
+        first_scorer = service.scorer
+        
+        service.set_model(RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y))
+        assert service.scorer is not first_scorer
+        assert isinstance(service.scorer, SklearnScorer)
+        
+        service.model = None
+        assert service.scorer is None
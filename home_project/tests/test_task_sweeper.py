@@ -0,0 +1,43 @@
+import pytest
+from unittest.mock import AsyncMock
+from workers import task_sweeper
+from workers.task_sweeper import sweep_once
+
+
+class TestTaskSweeper:
+    
+    @pytest.fixture
+    def repository(self, monkeypatch):
+        repository = AsyncMock()
+        monkeypatch.setattr(task_sweeper, "moderation_repository", repository)
+        monkeypatch.setattr(task_sweeper, "SWEEPER_MAX_ATTEMPTS", 2)
+        return repository
+    
+    @pytest.mark.asyncio
+    async def test_requeues_and_fails_stuck_tasks(self, repository, monkeypatch):
+        repository.claim_stuck_tasks.return_value = [
+            {"id": 1, "item_id": 10, "sweep_attempts": 1},
+            {"id": 2, "item_id": 20, "sweep_attempts": 3},
+            {"id": 3, "item_id": 30, "sweep_attempts": 2}
+        ]
+        send = AsyncMock()
+        monkeypatch.setattr(task_sweeper, "send_moderation_request", send)
+        
+        result = await sweep_once()
+        
+        assert result == {"claimed": 3, "requeued": 2, "failed": 1}
+        assert [call.args for call in send.await_args_list] == [(10,), (30,)]
+        assert [call.kwargs for call in send.await_args_list] == [{"task_id": 1}, {"task_id": 3}]
+        failed = repository.update_tasks_bulk.await_args.args[0]
+        assert [task["task_id"] for task in failed] == [2]
+        assert failed[0]["status"] == "failed"
+    
+    @pytest.mark.asyncio
+    async def test_send_error_leaves_task_pending(self, repository, monkeypatch):
+        repository.claim_stuck_tasks.return_value = [{"id": 1, "item_id": 10, "sweep_attempts": 1}]
+        monkeypatch.setattr(task_sweeper, "send_moderation_request", AsyncMock(side_effect=Exception("Kafka недоступна")))
+        
+        result = await sweep_once()
+        
+        assert result == {"claimed": 1, "requeued": 0, "failed": 0}
+        repository.update_tasks_bulk.assert_not_awaited()
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock
+from services.task_waiters import TaskWaiters
+
+
+class FakeListener:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.callbacks = []
+    
+    async def subscribe(self, channel, callback):
+        if self.fail:
+            raise ConnectionError("соединение LISTEN недоступно")
+        if callback not in self.callbacks:
+            self.callbacks.append(callback)
+    
+    def notify(self, payload: str) -> None:
+        for callback in self.callbacks:
+            callback(payload)
+
+
+def make_task(task_id: int, status: str = "pending", **fields) -> dict:
+    task = {
+        "id": task_id,
+        "item_id": 100 + task_id,
+        "status": status,
+        "is_violation": None,
+        "probability": None,
+        "error_message": None
+    }
+    task.update(fields)
+    return task
+
+
+class TestTaskWaiters:
+    
+    @pytest.mark.asyncio
+    async def test_notification_wakes_all_waiters_without_polling(self):
+        listener = FakeListener()
+        waiters = TaskWaiters(listener=listener)
+        fetch = AsyncMock(return_value=make_task(1))
+        
+        pending = [asyncio.create_task(waiters.wait_for_result(1, 5.0, fetch)) for _ in range(50)]
+        await asyncio.sleep(0.01)
+        assert waiters.waiting == 50
+        
+        listener.notify(json.dumps(make_task(2, "completed", is_violation=False, probability=0.1)))
+        listener.notify(json.dumps(make_task(1, "completed", is_violation=True, probability=0.9)))
+        results = await asyncio.wait_for(asyncio.gather(*pending), timeout=1.0)
+        
+        assert all(result["status"] == "completed" and result["probability"] == 0.9 for result in results)
+        assert fetch.await_count == 50
+        assert waiters.waiting == 0
+    
+    @pytest.mark.asyncio
+    async def test_already_finished_task_returns_immediately(self):
+        waiters = TaskWaiters(listener=FakeListener())
+        fetch = AsyncMock(return_value=make_task(1, "failed", error_message="Ошибка"))
+        
+        result = await waiters.wait_for_result(1, 5.0, fetch)
+        assert result["status"] == "failed"
+        assert waiters.waiting == 0
+    
+    @pytest.mark.asyncio
+    async def test_timeout_returns_pending_task(self):
+        waiters = TaskWaiters(listener=FakeListener())
+        fetch = AsyncMock(return_value=make_task(1))
+        
+        result = await waiters.wait_for_result(1, 0.05, fetch)
+        assert result["status"] == "pending"
+        assert waiters.stats["timeouts"] == 1
+        assert waiters.waiting == 0
+    
+    @pytest.mark.asyncio
+    async def test_reconnect_notification_triggers_refetch(self):
+        listener = FakeListener()
+        waiters = TaskWaiters(listener=listener)
+        fetch = AsyncMock(side_effect=[make_task(1), make_task(1, "completed", is_violation=False, probability=0.2)])
+        
+        waiter = asyncio.create_task(waiters.wait_for_result(1, 5.0, fetch))
+        await asyncio.sleep(0.01)
+        listener.notify("*")
+        result = await asyncio.wait_for(waiter, timeout=1.0)
+        
+        assert result["status"] == "completed"
+        assert fetch.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_to_polling_without_listener(self):
+        waiters = TaskWaiters(listener=FakeListener(fail=True), fallback_poll_interval=0.02)
+        fetch = AsyncMock(side_effect=[make_task(1), make_task(1), make_task(1, "completed", is_violation=True, probability=0.7)])
+        
+        result = await asyncio.wait_for(waiters.wait_for_result(1, 5.0, fetch), timeout=1.0)
+        assert result["status"] == "completed"
+        assert fetch.await_count == 3
@@ -0,0 +1,117 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+import database
+from database import acquire_connection, unit_of_work
+
+
+class FakeTransaction:
+    def __init__(self):
+        self.started = False
+        self.committed = False
+        self.rolled_back = False
+    
+    async def start(self):
+        self.started = True
+    
+    async def commit(self):
+        self.committed = True
+    
+    async def rollback(self):
+        self.rolled_back = True
+
+
+class FakePool:
+    def __init__(self):
+        self.acquired = 0
+        self.released = 0
+        self.conn = MagicMock()
+        self.conn.transaction = MagicMock(side_effect=self._transaction)
+        self.transactions = []
+    
+    def _transaction(self):
+        transaction = FakeTransaction()
+        self.transactions.append(transaction)
+        return transaction
+    
+    async def acquire(self, timeout=None):
+        self.acquired += 1
+        return self.conn
+    
+    async def release(self, conn):
+        self.released += 1
+
+
+class TestUnitOfWork:
+    
+    @pytest.fixture
+    def fake_pool(self, monkeypatch):
+        pool = FakePool()
+        monkeypatch.setattr(database, "get_db_pool", AsyncMock(return_value=pool))
+        return pool
+    
+    @pytest.mark.asyncio
+    async def test_connection_reused_within_unit(self, fake_pool):
+        async with unit_of_work():
+            async with acquire_connection() as first:
+                pass
+            async with acquire_connection() as second:
+                pass
+            assert fake_pool.released == 0
+        
+        assert first is second
+        assert fake_pool.acquired == 1
+        assert fake_pool.released == 1
+    
+    @pytest.mark.asyncio
+    async def test_unused_unit_does_not_acquire(self, fake_pool):
+        async with unit_of_work():
+            pass
+        assert fake_pool.acquired == 0
+    
+    @pytest.mark.asyncio
+    async def test_without_unit_each_call_acquires(self, fake_pool):
+        async with acquire_connection():
+            pass
+        async with acquire_connection():
+            pass
+        assert fake_pool.acquired == 2
+        assert fake_pool.released == 2
+    
+    @pytest.mark.asyncio
+    async def test_nested_unit_reuses_outer(self, fake_pool):
+        async with unit_of_work() as outer:
+            async with unit_of_work() as inner:
+                async with acquire_connection():
+                    pass
+            assert inner is outer
+            assert fake_pool.released == 0
+        assert fake_pool.acquired == 1
+    
+    @pytest.mark.asyncio
+    async def test_transaction_commit_and_rollback(self, fake_pool):
+        async with unit_of_work(transaction=True):
+            async with acquire_connection():
+                pass
+        
+        with pytest.raises(ValueError):
+            async with unit_of_work(transaction=True):
+                async with acquire_connection():
+                    raise ValueError("ошибка")
+        
+        committed, rolled_back = fake_pool.transactions
+        assert committed.committed and not committed.rolled_back
+        assert rolled_back.rolled_back and not rolled_back.committed
+        assert fake_pool.released == 2
+    
+    @pytest.mark.asyncio
+    async def test_closed_unit_is_not_reused(self, fake_pool):
+        async with unit_of_work() as unit:
+            pass
+        database._current_unit.set(unit)
+        try:
+            async with acquire_connection():
+                pass
+        finally:
+            database._current_unit.set(None)
+        assert fake_pool.acquired == 1
+        assert fake_pool.released == 1
@@ -0,0 +1,39 @@
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from model import train_model, save_model, register_model_in_mlflow
+from services.model_artifact import save_artifact
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Обучение модели модерации и сохранение артефакта для запуска сервиса без обучения"
+    )
+    parser.add_argument("--output", default="model.pkl", help="Путь к файлу модели")
+    parser.add_argument("--artifact", help="Дополнительно сохранить артефакт NumPy + manifest.json в этот каталог")
+    parser.add_argument("--register", action="store_true", help="Зарегистрировать модель в MLflow")
+    parser.add_argument("--model-name", default="moderation-model", help="Имя модели в MLflow")
+    args = parser.parse_args()
+    
+    model = train_model()
+    save_model(model, args.output)
+    if args.artifact:
+        save_artifact(model, args.artifact, source=args.output)
+    if args.register:
+        register_model_in_mlflow(model, model_name=args.model_name)
+    print(f"Модель сохранена в {args.output}")
+
+
+if __name__ == "__main__":
+    main()